@@ -5,6 +5,11 @@ Uses PostgreSQL when DATABASE_URL is set, falls back to local JSON files for dev
 
 import os
 import json
+import orjson
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
@@ -29,20 +34,95 @@ else:
     psycopg2 = None
 
 
+# Connections are pooled so requests reuse them instead of reconnecting every time.
+# Up to DB_POOL_SIZE idle connections are kept; DB_MAX_OVERFLOW more may be opened
+# under load and are closed when returned. Callers wait up to DB_POOL_TIMEOUT
+# seconds for a free connection once both are exhausted.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class _ConnectionPool:
+    """Thread-safe psycopg2 connection pool that pings idle connections before reuse"""
+
+    def __init__(self, dsn: str, pool_size: int, max_overflow: int, timeout: float):
+        self._dsn = dsn
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size + max_overflow)
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise TimeoutError(f"no database connection available within {self._timeout}s")
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return psycopg2.connect(self._dsn, connect_timeout=5)
+                # Pre-ping: drop connections the server (or a proxy) has closed
+                if self._is_alive(conn):
+                    return conn
+                conn.close()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close: bool = False):
+        try:
+            if not close and not conn.closed and self._idle.qsize() < self._pool_size:
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                self._idle.put(conn)
+            else:
+                conn.close()
+        except Exception:
+            conn.close()
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+
+def _get_pool():
+    """Create the connection pool on first use (connections themselves open lazily)"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Railway uses postgres:// but psycopg2 needs postgresql://
+                db_url = DATABASE_URL
+                if db_url.startswith("postgres://"):
+                    db_url = db_url.replace("postgres://", "postgresql://", 1)
+                _pool = _ConnectionPool(db_url, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT)
+    return _pool
+
+
 def get_connection():
-    """Get a database connection"""
+    """Get a database connection from the pool (give it back with release_connection)"""
     global DATABASE_AVAILABLE
 
     if not USE_DATABASE:
         return None
 
-    # Railway uses postgres:// but psycopg2 needs postgresql://
-    db_url = DATABASE_URL
-    if db_url.startswith("postgres://"):
-        db_url = db_url.replace("postgres://", "postgresql://", 1)
-
     try:
-        conn = psycopg2.connect(db_url, connect_timeout=5)
+        conn = _get_pool().getconn()
         DATABASE_AVAILABLE = True
         return conn
     except Exception as e:
@@ -51,6 +131,44 @@ def get_connection():
         return None
 
 
+def release_connection(conn, close: bool = False):
+    """Return a connection to the pool, closing it if it's broken"""
+    try:
+        _get_pool().putconn(conn, close=close or bool(conn.closed))
+    except Exception as e:
+        print(f"Database connection release failed: {e}")
+
+
+def warm_connection_pool(n: int) -> int:
+    """
+    Open n pooled connections concurrently and ping each with SELECT 1,
+    so the first requests after startup don't pay the connect/TLS/auth cost.
+    Returns the number of connections warmed.
+    """
+    if not USE_DATABASE or n <= 0:
+        return 0
+
+    def ping(_):
+        conn = get_connection()
+        if conn is None:
+            return None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return conn
+        except Exception as e:
+            print(f"Database warm-up ping failed: {e}")
+            release_connection(conn, close=True)
+            return None
+
+    # Hold every connection until all are open so the pool really grows to n
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        conns = [conn for conn in executor.map(ping, range(n)) if conn is not None]
+    for conn in conns:
+        release_connection(conn)
+    return len(conns)
+
+
 @contextmanager
 def get_cursor():
     """Context manager for database cursor"""
@@ -72,7 +190,7 @@ def get_cursor():
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
 
 def is_database_available():
@@ -82,7 +200,7 @@ def is_database_available():
     # Try a quick connection test
     conn = get_connection()
     if conn:
-        conn.close()
+        release_connection(conn)
         return True
     return False
 
@@ -129,6 +247,11 @@ def init_database():
                 created_at TIMESTAMP DEFAULT NOW()
             )
         """)
+        # History is always read in sent_at order
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_communication_history_sent_at
+            ON communication_history (sent_at)
+        """)
 
         # Create call_history table
         cursor.execute("""
@@ -213,8 +336,7 @@ def save_memory(memory: Dict):
 
     # Always save to JSON as backup (or primary if DB failed)
     try:
-        with open("memory.json", 'w') as f:
-            json.dump(memory, f, indent=2)
+        _write_json_atomic("memory.json", memory, indent=2)
     except Exception as e:
         if not saved_to_db:
             print(f"Warning: Could not save memory: {e}")
@@ -290,13 +412,32 @@ def save_klaus_config(config: Dict):
 
     # Always save to JSON as backup
     try:
-        with open("klaus_config.json", 'w') as f:
-            json.dump(config, f, indent=2)
+        _write_json_atomic("klaus_config.json", config, indent=2)
     except Exception as e:
         if not saved_to_db:
             print(f"Warning: Could not save klaus_config: {e}")
 
 
+def _write_json_atomic(path: str, data: Any, indent: Optional[int] = None):
+    """
+    Write JSON (serialized with orjson) to a temp file and rename it into place so readers never see a partial file
+
+    The temp file gets a unique name, so overlapping writers can't interleave
+    their bytes in it or rename it out from under each other.
+    """
+    directory, filename = os.path.split(path)
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('wb', dir=directory or '.', prefix=f"{filename}.", suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
 # ==============================================================================
 # COMMUNICATION HISTORY FUNCTIONS
 # ==============================================================================
@@ -312,7 +453,7 @@ def load_communication_history() -> List[Dict]:
                         SELECT invoice_id, company_name, method, message_type,
                                sent_at, approved_by
                         FROM communication_history
-                        ORDER BY sent_at DESC
+                        ORDER BY sent_at, id
                     """)
                     rows = cursor.fetchall()
 
@@ -384,28 +525,44 @@ def save_communication_history(history: List[Dict]):
 def add_communication(invoice_id: str, company_name: str, method: str,
                       message_type: str, approved_by: Optional[str] = None):
     """Add a single communication entry"""
-    entry = {
+    add_communications([{
         'invoice_id': invoice_id,
         'company_name': company_name,
         'method': method,
         'message_type': message_type,
         'sent_at': datetime.now().isoformat(),
         'approved_by': approved_by
-    }
+    }])
+
+
+def add_communications(entries: List[Dict]):
+    """Append a batch of communication entries with one insert and one JSON rewrite"""
+    if not entries:
+        return
 
     saved_to_db = False
     if USE_DATABASE:
         try:
             with get_cursor() as cursor:
                 if cursor is not None:
-                    cursor.execute("""
+                    cursor.executemany("""
                         INSERT INTO communication_history
                         (invoice_id, company_name, method, message_type, sent_at, approved_by)
-                        VALUES (%s, %s, %s, %s, NOW(), %s)
-                    """, (invoice_id, company_name, method, message_type, approved_by))
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                    """, [
+                        (
+                            entry.get('invoice_id'),
+                            entry.get('company_name'),
+                            entry.get('method'),
+                            entry.get('message_type'),
+                            datetime.fromisoformat(entry['sent_at']),
+                            entry.get('approved_by')
+                        )
+                        for entry in entries
+                    ])
                     saved_to_db = True
         except Exception as e:
-            print(f"Database add_communication failed: {e}")
+            print(f"Database add_communications failed: {e}")
 
     # Always append to JSON as backup
     try:
@@ -413,12 +570,11 @@ def add_communication(invoice_id: str, company_name: str, method: str,
         if os.path.exists("klaus_communication_history.json"):
             with open("klaus_communication_history.json", 'r') as f:
                 history = json.load(f)
-        history.append(entry)
-        with open("klaus_communication_history.json", 'w') as f:
-            json.dump(history, f, indent=2)
+        history.extend(entries)
+        _write_json_atomic("klaus_communication_history.json", history, indent=2)
     except Exception as e:
         if not saved_to_db:
-            print(f"Warning: Could not save communication entry: {e}")
+            print(f"Warning: Could not save communication entries: {e}")
 
 
 # ==============================================================================
@@ -598,6 +754,37 @@ def save_schedule_config(config: Dict):
             print(f"Warning: Could not save schedule_config: {e}")
 
 
+# ==============================================================================
+# INVOICE HISTORY CACHE FUNCTIONS
+# ==============================================================================
+
+INVOICE_HISTORY_CACHE_FILE = "invoice_history_cache.json"
+
+
+def load_invoice_history_cache() -> Optional[Dict]:
+    """
+    Load the cached invoice history (local JSON file only)
+
+    This is a rebuildable cache of HubSpot data, so it isn't stored in the database;
+    a missing or unreadable file just means the next sync is a full one.
+    """
+    if os.path.exists(INVOICE_HISTORY_CACHE_FILE):
+        try:
+            with open(INVOICE_HISTORY_CACHE_FILE, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Could not read invoice history cache: {e}")
+    return None
+
+
+def save_invoice_history_cache(cache: Dict):
+    """Save the invoice history cache to its local JSON file"""
+    try:
+        _write_json_atomic(INVOICE_HISTORY_CACHE_FILE, cache)
+    except Exception as e:
+        print(f"Warning: Could not save invoice history cache: {e}")
+
+
 # ==============================================================================
 # MIGRATION FUNCTION
 # ==============================================================================
@@ -5,23 +5,85 @@ NOW WITH INVOICE URL GENERATION FOR HYPERLINKING
 """
 
 from hubspot import HubSpot
-from hubspot.crm.objects import SimplePublicObjectInput, ApiException
+from hubspot.crm.objects import SimplePublicObjectInput, PublicObjectSearchRequest, Filter, FilterGroup, ApiException
+from hubspot.crm.associations import BatchInputPublicObjectId
+from hubspot.crm.companies import BatchReadInputSimplePublicObjectId, SimplePublicObjectId
+from hubspot.crm.contacts import (
+    BatchReadInputSimplePublicObjectId as ContactBatchReadInput,
+    SimplePublicObjectId as ContactObjectId,
+)
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import math
 import os
+import time
+
+
+log = logging.getLogger("klaus.hubspot")
+
+
+# Invoice fields/associations requested from HubSpot, built once rather than per page
+_INVOICE_PROPERTIES = (
+    "hs_invoice_number",
+    "hs_title",
+    "hs_amount_billed",
+    "hs_payment_status",
+    "hs_balance_due",
+    "hs_due_date",
+    "hs_createdate",
+    "hs_number",
+    "hs_payment_date",
+)
+_UNPAID_INVOICE_PROPERTIES = _INVOICE_PROPERTIES + ("hs_invoice_link",)
+_INVOICE_ASSOCIATIONS = ("companies", "contacts")
+# Server-side version of the unpaid test: balance due and no payment date
+_UNPAID_INVOICE_FILTERS = (
+    Filter(property_name="hs_balance_due", operator="GT", value="0"),
+    Filter(property_name="hs_payment_date", operator="NOT_HAS_PROPERTY"),
+)
 
 
 class HubSpotClient:
     """Client for interacting with HubSpot CRM"""
     
+    # HubSpot search returns at most 100 rows per page and won't page past 10,000 results
+    SEARCH_PAGE_SIZE = 100
+    SEARCH_MAX_RESULTS = 10000
+    # Search endpoints have their own (lower) per-second rate limit (about 5/s per account),
+    # so at most SEARCH_CONCURRENCY run at once and they start SEARCH_RATE_PER_SECOND apart
+    SEARCH_CONCURRENCY = 4
+    SEARCH_RATE_PER_SECOND = 4
+    # Rate-limited (429) calls are retried after Retry-After, or an exponential backoff
+    RATE_LIMIT_RETRIES = 5
+    RATE_LIMIT_BACKOFF_SECONDS = 1.0
+    # Company names rarely change, so batch reads are remembered for an hour
+    COMPANY_NAME_TTL_SECONDS = 3600
+    # Unpaid invoices are synced incrementally (re-reading a small overlap so edits made
+    # mid-sync aren't missed); a full sync runs periodically to drop deleted invoices and
+    # pick up company/contact changes, which don't touch the invoice's modified date
+    UNPAID_SYNC_OVERLAP = timedelta(minutes=5)
+    UNPAID_FULL_SYNC_INTERVAL = timedelta(hours=1)
+    
     def __init__(self, api_key: str, portal_id: Optional[str] = None):
         self.api_key = api_key
         self.client = HubSpot(access_token=api_key)
+        # company ID -> (name, time.monotonic() when read)
+        self._company_names: Dict[str, tuple] = {}
+        # invoice ID -> unpaid invoice dict, as of the last sync
+        self._unpaid: Dict[str, Dict] = {}
+        self._unpaid_synced_at: Optional[datetime] = None
+        self._unpaid_full_synced_at: Optional[datetime] = None
+        self._unpaid_lock = asyncio.Lock()
+        # time.monotonic() before which the next search request may not start
+        self._next_search_at = 0.0
+        self._search_rate_lock = asyncio.Lock()
         
         # Portal ID for generating invoice URLs
         # Hardcoded for Leverage Live Local
         self.portal_id = portal_id or os.getenv("HUBSPOT_PORTAL_ID") or "44968885"
-        print(f"[OK] HubSpot Portal ID: {self.portal_id}")
+        log.info("HubSpot Portal ID: %s", self.portal_id)
     
     def get_invoice_url(self, invoice_id: str) -> str:
         """
@@ -41,129 +103,486 @@ class HubSpotClient:
         # Object type 2-130 is for invoices
         return f"https://app.hubspot.com/contacts/{self.portal_id}/record/2-130/{invoice_id}"
     
-    async def get_invoices(self, status: str = "open") -> List[Dict]:
+    def _search_invoices_page(self, properties: tuple, offset: int = 0, limit: int = SEARCH_PAGE_SIZE,
+                              filter_groups: Optional[List] = None):
+        """Run one invoice search page starting at an explicit offset"""
+        search_request = PublicObjectSearchRequest(
+            filter_groups=filter_groups or [],
+            properties=list(properties),
+            limit=limit,
+            after=str(offset)
+        )
+        return self.client.crm.objects.search_api.do_search(
+            object_type="invoices",
+            public_object_search_request=search_request
+        )
+    
+    async def _wait_for_search_slot(self):
+        """Space search requests 1/SEARCH_RATE_PER_SECOND apart across all callers"""
+        async with self._search_rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_search_at)
+            self._next_search_at = start + 1 / self.SEARCH_RATE_PER_SECOND
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def _call_api(self, func, *args, search: bool = False):
+        """
+        Run a blocking SDK call in a worker thread, retrying it when HubSpot answers 429
+        
+        Search calls (search=True) also wait for their turn under the search rate limit.
+        """
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            if search:
+                await self._wait_for_search_slot()
+            try:
+                return await asyncio.to_thread(func, *args)
+            except ApiException as e:
+                if e.status != 429 or attempt == self.RATE_LIMIT_RETRIES:
+                    raise
+                try:
+                    delay = float((e.headers or {}).get("Retry-After"))
+                except (TypeError, ValueError):
+                    delay = self.RATE_LIMIT_BACKOFF_SECONDS * 2 ** attempt
+                log.warning("HubSpot rate limit hit, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+    
+    async def get_all_invoice_objects(self, properties: tuple = _INVOICE_PROPERTIES,
+                                      modified_since: Optional[datetime] = None,
+                                      filters: tuple = ()) -> List:
+        """
+        Fetch every invoice from HubSpot (no page cap)
+        
+        The first search page tells us the total, so the remaining pages are
+        requested concurrently by offset instead of following cursors one at a time,
+        paced to the search rate limit.
+        
+        Args:
+            properties: Invoice properties to return
+            modified_since: Only return invoices modified at or after this time
+            filters: Extra search filters, all of which must match
+        """
+        filters = list(filters)
+        if modified_since:
+            filters.append(Filter(
+                property_name="hs_lastmodifieddate",
+                operator="GTE",
+                value=str(int(modified_since.timestamp() * 1000))
+            ))
+        filter_groups = [FilterGroup(filters=filters)] if filters else None
+        
+        try:
+            first_page = await self._call_api(self._search_invoices_page, properties, 0,
+                                              self.SEARCH_PAGE_SIZE, filter_groups, search=True)
+            total = min(first_page.total or 0, self.SEARCH_MAX_RESULTS)
+            n_pages = math.ceil(total / self.SEARCH_PAGE_SIZE)
+            
+            semaphore = asyncio.Semaphore(self.SEARCH_CONCURRENCY)
+            
+            async def fetch_page(page_number: int):
+                async with semaphore:
+                    return await self._call_api(
+                        self._search_invoices_page, properties, page_number * self.SEARCH_PAGE_SIZE,
+                        self.SEARCH_PAGE_SIZE, filter_groups, search=True
+                    )
+            
+            pages = [first_page] + list(await asyncio.gather(*[fetch_page(i) for i in range(1, n_pages)]))
+            
+            all_invoices = [invoice for page in pages for invoice in page.results]
+            if (first_page.total or 0) > self.SEARCH_MAX_RESULTS:
+                log.warning("HubSpot has %s invoices, search is limited to the first %s", first_page.total, self.SEARCH_MAX_RESULTS)
+            log.info("Fetched %s invoices across %s pages", len(all_invoices), max(n_pages, 1))
+            return all_invoices
+        
+        except ApiException as e:
+            raise Exception(f"Failed to fetch invoices: {str(e)}")
+    
+    async def get_invoice_company_ids(self, invoice_ids: List[str]) -> Dict[str, str]:
+        """Map invoice ID -> first associated company ID"""
+        return await self.get_invoice_association_ids(invoice_ids, "companies")
+    
+    async def get_invoice_association_ids(self, invoice_ids: List[str], to_object_type: str) -> Dict[str, str]:
+        """
+        Map invoice ID -> first associated object ID of a type ("companies"/"contacts")
+        
+        Search results don't include associations, so read them in batches of 100.
+        """
+        chunks = [invoice_ids[i:i + 100] for i in range(0, len(invoice_ids), 100)]
+        
+        def read_chunk(chunk: List[str]):
+            return self.client.crm.associations.batch_api.read(
+                from_object_type="invoices",
+                to_object_type=to_object_type,
+                batch_input_public_object_id=BatchInputPublicObjectId(inputs=[{"id": invoice_id} for invoice_id in chunk])
+            )
+        
+        semaphore = asyncio.Semaphore(self.SEARCH_CONCURRENCY)
+        
+        async def fetch_chunk(chunk: List[str]):
+            async with semaphore:
+                return await self._call_api(read_chunk, chunk)
+        
+        # A failed batch must fail the caller: treating its invoices as having no
+        # company/contact would give them placeholder addresses that then get cached
+        try:
+            responses = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+        except Exception as e:
+            log.warning("Could not fetch invoice %s associations: %s", to_object_type, e)
+            raise
+        
+        association_ids = {}
+        for response in responses:
+            for result in response.results:
+                if result.to:
+                    association_ids[result._from.id] = result.to[0].id
+        return association_ids
+    
+    async def get_company_names(self, company_ids) -> Dict[str, str]:
+        """
+        Map company ID -> company name
+        
+        Reads companies in batches of 100 instead of one get_by_id call per company,
+        skipping companies whose name was read within COMPANY_NAME_TTL_SECONDS.
+        Raises if a batch read fails rather than returning a partial map.
+        """
+        now = time.monotonic()
+        company_names = {}
+        unique_ids = []
+        for company_id in dict.fromkeys(company_ids):
+            cached = self._company_names.get(company_id)
+            if cached and now - cached[1] < self.COMPANY_NAME_TTL_SECONDS:
+                company_names[company_id] = cached[0]
+            else:
+                unique_ids.append(company_id)
+        chunks = [unique_ids[i:i + 100] for i in range(0, len(unique_ids), 100)]
+        
+        def read_chunk(chunk: List[str]):
+            return self.client.crm.companies.batch_api.read(
+                batch_read_input_simple_public_object_id=BatchReadInputSimplePublicObjectId(
+                    properties=["name"],
+                    inputs=[SimplePublicObjectId(id=company_id) for company_id in chunk]
+                )
+            )
+        
+        semaphore = asyncio.Semaphore(self.SEARCH_CONCURRENCY)
+        
+        async def fetch_chunk(chunk: List[str]):
+            async with semaphore:
+                return await self._call_api(read_chunk, chunk)
+        
+        try:
+            responses = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+        except Exception as e:
+            log.warning("Could not fetch company names: %s", e)
+            raise
+        
+        now = time.monotonic()
+        for response in responses:
+            for company in response.results:
+                name = company.properties.get("name")
+                if name:
+                    company_names[company.id] = name
+                    self._company_names[company.id] = (name, now)
+        return company_names
+    
+    async def get_contacts(self, contact_ids) -> Dict[str, Dict]:
+        """
+        Map contact ID -> contact properties (firstname, lastname, email)
+        
+        Reads contacts in batches of 100 instead of one get_by_id call per contact.
+        Raises if a batch read fails rather than returning a partial map.
+        """
+        unique_ids = list(dict.fromkeys(contact_ids))
+        chunks = [unique_ids[i:i + 100] for i in range(0, len(unique_ids), 100)]
+        
+        def read_chunk(chunk: List[str]):
+            return self.client.crm.contacts.batch_api.read(
+                batch_read_input_simple_public_object_id=ContactBatchReadInput(
+                    properties=["firstname", "lastname", "email"],
+                    inputs=[ContactObjectId(id=contact_id) for contact_id in chunk]
+                )
+            )
+        
+        semaphore = asyncio.Semaphore(self.SEARCH_CONCURRENCY)
+        
+        async def fetch_chunk(chunk: List[str]):
+            async with semaphore:
+                return await self._call_api(read_chunk, chunk)
+        
+        try:
+            responses = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+        except Exception as e:
+            log.warning("Could not fetch contacts: %s", e)
+            raise
+        
+        contacts = {}
+        for response in responses:
+            for contact in response.results:
+                contacts[contact.id] = contact.properties
+        return contacts
+    
+    @staticmethod
+    def _first_association_id(invoice, object_type: str) -> Optional[str]:
+        """ID of the first associated object of a type ("companies"/"contacts"), or None"""
+        try:
+            return invoice.associations[object_type].results[0].id
+        except (AttributeError, KeyError, IndexError, TypeError):
+            return None
+    
+    def _invoice_to_dict(self, invoice, company_names: Optional[Dict[str, str]] = None,
+                         contacts: Optional[Dict[str, Dict]] = None,
+                         company_id: Optional[str] = None, contact_id: Optional[str] = None) -> Dict:
+        """
+        Flatten a HubSpot invoice object into the dict shape used by Klaus (company, contact, URL)
+        
+        Pass company_names/contacts maps (from get_company_names/get_contacts) when
+        converting many invoices; without them the company and contact are fetched
+        individually. Search results carry no associations, so their company/contact
+        IDs are passed in explicitly.
+        """
+        props = invoice.properties
+        
+        payment_status = (props.get("hs_payment_status") or "").lower().strip()
+        payment_date = props.get("hs_payment_date")
+        balance_due = float(props.get("hs_balance_due", 0))
+        
+        # Get company name
+        company_name = None
+        company_id = company_id or self._first_association_id(invoice, 'companies')
+        if company_id and company_names is not None:
+            company_name = company_names.get(company_id)
+        elif company_id:
+            try:
+                company = self.client.crm.companies.basic_api.get_by_id(
+                    company_id=company_id,
+                    properties=["name"]
+                )
+                company_name = company.properties.get("name")
+            except:
+                pass
+        
+        # Get contact info
+        contact_name = None
+        contact_email = None
+        contact_firstname = None
+        contact_lastname = None
+        
+        contact_id = contact_id or self._first_association_id(invoice, 'contacts')
+        contact_props = None
+        if contact_id and contacts is not None:
+            contact_props = contacts.get(contact_id)
+        elif contact_id:
+            try:
+                contact = self.client.crm.contacts.basic_api.get_by_id(
+                    contact_id=contact_id,
+                    properties=["firstname", "lastname", "email"]
+                )
+                contact_props = contact.properties
+            except Exception as e:
+                log.warning("Could not fetch contact for invoice %s: %s", invoice.id, e)
+        if contact_props:
+            contact_firstname = contact_props.get("firstname", "")
+            contact_lastname = contact_props.get("lastname", "")
+            contact_name = f"{contact_firstname} {contact_lastname}".strip()
+            contact_email = contact_props.get("email", "")
+        
+        # Fallback: if no contact, use company name
+        if not contact_name:
+            contact_name = company_name or props.get("hs_title", "Unknown")
+        if not contact_email:
+            contact_email = "unknown@email.com"
+        
+        invoice_number = props.get("hs_invoice_number") or props.get("hs_number") or props.get("hs_title") or ""
+
+        # Use the public invoice link from HubSpot (preferred) or fall back to internal URL
+        hubspot_url = props.get("hs_invoice_link") or self.get_invoice_url(invoice.id)
+        
+        return {
+            'id': invoice.id,
+            'number': invoice_number,
+            'company_name': company_name or props.get("hs_title", ""),
+            'contact_name': contact_name,
+            'contact_email': contact_email,
+            'contact_firstname': contact_firstname,
+            'contact_lastname': contact_lastname,
+            'amount': float(props.get("hs_amount_billed", 0)) if props.get("hs_amount_billed") else 0.0,
+            'balance_due': balance_due,
+            'due_date': props.get("hs_due_date", ""),
+            'created_date': props.get("hs_createdate", ""),
+            'payment_date': payment_date,
+            'status': payment_status,
+            'hubspot_url': hubspot_url
+        }
+    
+    @staticmethod
+    def _is_unpaid(invoice) -> bool:
+        """Same unpaid test get_invoices applies to the flattened dicts, on the raw invoice"""
+        props = invoice.properties
+        return float(props.get("hs_balance_due", 0)) > 0 and props.get("hs_payment_date") is None
+    
+    def _get_invoice_page(self, after: Optional[str] = None):
+        """Fetch one page of invoices (with company/contact associations) by cursor"""
+        return self.client.crm.objects.basic_api.get_page(
+            object_type="invoices",
+            limit=100,
+            after=after,
+            properties=list(_UNPAID_INVOICE_PROPERTIES),
+            associations=list(_INVOICE_ASSOCIATIONS)
+        )
+    
+    async def get_unpaid_invoices(self) -> List[Dict]:
+        """
+        Fetch UNPAID invoices (with company, contact and HubSpot URL), filtered by HubSpot search
+        
+        Paid invoices never leave HubSpot, so only the unpaid rows are transferred
+        and only their companies/contacts are resolved. After the first (full) sync,
+        only invoices modified since the previous sync are fetched and merged in.
+        If any lookup fails the sync raises and the previously synced invoices are kept.
+        """
+        async with self._unpaid_lock:
+            now = datetime.now()
+            full_sync = (self._unpaid_full_synced_at is None
+                         or now - self._unpaid_full_synced_at >= self.UNPAID_FULL_SYNC_INTERVAL)
+            
+            if full_sync:
+                invoices = await self.get_all_invoice_objects(_UNPAID_INVOICE_PROPERTIES, filters=_UNPAID_INVOICE_FILTERS)
+                unpaid = {}
+            else:
+                # Modified invoices may have been paid, so this search isn't limited to unpaid ones
+                invoices = await self.get_all_invoice_objects(
+                    _UNPAID_INVOICE_PROPERTIES,
+                    modified_since=self._unpaid_synced_at - self.UNPAID_SYNC_OVERLAP
+                )
+                unpaid = dict(self._unpaid)
+                for invoice in invoices:
+                    unpaid.pop(invoice.id, None)
+            
+            for invoice in await self._unpaid_invoice_dicts(invoices):
+                unpaid[invoice['id']] = invoice
+            
+            self._unpaid = unpaid
+            self._unpaid_synced_at = now
+            if full_sync:
+                self._unpaid_full_synced_at = now
+        
+        # Copies, so callers can't alter the synced invoices
+        unpaid_invoices = [dict(invoice) for invoice in unpaid.values()]
+        unpaid_invoices.sort(key=lambda x: x['created_date'], reverse=True)
+        log.info("%s invoices are UNPAID (%s sync)", len(unpaid_invoices), 'full' if full_sync else 'incremental')
+        return unpaid_invoices
+    
+    async def _unpaid_invoice_dicts(self, invoices: List) -> List[Dict]:
+        """Flatten the unpaid ones of some search results, resolving companies/contacts in batches"""
+        invoices = [invoice for invoice in invoices if self._is_unpaid(invoice)]
+        invoice_ids = [invoice.id for invoice in invoices]
+        company_ids, contact_ids = await asyncio.gather(
+            self.get_invoice_association_ids(invoice_ids, "companies"),
+            self.get_invoice_association_ids(invoice_ids, "contacts")
+        )
+        company_names, contacts = await asyncio.gather(
+            self.get_company_names(company_ids.values()),
+            self.get_contacts(contact_ids.values())
+        )
+        
+        return [
+            self._invoice_to_dict(invoice, company_names, contacts,
+                                  company_ids.get(invoice.id), contact_ids.get(invoice.id))
+            for invoice in invoices
+        ]
+    
+    async def get_invoices(self, status: str = "open", legacy: bool = False) -> List[Dict]:
         """
         Fetch UNPAID invoices from HubSpot - paginate to get RECENT ones
         NOW INCLUDES CONTACT INFORMATION (Bill To person) AND HUBSPOT URL
+        
+        Unpaid invoices are selected server-side by get_unpaid_invoices(). With
+        legacy=True (used by /klaus/debug/invoice-fields) every invoice is paged
+        through (up to 20 pages) and filtered here.
+        
+        Pages are cursor-based, so they're fetched in order, but the next page is
+        requested as soon as the cursor is known while earlier pages are still
+        being flattened. Each page already carries its company/contact associations,
+        so flattening a page is one batch read of companies and one of contacts.
         """
+        if not legacy:
+            return await self.get_unpaid_invoices()
+        
+        semaphore = asyncio.Semaphore(self.SEARCH_CONCURRENCY)
+        
+        async def flatten_page(results) -> List[Dict]:
+            # Only unpaid invoices are returned, so don't resolve companies/contacts for the rest
+            results = [invoice for invoice in results if self._is_unpaid(invoice)]
+            if not results:
+                return []
+            async with semaphore:
+                company_ids = [self._first_association_id(invoice, 'companies') for invoice in results]
+                contact_ids = [self._first_association_id(invoice, 'contacts') for invoice in results]
+                company_names, contacts = await asyncio.gather(
+                    self.get_company_names([company_id for company_id in company_ids if company_id]),
+                    self.get_contacts([contact_id for contact_id in contact_ids if contact_id])
+                )
+            return [self._invoice_to_dict(invoice, company_names, contacts) for invoice in results]
+        
+        flatten_tasks = []
+        next_page = None
         try:
-            all_invoices = []
-            after = None
             pages_fetched = 0
+            total_fetched = 0
             max_pages = 20
             
-            while pages_fetched < max_pages:
-                invoices_response = self.client.crm.objects.basic_api.get_page(
-                    object_type="invoices",
-                    limit=100,
-                    after=after,
-                    properties=[
-                        "hs_invoice_number",
-                        "hs_title",
-                        "hs_amount_billed",
-                        "hs_payment_status",
-                        "hs_balance_due",
-                        "hs_due_date",
-                        "hs_createdate",
-                        "hs_number",
-                        "hs_payment_date",
-                        "hs_invoice_link"
-                    ],
-                    associations=["companies", "contacts"]
-                )
-                
-                for invoice in invoices_response.results:
-                    props = invoice.properties
-                    
-                    payment_status = (props.get("hs_payment_status") or "").lower().strip()
-                    payment_date = props.get("hs_payment_date")
-                    balance_due = float(props.get("hs_balance_due", 0))
-                    
-                    # Get company name
-                    company_name = None
-                    if hasattr(invoice, 'associations') and invoice.associations:
-                        company_associations = invoice.associations.get('companies', {})
-                        if company_associations and hasattr(company_associations, 'results') and company_associations.results:
-                            company_id = company_associations.results[0].id
-                            try:
-                                company = self.client.crm.companies.basic_api.get_by_id(
-                                    company_id=company_id,
-                                    properties=["name"]
-                                )
-                                company_name = company.properties.get("name")
-                            except:
-                                pass
-                    
-                    # Get contact info
-                    contact_name = None
-                    contact_email = None
-                    contact_firstname = None
-                    contact_lastname = None
-                    
-                    if hasattr(invoice, 'associations') and invoice.associations:
-                        contact_associations = invoice.associations.get('contacts', {})
-                        if contact_associations and hasattr(contact_associations, 'results') and contact_associations.results:
-                            contact_id = contact_associations.results[0].id
-                            try:
-                                contact = self.client.crm.contacts.basic_api.get_by_id(
-                                    contact_id=contact_id,
-                                    properties=["firstname", "lastname", "email"]
-                                )
-                                contact_props = contact.properties
-                                contact_firstname = contact_props.get("firstname", "")
-                                contact_lastname = contact_props.get("lastname", "")
-                                contact_name = f"{contact_firstname} {contact_lastname}".strip()
-                                contact_email = contact_props.get("email", "")
-                            except Exception as e:
-                                print(f"Could not fetch contact for invoice {invoice.id}: {e}")
-                    
-                    # Fallback: if no contact, use company name
-                    if not contact_name:
-                        contact_name = company_name or props.get("hs_title", "Unknown")
-                    if not contact_email:
-                        contact_email = "unknown@email.com"
-                    
-                    invoice_number = props.get("hs_invoice_number") or props.get("hs_number") or props.get("hs_title") or ""
-
-                    # Use the public invoice link from HubSpot (preferred) or fall back to internal URL
-                    hubspot_url = props.get("hs_invoice_link") or self.get_invoice_url(invoice.id)
-                    
-                    all_invoices.append({
-                        'id': invoice.id,
-                        'number': invoice_number,
-                        'company_name': company_name or props.get("hs_title", ""),
-                        'contact_name': contact_name,
-                        'contact_email': contact_email,
-                        'contact_firstname': contact_firstname,
-                        'contact_lastname': contact_lastname,
-                        'amount': float(props.get("hs_amount_billed", 0)) if props.get("hs_amount_billed") else 0.0,
-                        'balance_due': balance_due,
-                        'due_date': props.get("hs_due_date", ""),
-                        'created_date': props.get("hs_createdate", ""),
-                        'payment_date': payment_date,
-                        'status': payment_status,
-                        'hubspot_url': hubspot_url
-                    })
-                
+            next_page = asyncio.create_task(self._call_api(self._get_invoice_page, None))
+            while next_page:
+                invoices_response = await next_page
                 pages_fetched += 1
                 
-                if hasattr(invoices_response, 'paging') and invoices_response.paging and hasattr(invoices_response.paging, 'next'):
-                    after = invoices_response.paging.next.after
-                else:
-                    break
+                next_page = None
+                paging_next = getattr(invoices_response.paging, 'next', None) if invoices_response.paging else None
+                if pages_fetched < max_pages and paging_next:
+                    next_page = asyncio.create_task(
+                        self._call_api(self._get_invoice_page, paging_next.after)
+                    )
+                
+                total_fetched += len(invoices_response.results)
+                flatten_tasks.append(asyncio.create_task(flatten_page(invoices_response.results)))
             
-            all_invoices.sort(key=lambda x: x['created_date'], reverse=True)
+            pages = await asyncio.gather(*flatten_tasks)
+            unpaid_invoices = [invoice for page in pages for invoice in page]
             
-            unpaid_invoices = [
-                inv for inv in all_invoices 
-                if inv['balance_due'] > 0 and inv['payment_date'] is None
-            ]
+            unpaid_invoices.sort(key=lambda x: x['created_date'], reverse=True)
             
-            print(f"Fetched {len(all_invoices)} total invoices across {pages_fetched} pages, {len(unpaid_invoices)} are UNPAID and RECENT")
+            log.info("Fetched %s total invoices across %s pages, %s are UNPAID and RECENT", total_fetched, pages_fetched, len(unpaid_invoices))
             return unpaid_invoices
         
         except ApiException as e:
             raise Exception(f"Failed to fetch invoices: {str(e)}")
+        finally:
+            # After a failure, stop fetching and flattening pages nobody will read
+            # (cancelling a finished task does nothing)
+            if next_page:
+                next_page.cancel()
+            for task in flatten_tasks:
+                task.cancel()
+    
+    async def get_invoice_by_id(self, invoice_id: str) -> Optional[Dict]:
+        """
+        Fetch a single invoice by ID (same shape as get_invoices entries)
+        Returns None if the invoice doesn't exist
+        """
+        def fetch():
+            invoice = self.client.crm.objects.basic_api.get_by_id(
+                object_type="invoices",
+                object_id=invoice_id,
+                properties=list(_UNPAID_INVOICE_PROPERTIES),
+                associations=list(_INVOICE_ASSOCIATIONS)
+            )
+            return self._invoice_to_dict(invoice)
+        
+        try:
+            return await asyncio.to_thread(fetch)
+        except ApiException as e:
+            if e.status == 404:
+                return None
+            raise Exception(f"Failed to fetch invoice {invoice_id}: {str(e)}")
     
     async def update_invoice_reconciliation_status(self, invoice_id: str, status: str, transaction_details: Optional[str] = None) -> bool:
         """
@@ -174,13 +593,15 @@ class HubSpotClient:
                 "reconciliation_status": status
             }
             
-            self.client.crm.objects.basic_api.update(
+            # Blocking SDK call - run it in a worker thread so bulk approvals can overlap
+            await asyncio.to_thread(
+                self.client.crm.objects.basic_api.update,
                 object_type="invoices",
                 object_id=invoice_id,
                 simple_public_object_input=SimplePublicObjectInput(properties=properties)
             )
             
-            print(f"✅ Updated invoice {invoice_id} to status: {status}")
+            log.info("Updated invoice %s to status: %s", invoice_id, status)
             return True
         
         except ApiException as e:
@@ -203,7 +624,7 @@ class HubSpotClient:
             }
             return True
         except Exception as e:
-            print(f"Failed to add note: {str(e)}")
+            log.warning("Failed to add note: %s", str(e))
             return False
     
     def _extract_invoice_number(self, deal_name: str) -> str:
@@ -9,18 +9,30 @@ from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUse
 from plaid.model.products import Products
 from plaid.model.country_code import CountryCode
 from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
 import plaid
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Optional
+from datetime import date, datetime
+import asyncio
+import hashlib
 import json
 import os
+import time
+
+import database as db
 
 
 class PlaidClient:
     """Client for interacting with Plaid API"""
     
+    # Transactions are kept locally and updated via /transactions/sync; callers
+    # within this window reuse the local copy without asking Plaid for changes
+    SYNC_MIN_INTERVAL_SECONDS = 60
+    SYNC_PAGE_SIZE = 500
+    # The local copy and its cursor are saved here after each sync, so a restart
+    # resumes from the cursor instead of pulling the whole history again
+    TRANSACTION_STORE_FILE = "plaid_transactions.json"
+    
     def __init__(self, client_id: str, secret: str, environment: str = "sandbox"):
         self.client_id = client_id
         self.secret = secret
@@ -41,6 +53,14 @@ class PlaidClient:
         
         # Load saved access token if it exists
         self.access_token = self._load_access_token()
+        
+        # Local copy of the account's credit transactions (transaction_id -> transaction)
+        # and the /transactions/sync cursor it is current to
+        self._transactions: Dict[str, Dict] = {}
+        self._sync_cursor = ""
+        self._synced_at = float("-inf")
+        self._sync_lock = asyncio.Lock()
+        self._load_transaction_store()
     
     def _get_host(self, environment: str) -> str:
         """Get Plaid API host based on environment"""
@@ -79,6 +99,41 @@ class PlaidClient:
                 pass
         return None
     
+    def _item_key(self) -> Optional[str]:
+        """Fingerprint of the access token, so a saved store is only reused for the same item"""
+        if not self.access_token:
+            return None
+        return hashlib.sha256(self.access_token.encode()).hexdigest()[:16]
+    
+    def _load_transaction_store(self):
+        """Restore the transactions and sync cursor saved by the last sync of this item"""
+        if not os.path.exists(self.TRANSACTION_STORE_FILE):
+            return
+        try:
+            with open(self.TRANSACTION_STORE_FILE, 'r') as f:
+                store = json.load(f)
+            if store.get('item') != self._item_key():
+                return
+            self._transactions = store['transactions']
+            self._sync_cursor = store['cursor']
+            print(f"[PLAID] Loaded {len(self._transactions)} stored transactions")
+        except Exception as e:
+            print(f"[PLAID] Could not read transaction store, next sync is a full one: {e}")
+            self._transactions = {}
+            self._sync_cursor = ""
+    
+    def _save_transaction_store(self):
+        """Save the transactions together with the cursor they are current to"""
+        try:
+            db._write_json_atomic(self.TRANSACTION_STORE_FILE, {
+                'item': self._item_key(),
+                'cursor': self._sync_cursor,
+                'transactions': self._transactions,
+                'saved_at': datetime.now().isoformat()
+            })
+        except Exception as e:
+            print(f"[PLAID] Warning: Could not save transaction store: {e}")
+    
     async def create_link_token(self) -> str:
         """
         Create a Link token for Plaid Link initialization
@@ -112,6 +167,12 @@ class PlaidClient:
             response = self.client.item_public_token_exchange(request)
             self.access_token = response['access_token']
             
+            # A new item means a new transaction history
+            self._transactions = {}
+            self._sync_cursor = ""
+            self._synced_at = float("-inf")
+            self._save_transaction_store()
+            
             # Save token to file
             self._save_access_token(self.access_token)
             
@@ -120,60 +181,106 @@ class PlaidClient:
         except plaid.ApiException as e:
             raise Exception(f"Failed to exchange token: {str(e)}")
     
+    @staticmethod
+    def _format_transaction(txn) -> Optional[Dict]:
+        """Convert a Plaid transaction to our dict shape, or None if it's a debit"""
+        # CRITICAL: Plaid uses POSITIVE for debits (money out), NEGATIVE for credits (money in)
+        # We flip this to be intuitive: positive = money in, negative = money out
+        amount = -txn['amount']
+        
+        # ONLY include credits (money coming IN to your account)
+        # Skip all debits (money going OUT like Wise payments to employees)
+        if amount <= 0:
+            return None
+        
+        return {
+            'transaction_id': txn['transaction_id'],
+            'date': txn['date'].isoformat() if isinstance(txn['date'], date) else str(txn['date']),
+            'amount': amount,
+            'description': txn['name'],
+            'merchant': txn.get('merchant_name', ''),
+            'category': txn.get('category', []),
+            'pending': txn.get('pending', False),
+            'is_credit': True  # All transactions in this list are credits
+        }
+    
+    def _fetch_sync_updates(self, cursor: str):
+        """Page through /transactions/sync from a cursor; returns (added/modified, removed IDs, next cursor)"""
+        upserts = []
+        removed = []
+        while True:
+            response = self.client.transactions_sync(TransactionsSyncRequest(
+                access_token=self.access_token,
+                cursor=cursor,
+                count=self.SYNC_PAGE_SIZE
+            ))
+            upserts.extend(response['added'])
+            upserts.extend(response['modified'])
+            removed.extend(txn['transaction_id'] for txn in response['removed'])
+            cursor = response['next_cursor']
+            if not response['has_more']:
+                return upserts, removed, cursor
+    
+    async def sync_transactions(self, force: bool = False):
+        """
+        Bring the local transaction copy up to date with Plaid
+        
+        Only changes since the last cursor are fetched, so after the first full
+        sync each call moves a small delta instead of the whole date range.
+        """
+        async with self._sync_lock:
+            if not force and time.monotonic() - self._synced_at < self.SYNC_MIN_INTERVAL_SECONDS:
+                return
+            
+            try:
+                # The Plaid SDK is synchronous; run it in a worker so callers can overlap it with other I/O
+                upserts, removed, cursor = await asyncio.to_thread(self._fetch_sync_updates, self._sync_cursor)
+            except plaid.ApiException as e:
+                error_body = e.body if hasattr(e, 'body') else str(e)
+                if 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION' not in str(error_body):
+                    raise Exception(f"Failed to fetch transactions; {error_body}")
+                # Data changed mid-pagination: restart the whole update from the same cursor
+                upserts, removed, cursor = await asyncio.to_thread(self._fetch_sync_updates, self._sync_cursor)
+            
+            for transaction_id in removed:
+                self._transactions.pop(transaction_id, None)
+            for txn in upserts:
+                formatted = self._format_transaction(txn)
+                if formatted:
+                    self._transactions[formatted['transaction_id']] = formatted
+                else:
+                    # Modified into a debit (or never a credit)
+                    self._transactions.pop(txn['transaction_id'], None)
+            self._sync_cursor = cursor
+            self._synced_at = time.monotonic()
+            # Still under the sync lock, so nothing changes the store while it's written
+            await asyncio.to_thread(self._save_transaction_store)
+            print(f"[PLAID] Synced transactions: {len(upserts)} added/modified, {len(removed)} removed, {len(self._transactions)} credits stored")
+    
     async def get_transactions(
         self, 
         start_date: str, 
         end_date: str
     ) -> List[Dict]:
         """
-        Fetch transactions from connected bank account
+        Get transactions from connected bank account
         
         Args:
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
         
         Returns:
-            List of transaction dictionaries (ONLY CREDITS - money coming in)
+            List of transaction dictionaries (ONLY CREDITS - money coming in), newest first
         """
         if not self.access_token:
             raise Exception("No access token available. Please connect your bank account first.")
         
-        try:
-            request = TransactionsGetRequest(
-                access_token=self.access_token,
-                start_date=datetime.strptime(start_date, "%Y-%m-%d").date(),
-                end_date=datetime.strptime(end_date, "%Y-%m-%d").date(),
-                options=TransactionsGetRequestOptions()
-            )
-            
-            response = self.client.transactions_get(request)
-            
-            # Format transactions
-            # CRITICAL: Plaid uses POSITIVE for debits (money out), NEGATIVE for credits (money in)
-            # We flip this to be intuitive: positive = money in, negative = money out
-            transactions = []
-            for txn in response['transactions']:
-                # Flip the amount sign
-                amount = -txn['amount']
-                
-                # ONLY include credits (money coming IN to your account)
-                # Skip all debits (money going OUT like Wise payments to employees)
-                if amount <= 0:
-                    continue
-                
-                transactions.append({
-                    'transaction_id': txn['transaction_id'],
-                    'date': txn['date'].isoformat() if hasattr(txn['date'], 'isoformat') else str(txn['date']),
-                    'amount': amount,
-                    'description': txn['name'],
-                    'merchant': txn.get('merchant_name', ''),
-                    'category': txn.get('category', []),
-                    'pending': txn.get('pending', False),
-                    'is_credit': True  # All transactions in this list are credits
-                })
-            
-            return transactions
+        await self.sync_transactions()
         
-        except plaid.ApiException as e:
-            error_body = e.body if hasattr(e, 'body') else str(e)
-            raise Exception(f"Failed to fetch transactions; {error_body}")
\ No newline at end of file
+        # ISO dates compare correctly as strings
+        transactions = [
+            txn for txn in self._transactions.values()
+            if start_date <= txn['date'][:10] <= end_date
+        ]
+        transactions.sort(key=lambda txn: txn['date'], reverse=True)
+        return transactions
@@ -5,14 +5,36 @@ Autonomous collections agent that manages accounts receivable
 
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+import asyncio
 import json
 import os
+import threading
 from collections import defaultdict
+from bisect import bisect_right
+from functools import lru_cache
 
 # Import database module for Railway-compatible storage
 import database as db
 
 
+@lru_cache(maxsize=4096)
+def parse_hubspot_date(value: str) -> Optional[datetime]:
+    """
+    Parse a HubSpot ISO timestamp (e.g. a due date) into a naive datetime
+    Cached because the same due dates recur across invoices and requests.
+    Returns None if the value can't be parsed.
+    """
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except (AttributeError, ValueError):
+        return None
+
+
+# Lower bounds (days overdue) of the aging buckets reported in the analysis summary
+OVERDUE_BUCKET_EDGES = (0, 30, 60, 90)
+OVERDUE_BUCKET_LABELS = ('0-30', '30-60', '60-90', '90+')
+
+
 class KlausEngine:
     """
     Klaus - Autonomous Collections Agent
@@ -23,12 +45,30 @@ class KlausEngine:
     CONSOLIDATES INVOICES BY COMPANY - sends one email per company
     """
 
+    # Config changes arriving within this window are written together
+    CONFIG_SAVE_DELAY_SECONDS = 0.25
+    # Communication log entries are buffered and written in one batch per interval
+    COMMUNICATION_FLUSH_SECONDS = 1.0
+
     def __init__(self, config_path: str = "klaus_config.json"):
         self.config_path = config_path
         # Use database module for persistent storage (works on Railway)
         self.config = self._load_config()
+        self._save_task: Optional[asyncio.Task] = None
+        # Config saves run in worker threads and can overlap (a scheduled save and the
+        # shutdown flush); each snapshot is numbered so an older one never overwrites a newer one
+        self._config_version = 0
+        self._config_saved_version = 0
+        self._config_save_lock = threading.Lock()
         self.communication_history = []
+        # invoice_id -> that invoice's communication_history entries, in log order
+        self._history_by_invoice: Dict[str, List[Dict]] = {}
         self._load_history()
+        self._pending_communications: List[Dict] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Held across a whole flush so the timer and shutdown flushes write one at a time
+        self._flush_lock = threading.Lock()
         
         # Autonomy thresholds
         self.high_value_threshold = self.config.get('high_value_threshold', 5000)
@@ -45,7 +85,39 @@ class KlausEngine:
 
     def save_config(self):
         """Save current configuration to database (Railway) or JSON file (local dev)"""
-        db.save_klaus_config(self.config)
+        self._write_config(*self._config_snapshot())
+
+    def _config_snapshot(self):
+        """Copy the config with the next version number (call from the thread that changes it)"""
+        self._config_version += 1
+        return dict(self.config), self._config_version
+
+    def _write_config(self, config: Dict, version: int):
+        """Persist a config snapshot unless a newer one has already been written"""
+        with self._config_save_lock:
+            if version <= self._config_saved_version:
+                return
+            db.save_klaus_config(config)
+            self._config_saved_version = version
+
+    def schedule_save_config(self):
+        """
+        Save config shortly after the last change (call from the event loop)
+        Rapid successive updates (e.g. dragging a slider) collapse into one write
+        """
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+        self._save_task = asyncio.get_running_loop().create_task(self._save_config_later())
+
+    async def _save_config_later(self):
+        await asyncio.sleep(self.CONFIG_SAVE_DELAY_SECONDS)
+        await asyncio.to_thread(self._write_config, *self._config_snapshot())
+
+    async def flush_config(self):
+        """Write a still-pending scheduled config save now (called on shutdown)"""
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+            await asyncio.to_thread(self._write_config, *self._config_snapshot())
     
     def _extract_invoice_number(self, invoice: Dict) -> str:
         """
@@ -191,14 +263,8 @@ class KlausEngine:
         contact_email = self._extract_contact_email(invoice)
         
         # Calculate days overdue
-        if due_date:
-            try:
-                due_dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                days_overdue = (datetime.now() - due_dt.replace(tzinfo=None)).days
-            except:
-                days_overdue = 0
-        else:
-            days_overdue = 0
+        due_dt = parse_hubspot_date(due_date) if due_date else None
+        days_overdue = (datetime.now() - due_dt).days if due_dt else 0
         
         # Check communication history for THIS invoice
         previous_contacts = self._get_contact_history(invoice_id)
@@ -282,21 +348,20 @@ class KlausEngine:
     
     def _get_contact_history(self, invoice_id: str) -> List[Dict]:
         """Get all previous contacts for this invoice"""
-        return [c for c in self.communication_history if c['invoice_id'] == invoice_id]
+        return list(self._history_by_invoice.get(invoice_id, ()))
 
     def is_invoice_approved(self, invoice_id: str) -> bool:
         """
         Check if an invoice has been manually approved/resolved.
         Returns True if the invoice was marked as approved and should not receive reminders.
         """
-        for comm in self.communication_history:
-            if comm['invoice_id'] == invoice_id:
-                # Check if approved by user (not autonomous)
-                if comm.get('approved_by') == 'manual':
-                    # Check message type - if it was marked as 'approved' or 'resolved'
-                    msg_type = comm.get('message_type', '')
-                    if msg_type in ['approved', 'resolved', 'paid', 'reconciled']:
-                        return True
+        for comm in self._history_by_invoice.get(invoice_id, ()):
+            # Check if approved by user (not autonomous)
+            if comm.get('approved_by') == 'manual':
+                # Check message type - if it was marked as 'approved' or 'resolved'
+                msg_type = comm.get('message_type', '')
+                if msg_type in ['approved', 'resolved', 'paid', 'reconciled']:
+                    return True
         return False
 
     def mark_invoice_approved(self, invoice_id: str, company_name: str):
@@ -378,11 +443,8 @@ class KlausEngine:
         for inv in sorted_invoices:
             due_date_str = ""
             if inv.get('due_date'):
-                try:
-                    due_dt = datetime.fromisoformat(inv['due_date'].replace('Z', '+00:00'))
-                    due_date_str = due_dt.strftime('%m/%d/%Y')
-                except:
-                    due_date_str = "Unknown"
+                due_dt = parse_hubspot_date(inv['due_date'])
+                due_date_str = due_dt.strftime('%m/%d/%Y') if due_dt else "Unknown"
             
             # Include company name if multiple companies
             company_str = f" | {inv['company_name'][:25]}" if len(companies) > 1 else ""
@@ -861,19 +923,60 @@ Best regards,
         message_type: str,
         approved_by: Optional[str] = None
     ):
-        """Log a communication attempt to database (Railway) or JSON file (local dev)"""
-        # Add to local cache
-        self.communication_history.append({
+        """
+        Log a communication attempt to database (Railway) or JSON file (local dev)
+        The entry is visible in communication_history immediately; persisting is
+        batched and happens within COMMUNICATION_FLUSH_SECONDS.
+        """
+        self.log_communications([{
             'invoice_id': invoice_id,
             'company_name': company_name,
             'method': method,
             'message_type': message_type,
-            'sent_at': datetime.now().isoformat(),
             'approved_by': approved_by
-        })
+        }])
 
-        # Save to database/file
-        db.add_communication(invoice_id, company_name, method, message_type, approved_by)
+    def log_communications(self, entries: List[Dict]):
+        """
+        Log several communication attempts at once (e.g. every invoice covered by
+        a batch of reminder emails). Each entry has invoice_id, company_name,
+        method, message_type and optionally approved_by.
+        """
+        sent_at = datetime.now().isoformat()
+        entries = [
+            {
+                'invoice_id': entry.get('invoice_id'),
+                'company_name': entry.get('company_name'),
+                'method': entry.get('method'),
+                'message_type': entry.get('message_type'),
+                'sent_at': sent_at,
+                'approved_by': entry.get('approved_by')
+            }
+            for entry in entries
+        ]
+        # Add to local cache
+        self.communication_history.extend(entries)
+        self._index_history(entries)
+
+        # Queue for the next batched save to database/file
+        with self._pending_lock:
+            self._pending_communications.extend(entries)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.COMMUNICATION_FLUSH_SECONDS, self.flush_communications)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush_communications(self):
+        """Persist any buffered communication log entries (also called on shutdown)"""
+        with self._flush_lock:
+            with self._pending_lock:
+                entries = self._pending_communications
+                self._pending_communications = []
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if entries:
+                db.add_communications(entries)
 
     def _save_history(self):
         """Save communication history to database (Railway) or JSON file (local dev)"""
@@ -882,6 +985,13 @@ Best regards,
     def _load_history(self):
         """Load communication history from database (Railway) or JSON file (local dev)"""
         self.communication_history = db.load_communication_history()
+        self._history_by_invoice = {}
+        self._index_history(self.communication_history)
+
+    def _index_history(self, entries: List[Dict]):
+        """Add communication log entries to the per-invoice index"""
+        for entry in entries:
+            self._history_by_invoice.setdefault(entry.get('invoice_id'), []).append(entry)
     
     def get_pending_approvals(self) -> List[Dict]:
         """Get all actions that require approval"""
@@ -901,16 +1011,30 @@ Best regards,
         - No action needed
         """
         
-        # First, analyze each invoice individually
-        all_analyses = []
+        # Analyze each invoice individually, grouping by CONTACT PERSON (not company)
+        # and accumulating the totals in the same pass
+        by_contact = defaultdict(list)
+        no_action_count = 0
+        total_overdue_count = 0
+        total_overdue_amount = 0.0
+        bucket_counts = [0] * len(OVERDUE_BUCKET_EDGES)
+        bucket_amounts = [0.0] * len(OVERDUE_BUCKET_EDGES)
         for invoice in invoices:
             analysis = self.analyze_invoice(invoice)
-            all_analyses.append(analysis)
-        
-        # Group invoices by CONTACT PERSON (not company)
-        by_contact = defaultdict(list)
-        for analysis in all_analyses:
-            if analysis['action_required'] != 'none':
+
+            balance_due = invoice.get('balance_due', 0) or 0
+            if balance_due > 0:
+                total_overdue_count += 1
+                total_overdue_amount += balance_due
+                days_overdue = analysis.get('days_overdue', 0)
+                if days_overdue > 0:
+                    bucket = bisect_right(OVERDUE_BUCKET_EDGES, days_overdue - 1) - 1
+                    bucket_counts[bucket] += 1
+                    bucket_amounts[bucket] += balance_due
+            
+            if analysis['action_required'] == 'none':
+                no_action_count += 1
+            else:
                 # Get contact email as unique identifier
                 contact_email = analysis.get('contact_email', 'unknown')
                 contact_name = analysis.get('contact_name', analysis['company_name'])
@@ -927,6 +1051,9 @@ Best regards,
         pending_approvals = []
         no_action = []
         
+        # VIP keywords are the same for every contact, so upper-case them once
+        vip_keywords = [k.upper() for k in self.config.get('vip_contacts', []) if k]
+        
         for contact_key, contact_invoices in by_contact.items():
             # Determine highest escalation level for this contact
             max_escalation = max(inv['escalation_level'] for inv in contact_invoices)
@@ -938,15 +1065,13 @@ Best regards,
             contact_name = first_invoice.get('contact_name', first_invoice['company_name'])
             contact_email = first_invoice.get('contact_email', 'unknown')
             
+            companies = list(set(inv['company_name'] for inv in contact_invoices))
+            
             # Check if this is a VIP contact (check all companies)
             # Use substring matching - e.g., "Terra" matches "TERRA WEST MF INVESTMENTS LLC"
-            vip_keywords = [k for k in self.config.get('vip_contacts', []) if k]
             is_vip = any(
-                any(
-                    vip_keyword.upper() in (inv.get('company_name') or '').upper()
-                    for vip_keyword in vip_keywords
-                )
-                for inv in contact_invoices
+                any(vip_keyword in (company or '').upper() for vip_keyword in vip_keywords)
+                for company in companies
             )
             
             # Get all contact history for this person (across all their companies)
@@ -963,7 +1088,7 @@ Best regards,
             # Generate consolidated message
             consolidated_message = self._generate_consolidated_message(
                 contact_name=contact_name,
-                companies=list(set(inv['company_name'] for inv in contact_invoices)),
+                companies=companies,
                 invoices=contact_invoices,
                 escalation_level=max_escalation,
                 all_company_contacts=company_contacts,
@@ -974,7 +1099,7 @@ Best regards,
             action = {
                 'contact_name': contact_name,
                 'contact_email': contact_email,
-                'companies': list(set(inv['company_name'] for inv in contact_invoices)),
+                'companies': companies,
                 'invoice_count': len(contact_invoices),
                 'invoices': contact_invoices,
                 'total_balance': total_balance,
@@ -994,9 +1119,6 @@ Best regards,
                 elif action['action_required'] == 'call':
                     autonomous_calls.append(action)
         
-        # Count invoices that need no action
-        no_action_invoices = [a for a in all_analyses if a['action_required'] == 'none']
-        
         self._pending_approvals = pending_approvals
         
         return {
@@ -1005,10 +1127,16 @@ Best regards,
             'autonomous_emails': autonomous_emails,
             'autonomous_calls': autonomous_calls,
             'pending_approvals': pending_approvals,
-            'no_action_count': len(no_action_invoices),
+            'no_action_count': no_action_count,
             'summary': {
                 'contacts_to_email': len(autonomous_emails) + len(autonomous_calls),
                 'contacts_need_approval': len(pending_approvals),
-                'invoices_no_action': len(no_action_invoices)
+                'invoices_no_action': no_action_count,
+                'total_overdue_count': total_overdue_count,
+                'total_overdue_amount': total_overdue_amount,
+                'overdue_buckets': {
+                    label: {'count': count, 'amount': amount}
+                    for label, count, amount in zip(OVERDUE_BUCKET_LABELS, bucket_counts, bucket_amounts)
+                }
             }
         }
\ No newline at end of file
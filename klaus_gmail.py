@@ -10,13 +10,69 @@ import base64
 import re
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
 from datetime import datetime
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from functools import lru_cache
+import logging
 import pickle
+import threading
+
+
+log = logging.getLogger("klaus.gmail")
+
+
+# Email classification patterns - compiled once and checked in priority order
+_INVOICE_NUMBER_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (r'INV-(\d+)', r'Invoice #(\d+)', r'Invoice (\d+)', r'#(\d{4,})')
+)
+_PAYMENT_CONFIRMATION_RE = re.compile(
+    '|'.join(re.escape(keyword) for keyword in (
+        'payment sent', 'payment processed', 'paid', 'check mailed',
+        'wire sent', 'ach transfer', 'invoice paid', 'payment confirmation',
+        'transaction complete'
+    )),
+    re.IGNORECASE
+)
+
+# The same unread emails are re-examined on every poll until they're handled,
+# so classification results are memoised per body
+_CLASSIFICATION_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_CLASSIFICATION_CACHE_SIZE)
+def _detect_payment_confirmation(email_body: str) -> bool:
+    return _PAYMENT_CONFIRMATION_RE.search(email_body) is not None
+
+
+@lru_cache(maxsize=_CLASSIFICATION_CACHE_SIZE)
+def _detect_document_request(email_body: str) -> Optional[str]:
+    email_lower = email_body.lower()
+    
+    if any(term in email_lower for term in ['w-9', 'w9', 'ein', 'tax id']):
+        return 'w9'
+    if any(term in email_lower for term in ['certificate of insurance', 'coi', 'insurance cert']):
+        return 'coi'
+    if any(term in email_lower for term in ['dba', 'business registration', 'doing business as']):
+        return 'dba'
+    if 'ach' in email_lower and any(term in email_lower for term in ['form', 'information', 'details']):
+        return 'ach_form'
+    
+    return None
+
+
+@lru_cache(maxsize=_CLASSIFICATION_CACHE_SIZE)
+def _extract_invoice_number(email_body: str) -> Optional[str]:
+    for pattern in _INVOICE_NUMBER_PATTERNS:
+        match = pattern.search(email_body)
+        if match:
+            return match.group(1)
+    
+    return None
 
 
 class InvoiceHyperlinker:
@@ -119,9 +175,22 @@ class KlausGmailClient:
     def __init__(self, credentials_file: str = "klaus_credentials.json"):
         self.credentials_file = credentials_file
         self.token_file = "klaus_token.pickle"
-        self.service = None
+        self._creds = None
+        self._local = threading.local()
         self._authenticate()
 
+    @property
+    def service(self):
+        """
+        Gmail API service for the calling thread
+        httplib2 connections aren't thread-safe, so each worker thread gets its own.
+        """
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = build('gmail', 'v1', credentials=self._creds, cache_discovery=False)
+            self._local.service = service
+        return service
+
     def _authenticate(self):
         """Authenticate with Gmail API - supports env vars or file-based credentials"""
         creds = None
@@ -163,7 +232,8 @@ class KlausGmailClient:
                 with open(self.token_file, 'wb') as token:
                     pickle.dump(creds, token)
 
-        self.service = build('gmail', 'v1', credentials=creds)
+        self._creds = creds
+        self._local.service = build('gmail', 'v1', credentials=creds, cache_discovery=False)
         print("[GMAIL] [OK] Gmail service initialized")
     
     def send_email(
@@ -174,7 +244,8 @@ class KlausGmailClient:
         body: str,
         cc: Optional[str] = None,
         attachments: Optional[List[str]] = None,
-        invoice_map: Optional[Dict[str, str]] = None
+        invoice_map: Optional[Dict[str, str]] = None,
+        attachments_bytes: Optional[List[Tuple[str, bytes]]] = None
     ) -> Dict:
         """
         Send an email (with HTML support and invoice hyperlinking)
@@ -188,14 +259,14 @@ class KlausGmailClient:
             attachments: Optional list of file paths to attach
             invoice_map: Dict mapping invoice numbers to HubSpot URLs
                         If provided, invoice numbers will be hyperlinked
+            attachments_bytes: Optional list of (filename, data) pairs to attach from memory
         
         Returns:
             Dict with status and message_id
         """
         
         try:
-            print(f"[GMAIL] Preparing email to {to_email}")
-            print(f"[GMAIL] invoice_map received: {invoice_map}")
+            log.debug("preparing email to %s, invoice_map: %s", to_email, invoice_map)
 
             message = MIMEMultipart('alternative')
             message['To'] = f"{to_name} <{to_email}>"
@@ -209,7 +280,7 @@ class KlausGmailClient:
 
             if is_html:
                 # Body is already HTML - send as HTML
-                print("[GMAIL] Body is HTML - sending as HTML email")
+                log.debug("body is HTML - sending as HTML email")
                 # Add a plain text fallback (strip tags for plain version)
                 import re
                 plain_text = re.sub('<[^<]+?>', '', body)
@@ -217,20 +288,23 @@ class KlausGmailClient:
                 message.attach(MIMEText(body, 'html'))
             elif invoice_map:
                 # Plain text with invoice_map - create HTML with hyperlinks
-                print(f"[GMAIL] Creating HTML with hyperlinked invoices: {list(invoice_map.keys())}")
+                log.debug("creating HTML with hyperlinked invoices: %s", list(invoice_map))
                 message.attach(MIMEText(body, 'plain'))
                 html_body = InvoiceHyperlinker.create_html_email(body, invoice_map)
                 message.attach(MIMEText(html_body, 'html'))
-                print(f"[GMAIL] HTML body preview: {html_body[:500]}...")
+                log.debug("HTML body preview: %.500s...", html_body)
             else:
                 # Plain text only
-                print("[GMAIL] No invoice_map - sending plain text only")
+                log.debug("no invoice_map - sending plain text only")
                 message.attach(MIMEText(body, 'plain'))
             
             # Add attachments if provided
             if attachments:
                 for file_path in attachments:
                     self._attach_file(message, file_path)
+            if attachments_bytes:
+                for filename, file_data in attachments_bytes:
+                    self._attach_bytes(message, filename, file_data)
             
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
             
@@ -258,22 +332,33 @@ class KlausGmailClient:
     
     def _attach_file(self, message: MIMEMultipart, file_path: str):
         """Attach a file to the email message"""
+        with open(file_path, 'rb') as f:
+            self._attach_bytes(message, os.path.basename(file_path), f.read())
+    
+    def _attach_bytes(self, message: MIMEMultipart, filename: str, file_data: bytes):
+        """Attach in-memory file contents to the email message"""
         from email.mime.application import MIMEApplication
         
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
-            filename = os.path.basename(file_path)
-            
-            part = MIMEApplication(file_data, Name=filename)
-            part['Content-Disposition'] = f'attachment; filename="{filename}"'
-            message.attach(part)
+        part = MIMEApplication(file_data, Name=filename)
+        part['Content-Disposition'] = f'attachment; filename="{filename}"'
+        message.attach(part)
+    
+    # Gmail caps a batch at 100 calls but recommends 50 to stay under per-user rate limits
+    BATCH_SIZE = 50
+    # Messages listed and fetched per window by iter_recent_emails
+    STREAM_WINDOW_SIZE = 10
     
     def get_recent_emails(
         self,
-        query: str = "in:inbox is:unread",
+        query: str = "in:inbox is:unread -label:Klaus-Responded",
         max_results: int = 50
     ) -> List[Dict]:
-        """Get recent emails matching query"""
+        """
+        Get recent emails matching query
+        
+        The list call only returns IDs; full messages are then fetched with
+        batch requests (one HTTP round trip per BATCH_SIZE messages).
+        """
         
         try:
             results = self.service.users().messages().list(
@@ -282,20 +367,71 @@ class KlausGmailClient:
                 maxResults=max_results
             ).execute()
             
-            messages = results.get('messages', [])
-            
-            emails = []
-            for msg in messages:
-                email_data = self.get_email_details(msg['id'])
-                if email_data:
-                    emails.append(email_data)
-            
-            return emails
+            return self._fetch_messages(results.get('messages', []))
         
         except Exception as e:
             print(f"Error getting emails: {e}")
             return []
     
+    def iter_recent_emails(
+        self,
+        query: str = "in:inbox is:unread -label:Klaus-Responded",
+        max_results: int = 50
+    ) -> Iterator[List[Dict]]:
+        """
+        Like get_recent_emails, but yields the emails a window at a time
+        
+        Each window is one list call (continuing from the previous page token)
+        plus one batch request, so the first emails are available before the
+        rest have been fetched.
+        """
+        
+        remaining = max_results
+        page_token = None
+        try:
+            while remaining > 0:
+                results = self.service.users().messages().list(
+                    userId='me',
+                    q=query,
+                    maxResults=min(self.STREAM_WINDOW_SIZE, remaining),
+                    pageToken=page_token
+                ).execute()
+                
+                messages = results.get('messages', [])
+                if not messages:
+                    return
+                yield self._fetch_messages(messages)
+                
+                remaining -= len(messages)
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return
+        
+        except Exception as e:
+            print(f"Error getting emails: {e}")
+    
+    def _fetch_messages(self, messages: List[Dict]) -> List[Dict]:
+        """Fetch and parse listed messages with batch requests, keeping Gmail's (newest first) order"""
+        
+        fetched = {}
+        
+        def on_message(request_id, response, exception):
+            if exception is not None:
+                print(f"Error getting email details: {exception}")
+                return
+            fetched[request_id] = self._parse_message(response)
+        
+        for start in range(0, len(messages), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=on_message)
+            for msg in messages[start:start + self.BATCH_SIZE]:
+                batch.add(
+                    self.service.users().messages().get(userId='me', id=msg['id'], format='full'),
+                    request_id=msg['id']
+                )
+            batch.execute()
+        
+        return [fetched[msg['id']] for msg in messages if fetched.get(msg['id'])]
+    
     def get_email_details(self, message_id: str) -> Dict:
         """Get full details of an email"""
         
@@ -306,28 +442,33 @@ class KlausGmailClient:
                 format='full'
             ).execute()
             
-            headers = message['payload']['headers']
-            
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-            from_email = next((h['value'] for h in headers if h['name'] == 'From'), '')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-            
-            body = self._get_email_body(message['payload'])
-            
-            return {
-                'id': message_id,
-                'subject': subject,
-                'from': from_email,
-                'date': date,
-                'body': body,
-                'snippet': message.get('snippet', ''),
-                'thread_id': message.get('threadId', '')
-            }
+            return self._parse_message(message)
         
         except Exception as e:
             print(f"Error getting email details: {e}")
             return {}
     
+    def _parse_message(self, message: Dict) -> Dict:
+        """Convert a full-format Gmail message into our email dict"""
+        
+        headers = message['payload']['headers']
+        
+        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
+        from_email = next((h['value'] for h in headers if h['name'] == 'From'), '')
+        date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
+        
+        body = self._get_email_body(message['payload'])
+        
+        return {
+            'id': message['id'],
+            'subject': subject,
+            'from': from_email,
+            'date': date,
+            'body': body,
+            'snippet': message.get('snippet', ''),
+            'thread_id': message.get('threadId', '')
+        }
+    
     def _get_email_body(self, payload: Dict) -> str:
         """Extract email body from payload"""
         
@@ -433,48 +574,15 @@ class KlausGmailClient:
     
     def detect_payment_confirmation(self, email_body: str) -> bool:
         """Detect if an email is a payment confirmation"""
-        
-        payment_keywords = [
-            'payment sent', 'payment processed', 'paid', 'check mailed',
-            'wire sent', 'ach transfer', 'invoice paid', 'payment confirmation',
-            'transaction complete'
-        ]
-        
-        email_lower = email_body.lower()
-        return any(keyword in email_lower for keyword in payment_keywords)
+        return _detect_payment_confirmation(email_body)
     
     def detect_document_request(self, email_body: str) -> Optional[str]:
         """Detect if email is requesting documents"""
-        
-        email_lower = email_body.lower()
-        
-        if any(term in email_lower for term in ['w-9', 'w9', 'ein', 'tax id']):
-            return 'w9'
-        if any(term in email_lower for term in ['certificate of insurance', 'coi', 'insurance cert']):
-            return 'coi'
-        if any(term in email_lower for term in ['dba', 'business registration', 'doing business as']):
-            return 'dba'
-        if 'ach' in email_lower and any(term in email_lower for term in ['form', 'information', 'details']):
-            return 'ach_form'
-        
-        return None
+        return _detect_document_request(email_body)
     
     def extract_invoice_number(self, email_body: str) -> Optional[str]:
         """Extract invoice number from email body"""
-        
-        patterns = [
-            r'INV-(\d+)',
-            r'Invoice #(\d+)',
-            r'Invoice (\d+)',
-            r'#(\d{4,})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, email_body, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return None
+        return _extract_invoice_number(email_body)
 
 
 class KlausEmailResponder:
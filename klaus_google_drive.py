@@ -144,13 +144,8 @@ class KlausGoogleDrive:
         """
         
         try:
-            request = self.service.files().get_media(fileId=file_id)
-            
             with io.FileIO(destination_path, 'wb') as fh:
-                downloader = MediaIoBaseDownload(fh, request)
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
+                self._download_to(file_id, fh)
             
             return True
         
@@ -158,6 +153,34 @@ class KlausGoogleDrive:
             print(f"Error downloading document: {e}")
             return False
     
+    def download_document_bytes(self, file_id: str) -> Optional[bytes]:
+        """
+        Download a document from Drive into memory
+        
+        Args:
+            file_id: Google Drive file ID
+        
+        Returns:
+            File contents, or None if the download failed
+        """
+        
+        try:
+            buffer = io.BytesIO()
+            self._download_to(file_id, buffer)
+            return buffer.getvalue()
+        
+        except Exception as e:
+            print(f"Error downloading document: {e}")
+            return None
+    
+    def _download_to(self, file_id: str, fh):
+        """Stream a Drive file's contents into a writable file object"""
+        request = self.service.files().get_media(fileId=file_id)
+        downloader = MediaIoBaseDownload(fh, request)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+    
     def search_knowledge_base(self, query: str, max_results: int = 5) -> List[Dict]:
         """
         Search meeting transcripts and knowledge base documents
@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
 import os
 
 from klaus_engine import KlausEngine
@@ -120,7 +121,7 @@ async def analyze_collections(
         ]
         
         # Analyze with Klaus
-        analysis = klaus_engine.analyze_overdue_invoices(unpaid_invoices)
+        analysis = await asyncio.to_thread(klaus_engine.analyze_overdue_invoices, unpaid_invoices)
         
         return {
             "status": "success",
@@ -200,20 +201,21 @@ async def send_collection_email(
         # Check if documents should be attached
         documents_to_attach = []
         if 'w-9' in message.lower() or 'w9' in message.lower():
-            w9_doc = klaus_drive.get_document('w9') if klaus_drive else None
+            w9_doc = await asyncio.to_thread(klaus_drive.get_document, 'w9') if klaus_drive else None
             if w9_doc:
-                # Download and attach
-                temp_path = f"/tmp/w9_{invoice['id']}.pdf"
-                if klaus_drive.download_document(w9_doc['id'], temp_path):
-                    documents_to_attach.append(temp_path)
+                # Download into memory and attach (no temp file to clean up)
+                w9_data = await asyncio.to_thread(klaus_drive.download_document_bytes, w9_doc['id'])
+                if w9_data is not None:
+                    documents_to_attach.append((f"w9_{invoice['id']}.pdf", w9_data))
         
         # Send email
-        result = klaus_gmail.send_email(
+        result = await asyncio.to_thread(
+            klaus_gmail.send_email,
             to_email=contact['email'],
             to_name=contact.get('name', 'there'),
             subject=subject_line,
             body=body,
-            attachments=documents_to_attach if documents_to_attach else None
+            attachments_bytes=documents_to_attach if documents_to_attach else None
         )
         
         if result['status'] == 'success':
@@ -503,7 +505,7 @@ async def run_daily_collections(hubspot_client, background_tasks: BackgroundTask
         unpaid = [inv for inv in invoices if inv.get('payment_status') != 'Paid']
         
         # 2. Analyze all invoices
-        analysis = klaus_engine.analyze_overdue_invoices(unpaid)
+        analysis = await asyncio.to_thread(klaus_engine.analyze_overdue_invoices, unpaid)
         
         results = {
             'emails_sent': 0,
@@ -6,16 +6,103 @@ v2 - Added logging for debugging
 """
 
 import os
+import re
+import atexit
+import queue
 import smtplib
 import imaplib
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
+from email.utils import getaddresses
 from typing import Dict, Optional, List
 from datetime import datetime
 import time
 
+# Idle SMTP connections kept open between sends
+SMTP_POOL_SIZE = 5
+# Messages sent over one connection before it is recycled
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+# Socket timeout for SMTP connections
+SMTP_TIMEOUT_SECONDS = 20
+# Socket timeout for the IMAP connection that saves sent emails to the Sent folder
+IMAP_TIMEOUT_SECONDS = 20
+# How long a NOOP health check may take before the connection is treated as stale
+SMTP_NOOP_TIMEOUT_SECONDS = 5
+# Batch MAIL FROM / RCPT TO / DATA into one write when the server advertises PIPELINING (RFC 2920)
+SMTP_PIPELINING = os.getenv("SMTP_PIPELINING") == "1"
+
+_LEADING_DOT_RE = re.compile(rb'^\.', re.MULTILINE)
+
+
+class SMTPPool:
+    """Reuse logged-in SMTP connections instead of connecting, TLS-handshaking and authenticating per email"""
+
+    def __init__(self, connect, size: int = SMTP_POOL_SIZE):
+        self._connect = connect
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def acquire(self):
+        """Yield a live connection; it goes back to the pool if the block succeeds, otherwise it is dropped"""
+        server, sent = self._get()
+        try:
+            yield server
+        except Exception:
+            self._close(server)
+            raise
+        self._release(server, sent + 1)
+
+    def _get(self):
+        while True:
+            try:
+                server, sent = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), 0
+            if self._is_alive(server):
+                return server, sent
+            self._close(server)
+
+    def _release(self, server, sent: int):
+        if sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            self._close(server)
+            return
+        try:
+            self._idle.put_nowait((server, sent))
+        except queue.Full:
+            self._close(server)
+
+    @staticmethod
+    def _is_alive(server) -> bool:
+        try:
+            server.sock.settimeout(SMTP_NOOP_TIMEOUT_SECONDS)
+            alive = server.noop()[0] == 250
+            server.sock.settimeout(SMTP_TIMEOUT_SECONDS)
+            return alive
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """QUIT every idle connection"""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
 
 class KlausSMTPClient:
     """Send Klaus collection emails via SMTP with Sent folder saving"""
@@ -33,6 +120,26 @@ class KlausSMTPClient:
 
         if not self.smtp_user or not self.smtp_password:
             raise ValueError("SMTP_USER and SMTP_PASSWORD environment variables required")
+
+        self._pool = SMTPPool(self._connect)
+        atexit.register(self._pool.close)
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection"""
+        # Use SSL on port 465 (required for Railway) or STARTTLS on port 587
+        if self.smtp_port == 465:
+            print(f"[SMTP] Connecting via SSL to {self.smtp_host}:{self.smtp_port}...")
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT_SECONDS)
+        else:
+            print(f"[SMTP] Connecting via STARTTLS to {self.smtp_host}:{self.smtp_port}...")
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT_SECONDS)
+            server.starttls()
+        try:
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
     
     def send_email(
         self,
@@ -97,17 +204,10 @@ class KlausSMTPClient:
             if cc:
                 recipients.append(cc)
 
-            # Use SSL on port 465 (required for Railway) or STARTTLS on port 587
-            if self.smtp_port == 465:
-                print(f"[SMTP] Connecting via SSL to {self.smtp_host}:{self.smtp_port}...")
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                print(f"[SMTP] Connecting via STARTTLS to {self.smtp_host}:{self.smtp_port}...")
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
+            with self._pool.acquire() as server:
+                if SMTP_PIPELINING and server.has_extn('pipelining'):
+                    self._send_pipelined(server, msg)
+                else:
                     server.send_message(msg)
             
             print(f"[SMTP] [OK] Email sent successfully to {to_email}")
@@ -140,13 +240,39 @@ class KlausSMTPClient:
                 "error": str(e)
             }
     
+    def _send_pipelined(self, server: smtplib.SMTP, msg: MIMEMultipart):
+        """Send MAIL FROM, every RCPT TO and DATA in one round trip, then read all replies"""
+        recipients = [addr for _, addr in getaddresses(msg.get_all('To', []) + msg.get_all('Cc', [])) if addr]
+        commands = [f"MAIL FROM:<{self.from_email}>"] + [f"RCPT TO:<{addr}>" for addr in recipients] + ["DATA"]
+        server.send("".join(f"{command}\r\n" for command in commands))
+        replies = [server.getreply() for _ in commands]
+
+        mail_reply, rcpt_replies, data_reply = replies[0], replies[1:-1], replies[-1]
+        if data_reply[0] != 354:
+            server.rset()
+            if mail_reply[0] != 250:
+                raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], self.from_email)
+            refused = {addr: reply for addr, reply in zip(recipients, rcpt_replies) if reply[0] not in (250, 251)}
+            if len(refused) == len(recipients):
+                raise smtplib.SMTPRecipientsRefused(refused)
+            raise smtplib.SMTPDataError(data_reply[0], data_reply[1])
+
+        data = msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+        data = _LEADING_DOT_RE.sub(b'..', data)
+        if not data.endswith(b'\r\n'):
+            data += b'\r\n'
+        server.send(data + b'.\r\n')
+        code, response = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, response)
+
     def _save_to_sent(self, msg: MIMEMultipart) -> bool:
         """Save email to Sent folder via IMAP"""
         try:
             print(f"[IMAP] Connecting to {self.imap_host}:{self.imap_port}...")
 
             # Connect to IMAP
-            imap = imaplib.IMAP4_SSL(self.imap_host, self.imap_port)
+            imap = imaplib.IMAP4_SSL(self.imap_host, self.imap_port, timeout=IMAP_TIMEOUT_SECONDS)
             imap.login(self.smtp_user, self.smtp_password)
             print("[IMAP] Login successful")
 
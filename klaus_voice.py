@@ -16,6 +16,9 @@ import pytz
 # Import database module for Railway-compatible storage
 import database as db
 
+# Seconds to wait on a Vapi API request before giving up
+VAPI_TIMEOUT_SECONDS = 30
+
 
 class CallOutcome(Enum):
     """Possible call outcomes"""
@@ -88,6 +91,9 @@ class KlausVoiceAgent:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Keep-alive connections to Vapi, reused across calls instead of a TLS handshake per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
         
         # Klaus voice configuration - ElevenLabs professional male voice
         self.voice_config = {
@@ -555,9 +561,9 @@ REMEMBER:
             # Check if we need to update existing or create new
             if self.assistant_id:
                 # Update existing assistant
-                response = requests.patch(
+                response = self.session.patch(
                     f"{self.base_url}/assistant/{self.assistant_id}",
-                    headers=self.headers,
+                    timeout=VAPI_TIMEOUT_SECONDS,
                     json=assistant_config
                 )
                 
@@ -568,9 +574,9 @@ REMEMBER:
                     # Fall through to create new
             
             # Create new assistant
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/assistant",
-                headers=self.headers,
+                timeout=VAPI_TIMEOUT_SECONDS,
                 json=assistant_config
             )
             
@@ -588,9 +594,9 @@ REMEMBER:
     def get_phone_numbers(self) -> List[Dict]:
         """Get all phone numbers associated with this Vapi account"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/phone-number",
-                headers=self.headers
+                timeout=VAPI_TIMEOUT_SECONDS
             )
             
             if response.status_code == 200:
@@ -614,9 +620,9 @@ REMEMBER:
             Phone number details
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/phone-number",
-                headers=self.headers,
+                timeout=VAPI_TIMEOUT_SECONDS,
                 json={
                     "provider": "twilio",
                     "areaCode": area_code,
@@ -654,9 +660,9 @@ REMEMBER:
             }
         
         try:
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.base_url}/phone-number/{self.phone_number_id}",
-                headers=self.headers,
+                timeout=VAPI_TIMEOUT_SECONDS,
                 json={
                     "assistantId": assistant_id
                 }
@@ -785,9 +791,9 @@ REMEMBER:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/call/phone",
-                headers=self.headers,
+                timeout=VAPI_TIMEOUT_SECONDS,
                 json=call_config
             )
             
@@ -847,9 +853,9 @@ REMEMBER:
         """Get details of a specific call"""
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/call/{call_id}",
-                headers=self.headers
+                timeout=VAPI_TIMEOUT_SECONDS
             )
             
             if response.status_code == 200:
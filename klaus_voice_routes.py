@@ -4,12 +4,14 @@ FastAPI endpoints for voice calling functionality
 """
 
 from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 import os
 
+from klaus_engine import parse_hubspot_date
+
 # These will be injected from main.py
 klaus_voice = None
 call_scheduler = None
@@ -189,11 +191,11 @@ async def call_from_invoice(invoice_id: str):
         raise HTTPException(status_code=503, detail="Required services not configured")
     
     try:
-        # Get invoice details from HubSpot
-        invoices = await hubspot_client.get_invoices()
-        invoice = next((inv for inv in invoices if inv['id'] == invoice_id), None)
+        # Get invoice details from HubSpot (one lookup rather than listing every unpaid invoice)
+        invoice = await hubspot_client.get_invoice_by_id(invoice_id)
         
-        if not invoice:
+        # Only unpaid invoices can be called about
+        if not invoice or invoice['balance_due'] <= 0 or invoice['payment_date']:
             raise HTTPException(status_code=404, detail=f"Invoice {invoice_id} not found")
         
         # Get contact info
@@ -208,9 +210,9 @@ async def call_from_invoice(invoice_id: str):
         # Calculate days overdue
         due_date = invoice.get('due_date')
         days_overdue = 0
-        if due_date:
-            due_dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-            days_overdue = max(0, (datetime.now() - due_dt.replace(tzinfo=None)).days)
+        due_dt = parse_hubspot_date(due_date) if due_date else None
+        if due_dt:
+            days_overdue = max(0, (datetime.now() - due_dt).days)
         
         # Check VIP status
         is_vip = False
@@ -485,7 +487,7 @@ async def vapi_webhook(request: Request, background_tasks: BackgroundTasks):
         data = await request.json()
         
         if not klaus_voice:
-            return JSONResponse(
+            return ORJSONResponse(
                 content={"status": "service_unavailable"},
                 status_code=503
             )
@@ -500,10 +502,10 @@ async def vapi_webhook(request: Request, background_tasks: BackgroundTasks):
             # Log for now - could trigger automated follow-up
             print(f"Call {call_id} requires follow-up: {followup_action}")
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             content={"status": "error", "error": str(e)},
             status_code=500
         )
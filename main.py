@@ -8,52 +8,139 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, TYPE_CHECKING
+from dataclasses import dataclass
 import os
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from bisect import bisect_left
 from datetime import datetime, timedelta
 import uvicorn
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.triggers.date import DateTrigger
+import httpx
 import json
+import orjson
 import random
+import re
+import uuid
+from contextlib import asynccontextmanager
+from email.utils import parseaddr
+
+# Request-path logging goes through the "klaus" logger; set LOG_LEVEL=DEBUG locally for detail.
+# Records are queued and formatted/written to stderr by a listener thread, so the event
+# loop never blocks on a slow stdout/stderr pipe.
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+# Stopped at interpreter exit rather than app shutdown, so records logged during and
+# after shutdown are still written before the process ends
+atexit.register(_log_listener.stop)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# The listener's handler does the real formatting; this one only merges args into the message
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+_log_level_name = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+_log_level = int(_log_level_name) if _log_level_name.isdigit() else logging.getLevelName(_log_level_name)
+logging.basicConfig(
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
+    handlers=[_log_queue_handler]
+)
+# httpx/httpcore log every request at INFO/DEBUG; only their problems are worth seeing
+for _noisy_logger in ("httpx", "httpcore", "hpack"):
+    logging.getLogger(_noisy_logger).setLevel(logging.WARNING)
+log = logging.getLogger("klaus")
+if not isinstance(_log_level, int):
+    log.warning("Unknown LOG_LEVEL %r, logging at INFO", _log_level_name)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment configuration read once at import (after .env is loaded)"""
+    hubspot_api_key: Optional[str] = os.getenv("HUBSPOT_API_KEY")
+    anthropic_api_key: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
+    plaid_client_id: Optional[str] = os.getenv("PLAID_CLIENT_ID")
+    plaid_secret: Optional[str] = os.getenv("PLAID_SECRET")
+    plaid_env: str = os.getenv("PLAID_ENV", "sandbox")
+    database_url: Optional[str] = os.getenv("DATABASE_URL")
+    smtp_host: Optional[str] = os.getenv("SMTP_HOST")
+    smtp_port: Optional[str] = os.getenv("SMTP_PORT")
+    smtp_user: Optional[str] = os.getenv("SMTP_USER")
+    smtp_password: Optional[str] = os.getenv("SMTP_PASSWORD")
+    klaus_from_email: Optional[str] = os.getenv("KLAUS_FROM_EMAIL")
+    gmail_refresh_token: Optional[str] = os.getenv("GMAIL_REFRESH_TOKEN")
+    gmail_client_id: Optional[str] = os.getenv("GMAIL_CLIENT_ID")
+    gmail_client_secret: Optional[str] = os.getenv("GMAIL_CLIENT_SECRET")
+    twilio_account_sid: Optional[str] = os.getenv("TWILIO_ACCOUNT_SID")
+    twilio_auth_token: Optional[str] = os.getenv("TWILIO_AUTH_TOKEN")
+    twilio_whatsapp_from: str = os.getenv("TWILIO_WHATSAPP_FROM", "")
+    twilio_whatsapp_to: str = os.getenv("TWILIO_WHATSAPP_TO", "")
+    vapi_api_key: Optional[str] = os.getenv("VAPI_API_KEY")
+    vapi_phone_number_id: Optional[str] = os.getenv("VAPI_PHONE_NUMBER_ID")
+    vapi_assistant_id: Optional[str] = os.getenv("VAPI_ASSISTANT_ID")
+    voice_timezone: str = os.getenv("VOICE_TIMEZONE", "US/Eastern")
+    voice_daily_call_limit: int = int(os.getenv("VOICE_DAILY_CALL_LIMIT", "10"))
+    db_pool_warm: int = int(os.getenv("DB_POOL_WARM", "5"))
+    # Comma-separated origins allowed to call the API cross-origin (none by default)
+    cors_origins: tuple = tuple(o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip())
+
+
+settings = Settings()
 
 # Import database module for Railway-compatible storage
 import database as db
 
-# Existing imports
-from matching_engine import ReconciliationEngine
-from integrations.plaid_client import PlaidClient
-from integrations.hubspot_client import HubSpotClient
-from notification_service import NotificationService
-
 # Klaus imports
-from klaus_engine import KlausEngine
-from klaus_gmail import KlausGmailClient, KlausEmailResponder
-from klaus_google_drive import KlausGoogleDrive, KlausKnowledgeBase
-from klaus_voice import KlausVoiceAgent, CallScheduler, VoiceCallQueue
-from klaus_voice_routes import router as voice_router, init_voice_routes
+from klaus_engine import KlausEngine, parse_hubspot_date
 from klaus_startup import setup_klaus_credentials
 from klaus_smtp import KlausSMTPClient
 
+# Plaid, HubSpot, Anthropic, Twilio, Google API, Vapi and APScheduler modules are imported
+# at startup (init_clients / startup_event) so importing the app module stays fast
+if TYPE_CHECKING:
+    from matching_engine import ReconciliationEngine
+    from integrations.plaid_client import PlaidClient
+    from integrations.hubspot_client import HubSpotClient
+    from notification_service import NotificationService
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from klaus_gmail import KlausGmailClient, KlausEmailResponder
+    from klaus_google_drive import KlausGoogleDrive, KlausKnowledgeBase
+    from klaus_voice import KlausVoiceAgent, CallScheduler, VoiceCallQueue
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run startup tasks before the server accepts requests, shutdown tasks after"""
+    await startup_event()
+    yield
+    await shutdown_event()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Reconciliation Agent + Klaus Collections API",
     description="AI-powered accounting reconciliation + autonomous collections system",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 templates = Jinja2Templates(directory="templates")
 
+# The dashboards are same-origin; only origins listed in CORS_ORIGINS may call cross-origin
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(settings.cors_origins),
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
 
@@ -61,106 +148,165 @@ app.add_middleware(
 # INITIALIZE CLIENTS
 # ============================================================================
 
-# Reconciliation clients
-plaid_client = PlaidClient(
-    client_id=os.getenv("PLAID_CLIENT_ID"),
-    secret=os.getenv("PLAID_SECRET"),
-    environment=os.getenv("PLAID_ENV", "sandbox")
-)
+# Clients are created in startup_event (after the database and credential files
+# are ready) rather than at import, so the app module loads quickly
+plaid_client: Optional["PlaidClient"] = None
+hubspot_client: Optional["HubSpotClient"] = None
+matching_engine: Optional["ReconciliationEngine"] = None
+notification_service: Optional["NotificationService"] = None
+klaus_engine: Optional[KlausEngine] = None
+klaus_gmail: Optional["KlausGmailClient"] = None
+klaus_email_responder: Optional["KlausEmailResponder"] = None
+klaus_smtp: Optional[KlausSMTPClient] = None
+klaus_drive: Optional["KlausGoogleDrive"] = None
+klaus_knowledge: Optional["KlausKnowledgeBase"] = None
+klaus_voice: Optional["KlausVoiceAgent"] = None
+call_scheduler: Optional["CallScheduler"] = None
+call_queue: Optional["VoiceCallQueue"] = None
+
+def init_core_clients():
+    """Create the reconciliation clients and the Klaus engine (blocking)"""
+    global plaid_client, hubspot_client, matching_engine, klaus_engine
+
+    from matching_engine import ReconciliationEngine
+    from integrations.plaid_client import PlaidClient
+    from integrations.hubspot_client import HubSpotClient
+
+    # Reconciliation clients
+    plaid_client = PlaidClient(
+        client_id=settings.plaid_client_id,
+        secret=settings.plaid_secret,
+        environment=settings.plaid_env
+    )
 
-hubspot_client = HubSpotClient(
-        api_key=os.getenv("HUBSPOT_API_KEY"),
+    hubspot_client = HubSpotClient(
+        api_key=settings.hubspot_api_key,
         portal_id="44968885"
-)
+    )
 
-matching_engine = ReconciliationEngine(
-    anthropic_api_key=os.getenv("ANTHROPIC_API_KEY")
-)
+    matching_engine = ReconciliationEngine(
+        anthropic_api_key=settings.anthropic_api_key
+    )
 
-# notification_service initialized after klaus_gmail below
+    # Klaus clients
+    klaus_engine = KlausEngine(config_path="klaus_config.json")
 
-# Klaus clients
-klaus_engine = KlausEngine(config_path="klaus_config.json")
+def init_gmail():
+    """Initialize Klaus Gmail (supports env vars or file-based credentials; blocking)"""
+    global klaus_gmail, klaus_email_responder
 
-# Initialize Klaus Gmail (supports env vars or file-based credentials)
-try:
-    # Check if we have env var credentials (Railway) or file credentials (local)
-    has_env_creds = all([
-        os.getenv('GMAIL_REFRESH_TOKEN'),
-        os.getenv('GMAIL_CLIENT_ID'),
-        os.getenv('GMAIL_CLIENT_SECRET')
-    ])
-    has_file_creds = os.path.exists("klaus_credentials.json")
+    from klaus_gmail import KlausGmailClient, KlausEmailResponder
 
-    if has_env_creds or has_file_creds:
-        klaus_gmail = KlausGmailClient(credentials_file="klaus_credentials.json")
-        klaus_email_responder = KlausEmailResponder(
-            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
-        print("[OK] Klaus Gmail initialized")
-    else:
-        raise Exception("No Gmail credentials found (neither env vars nor file)")
-except Exception as e:
-    klaus_gmail = None
-    klaus_email_responder = None
-    print(f"[WARN] Klaus Gmail not available: {e}")
-
-# Initialize notification service with Gmail client (if available)
-notification_service = NotificationService(gmail_client=klaus_gmail)
-
-# Initialize Klaus SMTP (fallback for when Gmail API isn't available)
-klaus_smtp = None
-try:
-    klaus_smtp = KlausSMTPClient()
-    print("[OK] Klaus SMTP initialized")
-except Exception as e:
-    print(f"[WARN] Klaus SMTP not available: {e}")
-
-# Initialize Klaus Google Drive (only if credentials are available)
-try:
-    klaus_drive = KlausGoogleDrive(credentials_file="klaus_credentials.json")
-    klaus_knowledge = KlausKnowledgeBase(
-        drive_client=klaus_drive,
-        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY")
-    )
-    print("[OK] Klaus Drive initialized")
-except Exception as e:
-    klaus_drive = None
-    klaus_knowledge = None
-    print(f"[WARN] Klaus Drive not available: {e}")
-
-# Initialize Klaus Voice (only if Vapi key is available)
-call_queue = None
-try:
-    if os.getenv("VAPI_API_KEY"):
-        klaus_voice = KlausVoiceAgent(
-            vapi_api_key=os.getenv("VAPI_API_KEY"),
-            phone_number_id=os.getenv("VAPI_PHONE_NUMBER_ID"),
-            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
-        call_scheduler = CallScheduler(
-            default_timezone=os.getenv("VOICE_TIMEZONE", "US/Eastern")
-        )
-        call_queue = VoiceCallQueue(
-            voice_agent=klaus_voice,
-            scheduler=call_scheduler,
-            daily_limit=int(os.getenv("VOICE_DAILY_CALL_LIMIT", "10"))
+    try:
+        # Check if we have env var credentials (Railway) or file credentials (local)
+        has_env_creds = all([
+            settings.gmail_refresh_token,
+            settings.gmail_client_id,
+            settings.gmail_client_secret
+        ])
+        has_file_creds = os.path.exists("klaus_credentials.json")
+
+        if has_env_creds or has_file_creds:
+            klaus_gmail = KlausGmailClient(credentials_file="klaus_credentials.json")
+            klaus_email_responder = KlausEmailResponder(
+                anthropic_api_key=settings.anthropic_api_key
+            )
+            log.info("Klaus Gmail initialized")
+        else:
+            raise Exception("No Gmail credentials found (neither env vars nor file)")
+    except Exception as e:
+        klaus_gmail = None
+        klaus_email_responder = None
+        log.warning("Klaus Gmail not available: %s", e)
+
+def init_smtp():
+    """Initialize Klaus SMTP (fallback for when Gmail API isn't available; blocking)"""
+    global klaus_smtp
+
+    klaus_smtp = None
+    try:
+        klaus_smtp = KlausSMTPClient()
+        log.info("Klaus SMTP initialized")
+    except Exception as e:
+        log.warning("Klaus SMTP not available: %s", e)
+
+def init_drive():
+    """Initialize Klaus Google Drive (only if credentials are available; blocking)"""
+    global klaus_drive, klaus_knowledge
+
+    from klaus_google_drive import KlausGoogleDrive, KlausKnowledgeBase
+
+    try:
+        klaus_drive = KlausGoogleDrive(credentials_file="klaus_credentials.json")
+        klaus_knowledge = KlausKnowledgeBase(
+            drive_client=klaus_drive,
+            anthropic_api_key=settings.anthropic_api_key
         )
-        print("[OK] Klaus Voice initialized")
-    else:
+        log.info("Klaus Drive initialized")
+    except Exception as e:
+        klaus_drive = None
+        klaus_knowledge = None
+        log.warning("Klaus Drive not available: %s", e)
+
+def init_voice():
+    """Initialize Klaus Voice (only if Vapi key is available; blocking)"""
+    global klaus_voice, call_scheduler, call_queue
+
+    from klaus_voice import KlausVoiceAgent, CallScheduler, VoiceCallQueue
+
+    call_queue = None
+    try:
+        if settings.vapi_api_key:
+            klaus_voice = KlausVoiceAgent(
+                vapi_api_key=settings.vapi_api_key,
+                phone_number_id=settings.vapi_phone_number_id,
+                anthropic_api_key=settings.anthropic_api_key
+            )
+            call_scheduler = CallScheduler(
+                default_timezone=settings.voice_timezone
+            )
+            call_queue = VoiceCallQueue(
+                voice_agent=klaus_voice,
+                scheduler=call_scheduler,
+                daily_limit=settings.voice_daily_call_limit
+            )
+            log.info("Klaus Voice initialized")
+        else:
+            klaus_voice = None
+            call_scheduler = None
+            call_queue = None
+            log.warning("Klaus Voice not available: VAPI_API_KEY not set")
+    except Exception as e:
         klaus_voice = None
         call_scheduler = None
         call_queue = None
-        print("[WARN] Klaus Voice not available: VAPI_API_KEY not set")
-except Exception as e:
-    klaus_voice = None
-    call_scheduler = None
-    call_queue = None
-    print(f"[WARN] Klaus Voice not available: {e}")
+        log.warning("Klaus Voice not available: %s", e)
+
+async def init_clients():
+    """
+    Create the reconciliation and Klaus clients (run once at startup)
+
+    Each client authenticates against a different service, so they're created
+    side by side in worker threads; startup waits for the slowest, not the sum.
+    The optional services log and disable themselves on failure.
+    """
+    global notification_service
+
+    from notification_service import NotificationService
+
+    await asyncio.gather(*[
+        asyncio.to_thread(init)
+        for init in (init_core_clients, init_gmail, init_smtp, init_drive, init_voice)
+    ])
+
+    # Initialize notification service with Gmail client (if available)
+    notification_service = NotificationService(gmail_client=klaus_gmail)
+
+# Scheduler - runs jobs on the app's event loop; created in startup_event once the loop is running
+scheduler: Optional["AsyncIOScheduler"] = None
 
-# Scheduler
-scheduler = BackgroundScheduler()
-scheduler.start()
+# Worker threads for blocking Gmail/SMTP/Drive/Vapi/Anthropic calls made from async handlers
+BLOCKING_IO_WORKERS = 16
 
 # Pending email responses queue - stores emails waiting to be responded to
 # Format: {email_id: {email_data, scheduled_time, invoices}}
@@ -169,17 +315,20 @@ pending_email_responses = {}
 # Track when server started - only respond to emails received AFTER this time
 server_start_time = datetime.now()
 
-# Initialize and register voice routes
-if klaus_voice:
-    init_voice_routes(
-        voice_agent=klaus_voice,
-        scheduler=call_scheduler,
-        queue=call_queue,
-        hubspot=hubspot_client,
-        engine=klaus_engine
-    )
-    app.include_router(voice_router)
-    print("[OK] Klaus Voice routes registered")
+def register_voice_routes():
+    """Initialize and register voice routes (once clients exist)"""
+    if klaus_voice:
+        from klaus_voice_routes import router as voice_router, init_voice_routes
+
+        init_voice_routes(
+            voice_agent=klaus_voice,
+            scheduler=call_scheduler,
+            queue=call_queue,
+            hubspot=hubspot_client,
+            engine=klaus_engine
+        )
+        app.include_router(voice_router)
+        log.info("Klaus Voice routes registered")
 
 # ============================================================================
 # PYDANTIC MODELS
@@ -187,8 +336,9 @@ if klaus_voice:
 
 # Existing models
 class MatchRequest(BaseModel):
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    # ISO dates/datetimes ("2024-01-31" works); parsed and validated before the handler runs
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
     auto_approve_threshold: float = 60.0
 
 class ApprovalRequest(BaseModel):
@@ -265,13 +415,305 @@ class KlausConfigUpdate(BaseModel):
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Stripe payouts are reconciled in Stripe, not against HubSpot invoices
+_STRIPE_SEARCH = re.compile(r'stripe', re.I).search
+
+def exclude_stripe_transactions(transactions: list) -> list:
+    """Drop transactions whose description mentions Stripe (case-insensitive, no lowercased copies)"""
+    return [t for t in transactions if not _STRIPE_SEARCH(t.get('description') or '')]
+
+# Schedule config is re-read for a short while from memory instead of the database
+SCHEDULE_CONFIG_TTL_SECONDS = 30
+_schedule_config_cache = {"config": None, "expires": 0.0}
+
 def load_schedule_config():
     """Load schedule config from database (Railway) or JSON file (local dev)"""
-    return db.load_schedule_config()
+    if _schedule_config_cache["config"] is None or time.monotonic() >= _schedule_config_cache["expires"]:
+        _schedule_config_cache["config"] = db.load_schedule_config()
+        _schedule_config_cache["expires"] = time.monotonic() + SCHEDULE_CONFIG_TTL_SECONDS
+    return dict(_schedule_config_cache["config"])
 
 def save_schedule_config(config):
     """Save schedule config to database (Railway) or JSON file (local dev)"""
     db.save_schedule_config(config)
+    _schedule_config_cache["config"] = dict(config)
+    _schedule_config_cache["expires"] = time.monotonic() + SCHEDULE_CONFIG_TTL_SECONDS
+    build_schedule_trigger.cache_clear()
+
+@lru_cache(maxsize=8)
+def build_schedule_trigger(frequency: str, time_str: str) -> "CronTrigger":
+    """Build the cron trigger for a schedule frequency ('daily'/'weekly'/'monthly') and HH:MM time"""
+    from apscheduler.triggers.cron import CronTrigger
+
+    hour, minute = map(int, time_str.split(':'))
+
+    if frequency == 'daily':
+        return CronTrigger(hour=hour, minute=minute)
+    elif frequency == 'weekly':
+        return CronTrigger(day_of_week='mon', hour=hour, minute=minute)
+    elif frequency == 'monthly':
+        return CronTrigger(day=1, hour=hour, minute=minute)
+    raise ValueError(f"Unknown schedule frequency: {frequency}")
+
+# The full invoice history is shared by /reconcile, /validate-companies and
+# /suggest-associations, so calling them back to back reuses one HubSpot fetch
+INVOICE_HISTORY_TTL_SECONDS = 300
+# "split" holds load_invoice_history()'s parsed result for the current "data"
+_invoice_history_cache = {"data": None, "fetched": float("-inf"), "split": None}
+_invoice_history_lock = asyncio.Lock()
+
+async def fetch_invoice_history():
+    """Fetch every HubSpot invoice plus its company association (invoice ID -> company ID)"""
+    def fresh():
+        return (_invoice_history_cache["data"] is not None
+                and time.monotonic() - _invoice_history_cache["fetched"] < INVOICE_HISTORY_TTL_SECONDS)
+
+    if fresh():
+        return _invoice_history_cache["data"]
+
+    async with _invoice_history_lock:
+        # Another caller may have refreshed the cache while we waited
+        if fresh():
+            return _invoice_history_cache["data"]
+
+        all_invoices = await hubspot_client.get_all_invoice_objects()
+        invoice_company_ids = await hubspot_client.get_invoice_company_ids([invoice.id for invoice in all_invoices])
+        _invoice_history_cache["data"] = (all_invoices, invoice_company_ids)
+        _invoice_history_cache["fetched"] = time.monotonic()
+        return all_invoices, invoice_company_ids
+
+def invalidate_invoice_history_cache():
+    """Force the next fetch_invoice_history() call to refetch from HubSpot"""
+    _invoice_history_cache["fetched"] = float("-inf")
+
+def invoice_history_entry(invoice, company_name: Optional[str]) -> dict:
+    """Flatten a HubSpot invoice object into the dict used for payment history/suggestions"""
+    props = invoice.properties
+    return {
+        'id': invoice.id,
+        'number': props.get("hs_invoice_number") or props.get("hs_number") or "",
+        'company_name': company_name,
+        'amount': float(props.get("hs_amount_billed") or 0),
+        'payment_date': props.get("hs_payment_date"),
+        'created_date': props.get("hs_createdate")
+    }
+
+async def load_invoice_history():
+    """
+    Paid and open invoices from the invoice history, plus the name of every invoiced company
+
+    Shared by the reconciliation, validation and suggestion endpoints. Paid
+    invoices without an associated company have company_name None; open
+    invoices (balance due, no payment date) fall back to the invoice title
+    and also carry balance_due/status for matching_engine.
+
+    The parsed result is kept alongside the cached history, so endpoints called
+    back to back don't rebuild the entries (and re-parse every amount).
+    Callers must treat the returned lists as read-only.
+    """
+    all_invoices, invoice_company_ids = await fetch_invoice_history()
+    split = _invoice_history_cache["split"]
+    if split is not None and split[0] is all_invoices:
+        return split[1]
+
+    company_names = await hubspot_client.get_company_names(invoice_company_ids.values())
+
+    paid_invoices = []
+    open_invoices = []
+    all_companies = set()
+    for invoice in all_invoices:
+        props = invoice.properties
+        company_name = company_names.get(invoice_company_ids.get(invoice.id))
+        if company_name:
+            all_companies.add(company_name)
+        if props.get("hs_payment_date"):
+            paid_invoices.append(invoice_history_entry(invoice, company_name))
+        elif float(props.get("hs_balance_due") or 0) > 0:
+            entry = invoice_history_entry(invoice, company_name or props.get("hs_title", ""))
+            entry['balance_due'] = float(props["hs_balance_due"])
+            entry['status'] = (props.get("hs_payment_status") or "").lower().strip()
+            open_invoices.append(entry)
+
+    result = (paid_invoices, open_invoices, all_companies)
+    _invoice_history_cache["split"] = (all_invoices, result)
+    return result
+
+async def gmail_call(method, *args, **kwargs):
+    """Run a blocking klaus_gmail method in a worker thread (each thread has its own Gmail connection)"""
+    return await asyncio.to_thread(method, *args, **kwargs)
+
+# Unpaid invoices are cached briefly so dashboard bursts share a single HubSpot fetch
+INVOICE_CACHE_TTL_SECONDS = 60
+# Scheduled jobs accept an older snapshot, so jobs in the same run share one fetch
+SCHEDULED_INVOICE_MAX_AGE_SECONDS = 300
+_invoice_cache = {"data": None, "summary": None, "fetched": float("-inf"), "epoch": 0}
+_invoice_cache_lock = asyncio.Lock()
+
+# Klaus analysis of the cached invoices, recomputed only when the cache epoch changes
+_analysis_cache = {"epoch": None, "analysis": None}
+
+def _summarize_invoices(invoices: list) -> dict:
+    """Split out unpaid invoices and total their balances in a single pass"""
+    unpaid = []
+    total_balance_due = 0.0
+    for inv in invoices:
+        balance_due = float(inv.get('balance_due', 0) or 0)
+        if balance_due > 0:
+            unpaid.append(inv)
+            total_balance_due += balance_due
+    return {
+        'unpaid': unpaid,
+        'unpaid_count': len(unpaid),
+        'total_balance_due': total_balance_due
+    }
+
+async def get_invoices_cached(max_age: float = INVOICE_CACHE_TTL_SECONDS):
+    """
+    Get unpaid invoices, reusing a fetch made within the last max_age seconds
+
+    Concurrent callers wait on the same fetch instead of each hitting HubSpot.
+    """
+    def fresh():
+        return _invoice_cache["data"] is not None and time.monotonic() - _invoice_cache["fetched"] < max_age
+
+    if fresh():
+        return _invoice_cache["data"]
+
+    async with _invoice_cache_lock:
+        # Another caller may have refreshed the cache while we waited
+        if fresh():
+            return _invoice_cache["data"]
+
+        invoices = await hubspot_client.get_invoices()
+        _invoice_cache["data"] = invoices
+        _invoice_cache["summary"] = _summarize_invoices(invoices)
+        _invoice_cache["fetched"] = time.monotonic()
+        _invoice_cache["epoch"] += 1
+        return invoices
+
+async def get_invoice_summary_cached(max_age: float = INVOICE_CACHE_TTL_SECONDS):
+    """Unpaid invoices and balance totals, computed once per cached fetch"""
+    await get_invoices_cached(max_age)
+    return _invoice_cache["summary"]
+
+async def get_overdue_analysis_cached(max_age: float = INVOICE_CACHE_TTL_SECONDS):
+    """
+    Klaus analysis of the unpaid invoices, shared by the dashboard endpoints and scheduled jobs
+
+    Reruns only after the invoice cache refreshes; sending or approving
+    invalidates the cache, so changes to contact history show up right away.
+    The analysis is shared, so callers must treat it as read-only.
+    """
+    invoice_summary = await get_invoice_summary_cached(max_age)
+    epoch = _invoice_cache["epoch"]
+    if _analysis_cache["epoch"] != epoch:
+        analysis = await asyncio.to_thread(klaus_engine.analyze_overdue_invoices, invoice_summary['unpaid'])
+        _analysis_cache["analysis"] = analysis
+        _analysis_cache["epoch"] = epoch
+    return _analysis_cache["analysis"]
+
+def invalidate_invoice_cache():
+    """Force the next get_invoices_cached() call to refetch from HubSpot"""
+    _invoice_cache["fetched"] = float("-inf")
+
+# Incremental syncs re-read a small overlap so edits made mid-sync aren't missed,
+# and a full sync runs periodically to drop invoices deleted in HubSpot
+INVOICE_HISTORY_SYNC_OVERLAP = timedelta(minutes=5)
+INVOICE_HISTORY_FULL_SYNC_INTERVAL = timedelta(hours=24)
+
+# Overlapping reports wait for one sync (and one cache file write) instead of each running their own
+_company_invoice_history_lock = asyncio.Lock()
+
+async def get_company_invoice_history():
+    """
+    Get invoice history entries for every invoice that has a company
+
+    Entries are cached locally and only invoices modified since the last sync
+    are fetched from HubSpot, so repeated reports don't re-download everything.
+    A missing or malformed cache file means a full sync.
+    """
+    async with _company_invoice_history_lock:
+        cache = await asyncio.to_thread(db.load_invoice_history_cache)
+        now = datetime.now()
+
+        entries = {}
+        modified_since = None
+        full_synced_at = now
+        try:
+            last_full_sync = datetime.fromisoformat(cache['full_synced_at'])
+            last_sync = datetime.fromisoformat(cache['synced_at'])
+            cached_entries = dict(cache['invoices'])
+        except (TypeError, KeyError, ValueError) as e:
+            if cache is not None:
+                log.warning("Ignoring malformed invoice history cache (%r), doing a full sync", e)
+        else:
+            if now - last_full_sync < INVOICE_HISTORY_FULL_SYNC_INTERVAL:
+                entries = cached_entries
+                modified_since = last_sync - INVOICE_HISTORY_SYNC_OVERLAP
+                full_synced_at = last_full_sync
+
+        all_invoices = await hubspot_client.get_all_invoice_objects(modified_since=modified_since)
+        invoice_company_ids = await hubspot_client.get_invoice_company_ids([invoice.id for invoice in all_invoices])
+        company_names = await hubspot_client.get_company_names(invoice_company_ids.values())
+
+        for invoice in all_invoices:
+            company_name = company_names.get(invoice_company_ids.get(invoice.id))
+
+            if company_name:
+                entries[invoice.id] = invoice_history_entry(invoice, company_name)
+            else:
+                entries.pop(invoice.id, None)
+
+        await asyncio.to_thread(db.save_invoice_history_cache, {
+            'synced_at': now.isoformat(),
+            'full_synced_at': full_synced_at.isoformat(),
+            'invoices': entries
+        })
+        log.info("Invoice history: %d fetched (%s sync), %d cached",
+                 len(all_invoices), 'incremental' if modified_since else 'full', len(entries))
+        return list(entries.values())
+
+# Long-running endpoints can run as background jobs (?background=true) and be
+# polled at /klaus/jobs/{job_id}; finished jobs are kept for an hour
+JOB_RETENTION_SECONDS = 3600
+_jobs: Dict[str, Dict] = {}
+
+def start_background_job(coro) -> ORJSONResponse:
+    """Run a coroutine as a background job and return 202 Accepted with its job id"""
+    now = time.time()
+    for job_id in [job_id for job_id, job in _jobs.items()
+                   if job['finished_at'] and now - job['finished_at'] > JOB_RETENTION_SECONDS]:
+        del _jobs[job_id]
+
+    job_id = uuid.uuid4().hex
+    job = {
+        'job_id': job_id,
+        'status': 'running',
+        'result': None,
+        'error': None,
+        'created_at': now,
+        'finished_at': None
+    }
+    _jobs[job_id] = job
+
+    async def run():
+        try:
+            job['result'] = await coro
+            job['status'] = 'completed'
+        except HTTPException as e:
+            job['status'] = 'failed'
+            job['error'] = e.detail
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        finally:
+            job['finished_at'] = time.time()
+
+    job['task'] = asyncio.create_task(run())
+    return ORJSONResponse(status_code=202, content={"job_id": job_id, "status": "accepted"})
+
+# HubSpot reconciliation-status updates issued at once (/approve-bulk, scheduled auto-approval)
+APPROVE_BULK_CONCURRENCY = 10
 
 async def scheduled_reconciliation():
     """Scheduled reconciliation job"""
@@ -279,13 +721,17 @@ async def scheduled_reconciliation():
         end_date = datetime.now()
         start_date = end_date - timedelta(days=90)
         
-        transactions = await plaid_client.get_transactions(
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d")
+        # Plaid transactions, unpaid invoices and the invoice history come from
+        # independent API calls, so fetch them concurrently
+        transactions, invoices, (paid_invoices, _, _) = await asyncio.gather(
+            plaid_client.get_transactions(
+                start_date=start_date.date().isoformat(),
+                end_date=end_date.date().isoformat()
+            ),
+            get_invoices_cached(max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS),
+            load_invoice_history()
         )
         
-        invoices = await hubspot_client.get_invoices()
-        
         matches = matching_engine.match_transactions_to_invoices(
             transactions=transactions,
             invoices=invoices,
@@ -293,63 +739,29 @@ async def scheduled_reconciliation():
         )
         
         # Get suggestions
-        all_invoices = []
-        after = None
-        pages_fetched = 0
-        max_pages = 10
-        
-        while pages_fetched < max_pages:
-            all_invoices_response = hubspot_client.client.crm.objects.basic_api.get_page(
-                object_type="invoices",
-                limit=100,
-                after=after,
-                properties=["hs_invoice_number", "hs_title", "hs_amount_billed", "hs_payment_status", 
-                           "hs_balance_due", "hs_due_date", "hs_createdate", "hs_number", "hs_payment_date"],
-                associations=["companies"]
-            )
-            for invoice in all_invoices_response.results:
-                all_invoices.append(invoice)
-            pages_fetched += 1
-            if hasattr(all_invoices_response, 'paging') and all_invoices_response.paging and hasattr(all_invoices_response.paging, 'next'):
-                after = all_invoices_response.paging.next.after
-            else:
-                break
-        
-        paid_invoices = []
-        for invoice in all_invoices:
-            props = invoice.properties
-            payment_date = props.get("hs_payment_date")
-            if payment_date:
-                company_name = None
-                if hasattr(invoice, 'associations') and invoice.associations:
-                    company_associations = invoice.associations.get('companies', {})
-                    if company_associations and hasattr(company_associations, 'results') and company_associations.results:
-                        company_id = company_associations.results[0].id
-                        try:
-                            company = hubspot_client.client.crm.companies.basic_api.get_by_id(company_id=company_id, properties=["name"])
-                            company_name = company.properties.get("name")
-                        except:
-                            pass
-                paid_invoices.append({
-                    'id': invoice.id,
-                    'number': props.get("hs_invoice_number") or props.get("hs_number") or "",
-                    'company_name': company_name,
-                    'amount': float(props.get("hs_amount_billed", 0)),
-                    'payment_date': payment_date
-                })
-        
         suggestions = matching_engine.suggest_associations_from_history(paid_invoices, transactions)
         
-        # Auto-approve high confidence matches
-        auto_approved = 0
-        for match in matches:
-            if match['confidence'] >= 80:
+        # Auto-approve high confidence matches, with the same bounded concurrency as /approve-bulk
+        semaphore = asyncio.Semaphore(APPROVE_BULK_CONCURRENCY)
+
+        async def auto_approve(match: Dict):
+            async with semaphore:
                 await hubspot_client.update_invoice_reconciliation_status(
                     invoice_id=match['invoice_id'],
                     status='Reconciled',
                     transaction_details=match.get('transaction_description')
                 )
+
+        to_approve = [match for match in matches if match['confidence'] >= 80]
+        results = await asyncio.gather(*[auto_approve(match) for match in to_approve], return_exceptions=True)
+        auto_approved = 0
+        for match, result in zip(to_approve, results):
+            if isinstance(result, Exception):
+                log.error("Auto-approve failed for invoice %s: %s", match['invoice_id'], result)
+            else:
                 auto_approved += 1
+        if auto_approved:
+            invalidate_invoice_history_cache()
         
         # Send notifications
         stats = {
@@ -359,7 +771,8 @@ async def scheduled_reconciliation():
             'auto_approved': auto_approved
         }
         
-        notification_service.send_reconciliation_report(
+        await asyncio.to_thread(
+            notification_service.send_reconciliation_report,
             matches=matches,
             suggestions=suggestions,
             stats=stats,
@@ -367,114 +780,121 @@ async def scheduled_reconciliation():
             via_whatsapp=True
         )
         
-        print(f"Scheduled reconciliation completed: {len(matches)} matches, {auto_approved} auto-approved")
+        log.info("Scheduled reconciliation completed: %s matches, %s auto-approved", len(matches), auto_approved)
     
     except Exception as e:
-        print(f"Scheduled reconciliation failed: {e}")
+        log.error("Scheduled reconciliation failed: %s", e)
+
+# Max autonomous reminder emails sent at once (stays under Gmail's per-user send rate)
+EMAIL_SEND_CONCURRENCY = 5
+
+# "INV-1234" / " 1234 " -> "1234", and a leading "Subject:" line split from the body
+_INVOICE_NUMBER_RE = re.compile(r'\s*(?:INV-\s*)?(.*?)\s*$', re.I | re.S)
+_SUBJECT_LINE_RE = re.compile(r'Subject:([^\n]*)\n?(.*)', re.S)
+
+async def send_autonomous_emails(analysis: Dict) -> int:
+    """Send the autonomous reminder emails from a Klaus analysis concurrently; returns how many were sent"""
+    if not klaus_gmail:
+        return 0
+
+    semaphore = asyncio.Semaphore(EMAIL_SEND_CONCURRENCY)
+
+    sent_logs = []
+
+    async def send(email_action: Dict) -> bool:
+        # Build invoice map for hyperlinking
+        invoice_map = {}
+        for inv in email_action.get('invoices', []):
+            inv_number = _INVOICE_NUMBER_RE.match(str(inv.get('invoice_number', ''))).group(1)
+            hubspot_url = inv.get('hubspot_url', '')
+            if inv_number and hubspot_url:
+                invoice_map[inv_number] = hubspot_url
+
+        # Extract subject from recommended_message
+        message = email_action['recommended_message']
+        subject_match = _SUBJECT_LINE_RE.match(message)
+        if subject_match:
+            subject = subject_match.group(1).strip()
+            body = subject_match.group(2).strip()
+        else:
+            subject = "Payment Reminder"
+            body = message
+
+        # Determine CC
+        cc_email = None
+        if email_action.get('is_vip'):
+            cc_email = 'daniel@leveragelivelocal.com'
+
+        # Send email with hyperlinked invoices
+        async with semaphore:
+            result = await gmail_call(
+                klaus_gmail.send_email,
+                to_email=email_action.get('contact_email'),
+                to_name=email_action.get('contact_name'),
+                subject=subject,
+                body=body,
+                cc=cc_email,
+                invoice_map=invoice_map
+            )
+
+        if result['status'] != 'success':
+            log.error("[KLAUS] Failed to send email to %s: %s", email_action.get('contact_email'), result.get('error'))
+            return False
+
+        # Log communication for each invoice (written in one batch below)
+        for inv in email_action.get('invoices', []):
+            sent_logs.append({
+                'invoice_id': inv.get('invoice_id'),
+                'company_name': inv.get('company_name'),
+                'method': 'email',
+                'message_type': 'reminder',
+                'approved_by': 'autonomous'
+            })
+        return True
+
+    email_actions = analysis['autonomous_emails']
+    outcomes = await asyncio.gather(*[send(email_action) for email_action in email_actions], return_exceptions=True)
+    for email_action, outcome in zip(email_actions, outcomes):
+        if isinstance(outcome, Exception):
+            log.error("[KLAUS] Failed to send email to %s: %s", email_action.get('contact_email'), outcome)
+
+    if sent_logs:
+        klaus_engine.log_communications(sent_logs)
+        invalidate_invoice_cache()
+    return sum(1 for outcome in outcomes if outcome is True)
 
 async def scheduled_klaus_collections():
     """Scheduled Klaus collections job - NOW WITH INVOICE HYPERLINKING"""
     try:
-        # Get unpaid invoices from HubSpot (now includes hubspot_url)
-        invoices = await hubspot_client.get_invoices()
+        # Analyze unpaid invoices from HubSpot (now includes hubspot_url) with Klaus
+        analysis = await get_overdue_analysis_cached(max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS)
 
-        # Analyze with Klaus
-        analysis = klaus_engine.analyze_overdue_invoices(invoices)
-
-        emails_sent = 0
-
-        # Process autonomous actions
-        for email_action in analysis['autonomous_emails']:
-            if klaus_gmail:
-                # Build invoice map for hyperlinking
-                invoice_map = {}
-                for inv in email_action.get('invoices', []):
-                    inv_number = str(inv.get('invoice_number', '')).strip()
-                    if inv_number.upper().startswith('INV-'):
-                        inv_number = inv_number[4:].strip()
-                    hubspot_url = inv.get('hubspot_url', '')
-                    if inv_number and hubspot_url:
-                        invoice_map[inv_number] = hubspot_url
-
-                # Extract subject from recommended_message
-                message = email_action['recommended_message']
-                lines = message.split('\n')
-                if lines and lines[0].startswith('Subject:'):
-                    subject = lines[0].replace('Subject:', '').strip()
-                    body = '\n'.join(lines[1:]).strip()
-                else:
-                    subject = "Payment Reminder"
-                    body = message
-
-                # Determine CC
-                cc_email = None
-                if email_action.get('is_vip'):
-                    cc_email = 'daniel@leveragelivelocal.com'
-
-                # Send email with hyperlinked invoices
-                result = klaus_gmail.send_email(
-                    to_email=email_action.get('contact_email'),
-                    to_name=email_action.get('contact_name'),
-                    subject=subject,
-                    body=body,
-                    cc=cc_email,
-                    invoice_map=invoice_map
-                )
+        emails_sent = await send_autonomous_emails(analysis)
 
-                if result['status'] == 'success':
-                    emails_sent += 1
-                    # Log communication for each invoice
-                    for inv in email_action.get('invoices', []):
-                        klaus_engine.log_communication(
-                            invoice_id=inv.get('invoice_id'),
-                            company_name=inv.get('company_name'),
-                            method='email',
-                            message_type='reminder',
-                            approved_by='autonomous'
-                        )
-                else:
-                    print(f"[KLAUS] Failed to send email to {email_action.get('contact_email')}: {result.get('error')}")
-
-        print(f"[KLAUS] Collections complete: {emails_sent}/{len(analysis['autonomous_emails'])} emails sent, {len(analysis['pending_approvals'])} pending approval")
+        log.info("[KLAUS] Collections complete: %s/%s emails sent, %s pending approval", emails_sent, len(analysis['autonomous_emails']), len(analysis['pending_approvals']))
 
     except Exception as e:
-        import traceback
-        print(f"[KLAUS] Collections failed: {e}")
-        traceback.print_exc()
+        log.exception("[KLAUS] Collections failed: %s", e)
 
 
 async def scheduled_email_processing():
     """Scheduled job to process incoming emails"""
     try:
         if not klaus_gmail or not klaus_email_responder:
-            print("[KLAUS] Email processing skipped - Gmail or responder not configured")
+            log.info("[KLAUS] Email processing skipped - Gmail or responder not configured")
             return
 
-        # Get unread emails
-        emails = klaus_gmail.get_recent_emails(
-            query="in:inbox is:unread",
-            max_results=20
-        )
-
-        if not emails:
-            print("[KLAUS] No unread emails to process")
+        # Shares the single-flight lock with /klaus/emails/process so an overlapping
+        # manual run can't reply to the same emails
+        result = await _process_emails_single_flight(invoice_max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS)
+        if not result["processed"]:
+            log.info("[KLAUS] No unread emails to process")
             return
 
-        # Get invoices for context
-        invoices = await hubspot_client.get_invoices()
-
-        responded = 0
-        for email in emails:
-            result = await process_incoming_email(email, invoices)
-            if result.get('response_sent'):
-                responded += 1
-
-        print(f"[KLAUS] Email processing complete: {responded}/{len(emails)} responded autonomously")
+        log.info("[KLAUS] Email processing complete: %s/%s responded autonomously", result['autonomous_responses_sent'], result['processed'])
 
     except Exception as e:
-        import traceback
-        print(f"[KLAUS] Email processing failed: {e}")
-        traceback.print_exc()
+        log.exception("[KLAUS] Email processing failed: %s", e)
 
 
 async def send_delayed_email_response(email_id: str):
@@ -485,27 +905,28 @@ async def send_delayed_email_response(email_id: str):
     global pending_email_responses
 
     if email_id not in pending_email_responses:
-        print(f"[KLAUS EMAIL] Email {email_id} not found in pending queue (may have been processed already)")
+        log.info("[KLAUS EMAIL] Email %s not found in pending queue (may have been processed already)", email_id)
         return
 
-    pending = pending_email_responses.pop(email_id)
-    email = pending['email']
-    invoices = pending['invoices']
-
-    print(f"[KLAUS EMAIL] Sending delayed response to: {email.get('from', 'unknown')}")
+    log.info("[KLAUS EMAIL] Sending delayed response to: %s", pending_email_responses[email_id]['email'].get('from', 'unknown'))
 
     try:
-        result = await process_incoming_email(email, invoices)
+        # Wait out any email processing run in progress; it skips queued emails,
+        # and the entry stays queued until now so the poll doesn't queue it twice
+        async with _email_process_lock:
+            pending = pending_email_responses.pop(email_id, None)
+            if pending is None:
+                return
+            email = pending['email']
+            result = await process_incoming_email(email, pending['invoices'])
         if result.get('response_sent'):
-            print(f"[KLAUS EMAIL] ✓ Response sent to {email.get('from', 'unknown')} ({result.get('detected_type', 'unknown')})")
+            log.info("[KLAUS EMAIL] ✓ Response sent to %s (%s)", email.get('from', 'unknown'), result.get('detected_type', 'unknown'))
         elif result.get('requires_manual_review'):
-            print(f"[KLAUS EMAIL] ⚠ Email requires manual review: {email.get('subject', 'No subject')}")
+            log.info("[KLAUS EMAIL] ⚠ Email requires manual review: %s", email.get('subject', 'No subject'))
         else:
-            print(f"[KLAUS EMAIL] No response needed for: {email.get('subject', 'No subject')}")
+            log.info("[KLAUS EMAIL] No response needed for: %s", email.get('subject', 'No subject'))
     except Exception as e:
-        import traceback
-        print(f"[KLAUS EMAIL] Failed to send response: {e}")
-        traceback.print_exc()
+        log.exception("[KLAUS EMAIL] Failed to send response: %s", e)
 
 
 def schedule_email_response(email: dict, invoices: list):
@@ -536,26 +957,18 @@ def schedule_email_response(email: dict, invoices: list):
     }
 
     # Schedule the response
-    import asyncio
-
-    def run_async_response():
-        """Wrapper to run async function from scheduler"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(send_delayed_email_response(email_id))
-        finally:
-            loop.close()
+    from apscheduler.triggers.date import DateTrigger
 
     job_id = f"email_response_{email_id}"
     scheduler.add_job(
-        run_async_response,
+        send_delayed_email_response,
         trigger=DateTrigger(run_date=scheduled_time),
+        args=[email_id],
         id=job_id,
         replace_existing=True
     )
 
-    print(f"[KLAUS EMAIL] Queued response to '{email.get('from', 'unknown')}' - will send in {delay_minutes:.1f} minutes")
+    log.info("[KLAUS EMAIL] Queued response to '%s' - will send in %.1f minutes", email.get('from', 'unknown'), delay_minutes)
 
 
 def should_ignore_email(email: dict) -> bool:
@@ -646,69 +1059,69 @@ async def poll_emails_for_response():
         if not klaus_gmail or not klaus_email_responder:
             return
 
-        # Get unread emails
-        emails = klaus_gmail.get_recent_emails(
-            query="in:inbox is:unread",
-            max_results=20
-        )
+        # Held while fetching and queueing, so an email being answered by an
+        # overlapping processing run isn't queued for a second reply
+        async with _email_process_lock:
+            await _queue_unread_emails_for_response()
 
-        if not emails:
-            print("[KLAUS EMAIL POLL] No unread emails")
-            return
+    except Exception as e:
+        log.exception("[KLAUS EMAIL POLL] Error: %s", e)
 
-        # Filter out emails already in the pending queue
-        new_emails = [e for e in emails if e.get('id') not in pending_email_responses]
 
-        if not new_emails:
-            print(f"[KLAUS EMAIL POLL] {len(emails)} unread emails already queued for response")
-            return
+async def _queue_unread_emails_for_response():
+    """Queue delayed responses to unread client emails not already queued"""
+    # Get unread emails
+    emails = await gmail_call(
+        klaus_gmail.get_recent_emails,
+        query="in:inbox is:unread -label:Klaus-Responded",
+        max_results=20
+    )
 
-        # Filter out system notifications and automated emails
-        client_emails = []
-        ignored_count = 0
-        for email in new_emails:
-            if should_ignore_email(email):
-                ignored_count += 1
-                # Mark as read so we don't keep checking it
-                klaus_gmail.mark_as_read(email.get('id'))
-            else:
-                client_emails.append(email)
+    if not emails:
+        log.info("[KLAUS EMAIL POLL] No unread emails")
+        return
 
-        if ignored_count > 0:
-            print(f"[KLAUS EMAIL POLL] Ignored {ignored_count} system/notification emails")
+    # Filter out emails already in the pending queue
+    new_emails = [e for e in emails if e.get('id') not in pending_email_responses]
 
-        if not client_emails:
-            print(f"[KLAUS EMAIL POLL] No client emails to respond to")
-            return
+    if not new_emails:
+        log.info("[KLAUS EMAIL POLL] %s unread emails already queued for response", len(emails))
+        return
 
-        print(f"[KLAUS EMAIL POLL] Found {len(client_emails)} client emails to process")
+    # Filter out system notifications and automated emails
+    client_emails = []
+    ignored_count = 0
+    for email in new_emails:
+        if should_ignore_email(email):
+            ignored_count += 1
+            # Mark as read so we don't keep checking it
+            await gmail_call(klaus_gmail.mark_as_read, email.get('id'))
+        else:
+            client_emails.append(email)
 
-        # Get invoices for context (cached for all emails in this batch)
-        invoices = await hubspot_client.get_invoices()
+    if ignored_count > 0:
+        log.info("[KLAUS EMAIL POLL] Ignored %s system/notification emails", ignored_count)
 
-        # Queue each email for delayed response
-        for email in client_emails:
-            schedule_email_response(email, invoices)
+    if not client_emails:
+        log.info("[KLAUS EMAIL POLL] No client emails to respond to")
+        return
 
-        print(f"[KLAUS EMAIL POLL] Queued {len(client_emails)} emails for delayed response")
+    log.info("[KLAUS EMAIL POLL] Found %s client emails to process", len(client_emails))
 
-    except Exception as e:
-        import traceback
-        print(f"[KLAUS EMAIL POLL] Error: {e}")
-        traceback.print_exc()
+    # Get invoices for context (cached for all emails in this batch)
+    invoices = await get_invoices_cached(max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS)
 
+    # Queue each email for delayed response
+    for email in client_emails:
+        schedule_email_response(email, invoices)
 
-def run_email_poll():
-    """Wrapper to run async email poll from scheduler"""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        loop.run_until_complete(poll_emails_for_response())
-    finally:
-        loop.close()
+    log.info("[KLAUS EMAIL POLL] Queued %s emails for delayed response", len(client_emails))
 
 
+# Only one full run at a time: a manual /schedule/run-now overlapping the scheduled
+# run would otherwise send every reminder twice
+_full_run_lock = asyncio.Lock()
+
 async def scheduled_full_run():
     """
     Combined scheduled job that runs:
@@ -716,9 +1129,16 @@ async def scheduled_full_run():
     2. Klaus collections (send reminders)
     3. Klaus email processing (respond to incoming)
     4. Send email report
+    Steps 2 and 3 run concurrently. Skipped if a full run is already in progress.
     """
-    import time
-    print(f"[SCHEDULER] Starting full scheduled run at {datetime.now().isoformat()}")
+    if _full_run_lock.locked():
+        log.info("[SCHEDULER] Full run already in progress, skipping")
+        return
+    async with _full_run_lock:
+        await _full_run()
+
+async def _full_run():
+    log.info("[SCHEDULER] Starting full scheduled run at %s", datetime.now().isoformat())
 
     # Track stats for report
     klaus_stats = {
@@ -731,103 +1151,56 @@ async def scheduled_full_run():
 
     # Fetch invoices ONCE to avoid rate limits
     try:
-        print("[SCHEDULER] Fetching invoices from HubSpot...")
-        invoices = await hubspot_client.get_invoices()
-        print(f"[SCHEDULER] Fetched {len(invoices)} invoices")
+        log.info("[SCHEDULER] Fetching invoices from HubSpot...")
+        invoices = await get_invoices_cached(max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS)
+        log.info("[SCHEDULER] Fetched %s invoices", len(invoices))
     except Exception as e:
-        print(f"[SCHEDULER] Failed to fetch invoices: {e}")
+        log.error("[SCHEDULER] Failed to fetch invoices: %s", e)
         return
 
     # Small delay to respect rate limits
-    time.sleep(2)
+    await asyncio.sleep(2)
 
     # Run reconciliation (skip - it fetches its own data and we're hitting rate limits)
     # await scheduled_reconciliation()
 
-    # Run Klaus collections and track stats
-    try:
-        analysis = klaus_engine.analyze_overdue_invoices(invoices)
-
-        emails_sent = 0
-        for email_action in analysis['autonomous_emails']:
-            if klaus_gmail:
-                invoice_map = {}
-                for inv in email_action.get('invoices', []):
-                    inv_number = str(inv.get('invoice_number', '')).strip()
-                    if inv_number.upper().startswith('INV-'):
-                        inv_number = inv_number[4:].strip()
-                    hubspot_url = inv.get('hubspot_url', '')
-                    if inv_number and hubspot_url:
-                        invoice_map[inv_number] = hubspot_url
-
-                message = email_action['recommended_message']
-                lines = message.split('\n')
-                if lines and lines[0].startswith('Subject:'):
-                    subject = lines[0].replace('Subject:', '').strip()
-                    body = '\n'.join(lines[1:]).strip()
-                else:
-                    subject = "Payment Reminder"
-                    body = message
-
-                cc_email = None
-                if email_action.get('is_vip'):
-                    cc_email = 'daniel@leveragelivelocal.com'
-
-                result = klaus_gmail.send_email(
-                    to_email=email_action.get('contact_email'),
-                    to_name=email_action.get('contact_name'),
-                    subject=subject,
-                    body=body,
-                    cc=cc_email,
-                    invoice_map=invoice_map
-                )
+    # Klaus collections and incoming email processing use the same invoices but are
+    # otherwise independent, so they run concurrently
+    async def run_collections():
+        try:
+            analysis = await get_overdue_analysis_cached(max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS)
 
-                if result['status'] == 'success':
-                    emails_sent += 1
-                    for inv in email_action.get('invoices', []):
-                        klaus_engine.log_communication(
-                            invoice_id=inv.get('invoice_id'),
-                            company_name=inv.get('company_name'),
-                            method='email',
-                            message_type='reminder',
-                            approved_by='autonomous'
-                        )
-
-        klaus_stats['emails_sent'] = emails_sent
-        klaus_stats['pending_approvals'] = len(analysis['pending_approvals'])
-        print(f"[KLAUS] Collections: {emails_sent} sent, {len(analysis['pending_approvals'])} pending")
+            emails_sent = await send_autonomous_emails(analysis)
 
-    except Exception as e:
-        import traceback
-        print(f"[KLAUS] Collections failed: {e}")
-        traceback.print_exc()
+            klaus_stats['emails_sent'] = emails_sent
+            klaus_stats['pending_approvals'] = len(analysis['pending_approvals'])
+            log.info("[KLAUS] Collections: %s sent, %s pending", emails_sent, len(analysis['pending_approvals']))
 
-    # Process incoming emails and track stats (reuse invoices from above)
-    try:
-        if klaus_gmail and klaus_email_responder:
-            emails = klaus_gmail.get_recent_emails(query="in:inbox is:unread", max_results=20)
-            if emails:
-                responded = 0
-                needs_review = 0
-                for email in emails:
-                    result = await process_incoming_email(email, invoices)
-                    if result.get('response_sent'):
-                        responded += 1
-                    if result.get('requires_manual_review'):
-                        needs_review += 1
-
-                klaus_stats['emails_processed'] = len(emails)
-                klaus_stats['emails_responded'] = responded
-                klaus_stats['needs_review'] = needs_review
-                print(f"[KLAUS] Email processing: {responded}/{len(emails)} responded, {needs_review} need review")
-    except Exception as e:
-        import traceback
-        print(f"[KLAUS] Email processing failed: {e}")
-        traceback.print_exc()
+        except Exception as e:
+            log.exception("[KLAUS] Collections failed: %s", e)
+
+    # Process incoming emails and track stats (the invoices fetched above are still cached)
+    async def run_email_processing():
+        try:
+            if klaus_gmail and klaus_email_responder:
+                # Same single-flight run as /klaus/emails/process, so the two never reply twice
+                result = await _process_emails_single_flight(invoice_max_age=SCHEDULED_INVOICE_MAX_AGE_SECONDS)
+                if result['processed']:
+                    responded = result['autonomous_responses_sent']
+                    needs_review = result['requires_manual_review']
+                    klaus_stats['emails_processed'] = result['processed']
+                    klaus_stats['emails_responded'] = responded
+                    klaus_stats['needs_review'] = needs_review
+                    log.info("[KLAUS] Email processing: %s/%s responded, %s need review", responded, result['processed'], needs_review)
+        except Exception as e:
+            log.exception("[KLAUS] Email processing failed: %s", e)
+
+    await asyncio.gather(run_collections(), run_email_processing(), return_exceptions=True)
 
     # Send Email report (SMS disabled)
     try:
-        report_result = notification_service.send_klaus_report(
+        report_result = await asyncio.to_thread(
+            notification_service.send_klaus_report,
             emails_sent=klaus_stats['emails_sent'],
             pending_approvals=klaus_stats['pending_approvals'],
             emails_processed=klaus_stats['emails_processed'],
@@ -836,13 +1209,11 @@ async def scheduled_full_run():
             via_email=True,
             via_sms=False
         )
-        print(f"[SCHEDULER] Report sent - Email: {report_result['email']}")
+        log.info("[SCHEDULER] Report sent - Email: %s", report_result['email'])
     except Exception as e:
-        import traceback
-        print(f"[SCHEDULER] Report failed: {e}")
-        traceback.print_exc()
+        log.exception("[SCHEDULER] Report failed: %s", e)
 
-    print(f"[SCHEDULER] Full scheduled run complete at {datetime.now().isoformat()}")
+    log.info("[SCHEDULER] Full scheduled run complete at %s", datetime.now().isoformat())
 
 # ============================================================================
 # MAIN ROUTES
@@ -867,12 +1238,12 @@ async def klaus_dashboard(request: Request):
 async def health_check():
     """Health check endpoint"""
     # Check email configuration (Gmail API or SMTP)
-    email_configured = klaus_gmail is not None or (os.getenv("SMTP_USER") and os.getenv("SMTP_PASSWORD"))
+    email_configured = klaus_gmail is not None or (settings.smtp_user and settings.smtp_password)
 
     # Check WhatsApp configuration (Twilio)
-    twilio_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    twilio_token = os.getenv("TWILIO_AUTH_TOKEN")
-    twilio_to = os.getenv("TWILIO_WHATSAPP_TO")
+    twilio_sid = settings.twilio_account_sid
+    twilio_token = settings.twilio_auth_token
+    twilio_to = settings.twilio_whatsapp_to
 
     whatsapp_configured = bool(twilio_sid and twilio_token and twilio_to)
 
@@ -900,11 +1271,54 @@ async def health_check():
 # RECONCILIATION ENDPOINTS (EXISTING)
 # ============================================================================
 
+# Overlapping /reconcile calls for the same date range and threshold share one run
+_reconcile_inflight: Dict[tuple, asyncio.Task] = {}
+
+async def _reconcile(start_date_dt: datetime, end_date_dt: datetime, threshold: float) -> Dict:
+    """Fetch transactions and invoices, match them and build association suggestions"""
+    # Fetch transactions from Plaid and the invoice history concurrently. The
+    # history pass covers both the open invoices to match and the paid invoices
+    # used for suggestions, so HubSpot invoices are only paged through once.
+    start_str = start_date_dt.date().isoformat()
+    end_str = end_date_dt.date().isoformat()
+    log.info("[RECONCILE] Fetching transactions from %s to %s", start_str, end_str)
+    transactions, (paid_invoices, invoices, _) = await asyncio.gather(
+        plaid_client.get_transactions(start_date=start_str, end_date=end_str),
+        load_invoice_history()
+    )
+    log.debug("[RECONCILE] Got %d transactions from Plaid", len(transactions))
+    
+    # Filter out Stripe transactions
+    transactions = exclude_stripe_transactions(transactions)
+    log.info("[RECONCILE] %d transactions after filtering Stripe, %d open invoices", len(transactions), len(invoices))
+    
+    # Match transactions to invoices
+    matches = matching_engine.match_transactions_to_invoices(
+        transactions=transactions,
+        invoices=invoices,
+        confidence_threshold=threshold
+    )
+    
+    # Get AI suggestions based on payment history
+    suggestions = matching_engine.suggest_associations_from_history(paid_invoices, transactions)
+    
+    return {
+        "status": "success",
+        "start_date": start_date_dt,
+        "end_date": end_date_dt,
+        "transactions_analyzed": len(transactions),
+        "invoices_analyzed": len(invoices),
+        "matches_found": len(matches),
+        "matches": matches,
+        "suggestions": suggestions,
+        "auto_approve_threshold": threshold
+    }
+
 @app.api_route("/reconcile", methods=["GET", "POST"], response_model=dict)
 async def reconcile_accounts(
     request: MatchRequest = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     auto_approve_threshold: Optional[float] = 60.0
 ):
     """
@@ -912,121 +1326,41 @@ async def reconcile_accounts(
     Matches bank transactions to HubSpot invoices
     Supports both GET (with query params) and POST (with JSON body) for backward compatibility
     """
-    print(f"[RECONCILE] Starting reconciliation - start_date={start_date}, end_date={end_date}, threshold={auto_approve_threshold}")
+    log.debug("[RECONCILE] Starting reconciliation - start_date=%s, end_date=%s, threshold=%s", start_date, end_date, auto_approve_threshold)
     try:
         # Handle GET requests with query parameters (backward compatibility)
+        # Dates arrive already parsed; malformed ones are rejected with a 422 before any I/O
         if request is None or (start_date is not None or end_date is not None):
             # Use query parameters
-            end_date_str = end_date
-            start_date_str = start_date
+            end_date_dt = end_date
+            start_date_dt = start_date
             threshold = auto_approve_threshold
         else:
             # Use POST body
-            end_date_str = request.end_date
-            start_date_str = request.start_date
+            end_date_dt = request.end_date
+            start_date_dt = request.start_date
             threshold = request.auto_approve_threshold
         
         # Get date range
-        if end_date_str:
-            end_date_dt = datetime.fromisoformat(end_date_str)
-        else:
+        if end_date_dt is None:
             end_date_dt = datetime.now()
-        
-        if start_date_str:
-            start_date_dt = datetime.fromisoformat(start_date_str)
-        else:
+        if start_date_dt is None:
             start_date_dt = end_date_dt - timedelta(days=90)
         
-        # Fetch transactions from Plaid
-        print(f"[RECONCILE] Fetching transactions from {start_date_dt.strftime('%Y-%m-%d')} to {end_date_dt.strftime('%Y-%m-%d')}")
-        transactions = await plaid_client.get_transactions(
-            start_date=start_date_dt.strftime("%Y-%m-%d"),
-            end_date=end_date_dt.strftime("%Y-%m-%d")
-        )
-        print(f"[RECONCILE] Got {len(transactions)} transactions from Plaid")
-        
-        # Filter out Stripe transactions
-        transactions = [t for t in transactions if 'stripe' not in t.get('description', '').lower()]
-        print(f"[RECONCILE] After filtering Stripe: {len(transactions)} transactions")
-        
-        # Fetch invoices from HubSpot
-        invoices = await hubspot_client.get_invoices()
-        print(f"[RECONCILE] Got {len(invoices)} invoices from HubSpot")
-        
-        # Match transactions to invoices
-        matches = matching_engine.match_transactions_to_invoices(
-            transactions=transactions,
-            invoices=invoices,
-            confidence_threshold=threshold
-        )
-        
-        # Get all invoices with payment history for suggestions
-        all_invoices = []
-        after = None
-        pages_fetched = 0
-        max_pages = 10
-        
-        while pages_fetched < max_pages:
-            all_invoices_response = hubspot_client.client.crm.objects.basic_api.get_page(
-                object_type="invoices",
-                limit=100,
-                after=after,
-                properties=["hs_invoice_number", "hs_title", "hs_amount_billed", "hs_payment_status", 
-                           "hs_balance_due", "hs_due_date", "hs_createdate", "hs_number", "hs_payment_date"],
-                associations=["companies"]
-            )
-            for invoice in all_invoices_response.results:
-                all_invoices.append(invoice)
-            pages_fetched += 1
-            if hasattr(all_invoices_response, 'paging') and all_invoices_response.paging and hasattr(all_invoices_response.paging, 'next'):
-                after = all_invoices_response.paging.next.after
-            else:
-                break
-        
-        # Extract paid invoices with company names
-        paid_invoices = []
-        for invoice in all_invoices:
-            props = invoice.properties
-            payment_date = props.get("hs_payment_date")
-            if payment_date:
-                company_name = None
-                if hasattr(invoice, 'associations') and invoice.associations:
-                    company_associations = invoice.associations.get('companies', {})
-                    if company_associations and hasattr(company_associations, 'results') and company_associations.results:
-                        company_id = company_associations.results[0].id
-                        try:
-                            company = hubspot_client.client.crm.companies.basic_api.get_by_id(company_id=company_id, properties=["name"])
-                            company_name = company.properties.get("name")
-                        except:
-                            pass
-                paid_invoices.append({
-                    'id': invoice.id,
-                    'number': props.get("hs_invoice_number") or props.get("hs_number") or "",
-                    'company_name': company_name,
-                    'amount': float(props.get("hs_amount_billed", 0)),
-                    'payment_date': payment_date,
-                    'created_date': props.get("hs_createdate")
-                })
-        
-        # Get AI suggestions based on payment history
-        suggestions = matching_engine.suggest_associations_from_history(paid_invoices, transactions)
-        
-        return {
-            "status": "success",
-            "start_date": start_date_dt.isoformat(),
-            "end_date": end_date_dt.isoformat(),
-            "transactions_analyzed": len(transactions),
-            "invoices_analyzed": len(invoices),
-            "matches_found": len(matches),
-            "matches": matches,
-            "suggestions": suggestions,
-            "auto_approve_threshold": threshold
-        }
+        # Join a run already in flight for the same range, otherwise start one.
+        # The run is shielded so one client disconnecting doesn't cancel it for the others.
+        key = (start_date_dt.date(), end_date_dt.date(), threshold)
+        task = _reconcile_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(_reconcile(start_date_dt, end_date_dt, threshold))
+            _reconcile_inflight[key] = task
+            task.add_done_callback(lambda _: _reconcile_inflight.pop(key, None))
+        else:
+            log.info("[RECONCILE] Joining reconciliation already in progress for %s to %s", key[0], key[1])
+        return await asyncio.shield(task)
     
     except Exception as e:
-        print(f"[RECONCILE] ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("[RECONCILE] ERROR: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/approve", response_model=dict)
@@ -1055,6 +1389,9 @@ async def approve_match(request: ApprovalRequest):
             invoice_id=request.invoice_id,
             company_name=request.company_name or 'Unknown'
         )
+        invalidate_invoice_history_cache()
+        # Drop the cached invoices/analysis so scheduled reminders skip this invoice
+        invalidate_invoice_cache()
 
         return {
             "status": "success",
@@ -1068,16 +1405,17 @@ async def approve_match(request: ApprovalRequest):
 async def approve_bulk_matches(request: BulkApprovalRequest):
     """Approve multiple matches at once"""
     try:
-        success_count = 0
-        errors = []
+        semaphore = asyncio.Semaphore(APPROVE_BULK_CONCURRENCY)
 
-        for approval in request.approvals:
+        async def approve_one(approval) -> Optional[Dict]:
+            """Approve a single match; returns an error entry on failure"""
             try:
-                await hubspot_client.update_invoice_reconciliation_status(
-                    invoice_id=approval.invoice_id,
-                    status='Reconciled',
-                    transaction_details=approval.transaction_description
-                )
+                async with semaphore:
+                    await hubspot_client.update_invoice_reconciliation_status(
+                        invoice_id=approval.invoice_id,
+                        status='Reconciled',
+                        transaction_details=approval.transaction_description
+                    )
 
                 # Mark the transaction as accounted so it won't be suggested again
                 if approval.transaction_description:
@@ -1095,13 +1433,20 @@ async def approve_bulk_matches(request: BulkApprovalRequest):
                     invoice_id=approval.invoice_id,
                     company_name=approval.company_name or 'Unknown'
                 )
-
-                success_count += 1
+                return None
             except Exception as e:
-                errors.append({
+                return {
                     "invoice_id": approval.invoice_id,
                     "error": str(e)
-                })
+                }
+
+        results = await asyncio.gather(*[approve_one(approval) for approval in request.approvals])
+        errors = [result for result in results if result]
+        success_count = len(results) - len(errors)
+        if success_count:
+            invalidate_invoice_history_cache()
+            # Drop the cached invoices/analysis so scheduled reminders skip these invoices
+            invalidate_invoice_cache()
 
         return {
             "status": "success",
@@ -1168,12 +1513,7 @@ async def get_accounted_transactions():
 async def delete_accounted_transaction(transaction_id: str):
     """Remove a transaction from accounted list"""
     try:
-        accounted = matching_engine.memory.get('accounted_transactions', [])
-        updated = [t for t in accounted if t.get('transaction_id') != transaction_id and t.get('transaction_description') != transaction_id]
-        
-        if len(updated) < len(accounted):
-            matching_engine.memory['accounted_transactions'] = updated
-            matching_engine._save_memory()
+        if matching_engine.remove_accounted_transaction(transaction_id):
             return {"status": "success", "message": "Transaction removed from accounted list"}
         
         return {"status": "error", "message": "Transaction not found"}
@@ -1187,76 +1527,32 @@ async def validate_company_payments(days: int = 365):
     Compare invoices marked paid vs actual deposits
     """
     try:
-        # Get transactions
+        # Date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        transactions = await plaid_client.get_transactions(
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d")
+        # Get transactions and all invoices with payment history concurrently
+        transactions, (paid_invoices, _, all_companies) = await asyncio.gather(
+            plaid_client.get_transactions(
+                start_date=start_date.date().isoformat(),
+                end_date=end_date.date().isoformat()
+            ),
+            load_invoice_history()
         )
         
-        # Get all invoices with payment history
-        all_invoices = []
-        after = None
-        pages_fetched = 0
-        max_pages = 20
-        
-        while pages_fetched < max_pages:
-            all_invoices_response = hubspot_client.client.crm.objects.basic_api.get_page(
-                object_type="invoices",
-                limit=100,
-                after=after,
-                properties=["hs_invoice_number", "hs_title", "hs_amount_billed", "hs_payment_status", 
-                           "hs_balance_due", "hs_due_date", "hs_createdate", "hs_number", "hs_payment_date"],
-                associations=["companies"]
-            )
-            for invoice in all_invoices_response.results:
-                all_invoices.append(invoice)
-            pages_fetched += 1
-            if hasattr(all_invoices_response, 'paging') and all_invoices_response.paging and hasattr(all_invoices_response.paging, 'next'):
-                after = all_invoices_response.paging.next.after
-            else:
-                break
-        
-        # Extract paid invoices with company names
-        paid_invoices = []
-        all_companies = set()
-        
-        for invoice in all_invoices:
-            props = invoice.properties
-            company_name = None
-            
-            if hasattr(invoice, 'associations') and invoice.associations:
-                company_associations = invoice.associations.get('companies', {})
-                if company_associations and hasattr(company_associations, 'results') and company_associations.results:
-                    company_id = company_associations.results[0].id
-                    try:
-                        company = hubspot_client.client.crm.companies.basic_api.get_by_id(company_id=company_id, properties=["name"])
-                        company_name = company.properties.get("name")
-                        all_companies.add(company_name)
-                    except:
-                        pass
-            
-            payment_date = props.get("hs_payment_date")
-            if payment_date and company_name:
-                paid_invoices.append({
-                    'id': invoice.id,
-                    'number': props.get("hs_invoice_number") or props.get("hs_number") or "",
-                    'company_name': company_name,
-                    'amount': float(props.get("hs_amount_billed", 0)),
-                    'payment_date': payment_date,
-                    'created_date': props.get("hs_createdate")
-                })
-        
+        # Group invoices and clean transaction descriptions once, not once per company
+        invoices_by_company = matching_engine.group_invoices_by_company(paid_invoices)
+        cleaned_descriptions = matching_engine.clean_transaction_descriptions(transactions)
+
         # Validate each company
         validation_results = []
         for company in all_companies:
             if company:
                 validation = matching_engine.validate_company_payments(
                     company_name=company,
-                    paid_invoices=paid_invoices,
-                    all_transactions=transactions
+                    company_paid_invoices=invoices_by_company.get(company, []),
+                    all_transactions=transactions,
+                    cleaned_descriptions=cleaned_descriptions
                 )
                 validation_results.append(validation)
         
@@ -1293,62 +1589,18 @@ async def validation_report(days: int = 730):
         start_date = end_date - timedelta(days=days)
 
         transactions = await plaid_client.get_transactions(
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d")
+            start_date=start_date.date().isoformat(),
+            end_date=end_date.date().isoformat()
         )
 
-        # Get all invoices with payment history
-        all_invoices = []
-        after = None
-        pages_fetched = 0
-        max_pages = 20
-
-        while pages_fetched < max_pages:
-            all_invoices_response = hubspot_client.client.crm.objects.basic_api.get_page(
-                object_type="invoices",
-                limit=100,
-                after=after,
-                properties=["hs_invoice_number", "hs_title", "hs_amount_billed", "hs_payment_status",
-                           "hs_balance_due", "hs_due_date", "hs_createdate", "hs_number", "hs_payment_date"],
-                associations=["companies"]
-            )
-            for invoice in all_invoices_response.results:
-                all_invoices.append(invoice)
-            pages_fetched += 1
-            if hasattr(all_invoices_response, 'paging') and all_invoices_response.paging and hasattr(all_invoices_response.paging, 'next'):
-                after = all_invoices_response.paging.next.after
-            else:
-                break
-
-        # Extract paid invoices with company names
-        paid_invoices = []
-        all_companies = set()
+        # Get invoice history (incrementally synced) and extract paid invoices
+        invoice_history = await get_company_invoice_history()
+        all_companies = {entry['company_name'] for entry in invoice_history}
+        paid_invoices = [entry for entry in invoice_history if entry['payment_date']]
 
-        for invoice in all_invoices:
-            props = invoice.properties
-            company_name = None
-
-            if hasattr(invoice, 'associations') and invoice.associations:
-                company_associations = invoice.associations.get('companies', {})
-                if company_associations and hasattr(company_associations, 'results') and company_associations.results:
-                    company_id = company_associations.results[0].id
-                    try:
-                        company = hubspot_client.client.crm.companies.basic_api.get_by_id(company_id=company_id, properties=["name"])
-                        company_name = company.properties.get("name")
-                        all_companies.add(company_name)
-                    except:
-                        pass
-
-            payment_date = props.get("hs_payment_date")
-            if payment_date and company_name:
-                paid_invoices.append({
-                    'id': invoice.id,
-                    'number': props.get("hs_invoice_number") or props.get("hs_number") or "",
-                    'company_name': company_name,
-                    'amount': float(props.get("hs_amount_billed", 0)) if props.get("hs_amount_billed") else 0,
-                    'payment_date': payment_date,
-                    'created_date': props.get("hs_createdate")
-                })
+        # Group invoices and clean transaction descriptions once, not once per company
+        invoices_by_company = matching_engine.group_invoices_by_company(paid_invoices)
+        cleaned_descriptions = matching_engine.clean_transaction_descriptions(transactions)
 
         # Validate each company
         validation_results = []
@@ -1356,8 +1608,9 @@ async def validation_report(days: int = 730):
             if company:
                 validation = matching_engine.validate_company_payments(
                     company_name=company,
-                    paid_invoices=paid_invoices,
-                    all_transactions=transactions
+                    company_paid_invoices=invoices_by_company.get(company, []),
+                    all_transactions=transactions,
+                    cleaned_descriptions=cleaned_descriptions
                 )
                 validation_results.append(validation)
 
@@ -1381,8 +1634,7 @@ async def validation_report(days: int = 730):
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("validation report failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1397,60 +1649,13 @@ async def suggest_associations(days: int = 730):
         start_date = end_date - timedelta(days=days)
 
         transactions = await plaid_client.get_transactions(
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d")
+            start_date=start_date.date().isoformat(),
+            end_date=end_date.date().isoformat()
         )
 
-        # Get all paid invoices
-        all_invoices = []
-        after = None
-        pages_fetched = 0
-        max_pages = 20
-
-        while pages_fetched < max_pages:
-            all_invoices_response = hubspot_client.client.crm.objects.basic_api.get_page(
-                object_type="invoices",
-                limit=100,
-                after=after,
-                properties=["hs_invoice_number", "hs_title", "hs_amount_billed", "hs_payment_status",
-                           "hs_balance_due", "hs_due_date", "hs_createdate", "hs_number", "hs_payment_date"],
-                associations=["companies"]
-            )
-            for invoice in all_invoices_response.results:
-                all_invoices.append(invoice)
-            pages_fetched += 1
-            if hasattr(all_invoices_response, 'paging') and all_invoices_response.paging and hasattr(all_invoices_response.paging, 'next'):
-                after = all_invoices_response.paging.next.after
-            else:
-                break
-
-        # Extract paid invoices with company names
-        paid_invoices = []
-
-        for invoice in all_invoices:
-            props = invoice.properties
-            company_name = None
-
-            if hasattr(invoice, 'associations') and invoice.associations:
-                company_associations = invoice.associations.get('companies', {})
-                if company_associations and hasattr(company_associations, 'results') and company_associations.results:
-                    company_id = company_associations.results[0].id
-                    try:
-                        company = hubspot_client.client.crm.companies.basic_api.get_by_id(company_id=company_id, properties=["name"])
-                        company_name = company.properties.get("name")
-                    except:
-                        pass
-
-            payment_date = props.get("hs_payment_date")
-            if payment_date and company_name:
-                paid_invoices.append({
-                    'id': invoice.id,
-                    'number': props.get("hs_invoice_number") or props.get("hs_number") or "",
-                    'company_name': company_name,
-                    'amount': float(props.get("hs_amount_billed", 0)) if props.get("hs_amount_billed") else 0,
-                    'payment_date': payment_date,
-                    'created_date': props.get("hs_createdate")
-                })
+        # Get all paid invoices that have a company
+        paid_invoices, _, _ = await load_invoice_history()
+        paid_invoices = [invoice for invoice in paid_invoices if invoice['company_name']]
 
         # Generate suggestions
         suggestions = matching_engine.suggest_associations_from_history(paid_invoices, transactions)
@@ -1464,8 +1669,7 @@ async def suggest_associations(days: int = 730):
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("suggest associations failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1512,23 +1716,20 @@ async def delete_association(transaction_name: str):
 async def set_schedule(request: ScheduleRequest):
     """Set automated reconciliation + Klaus collections schedule"""
     try:
-        scheduler.remove_all_jobs()
+        # Only the combined run is rescheduled; email polling and queued email
+        # responses are separate jobs and must survive a schedule change
+        if scheduler.get_job('full_run'):
+            scheduler.remove_job('full_run')
 
         if request.frequency != 'none':
-            hour, minute = map(int, request.time.split(':'))
+            trigger = build_schedule_trigger(request.frequency, request.time)
 
-            if request.frequency == 'daily':
-                trigger = CronTrigger(hour=hour, minute=minute)
-            elif request.frequency == 'weekly':
-                trigger = CronTrigger(day_of_week='mon', hour=hour, minute=minute)
-            elif request.frequency == 'monthly':
-                trigger = CronTrigger(day=1, hour=hour, minute=minute)
+            # One combined job on one trigger: the run fetches invoices once and
+            # shares them between collections and email processing
+            scheduler.add_job(scheduled_full_run, trigger, id='full_run', max_instances=1, coalesce=True)
 
-            # Use combined job that runs everything together
-            scheduler.add_job(scheduled_full_run, trigger, id='full_run')
-
-            print(f"[SCHEDULE] Set to {request.frequency} at {request.time}")
-            print(f"[SCHEDULE] Will run: Reconciliation + Klaus Collections + Email Processing")
+            log.info("[SCHEDULE] Set to %s at %s", request.frequency, request.time)
+            log.info("[SCHEDULE] Will run: Reconciliation + Klaus Collections + Email Processing")
 
         save_schedule_config({
             'frequency': request.frequency,
@@ -1564,18 +1765,14 @@ async def run_schedule_now(background_tasks: BackgroundTasks):
     Runs: Reconciliation + Klaus Collections + Email Processing
     Runs in background to avoid timeout.
     """
-    import asyncio
-
-    def run_in_background():
-        """Wrapper to run async function in background"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(scheduled_full_run())
-        finally:
-            loop.close()
+    if _full_run_lock.locked():
+        return {
+            "status": "already_running",
+            "message": "A full run is already in progress.",
+            "jobs": ["reconciliation", "klaus_collections", "email_processing"]
+        }
 
-    background_tasks.add_task(run_in_background)
+    background_tasks.add_task(scheduled_full_run)
 
     return {
         "status": "started",
@@ -1592,17 +1789,18 @@ async def get_transactions(days: int = 30):
         start_date = end_date - timedelta(days=days)
         
         transactions = await plaid_client.get_transactions(
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d")
+            start_date=start_date.date().isoformat(),
+            end_date=end_date.date().isoformat()
         )
         
-        transactions = [t for t in transactions if 'stripe' not in t.get('description', '').lower()]
+        transactions = exclude_stripe_transactions(transactions)
         
-        return {
+        # Returned as a response so FastAPI doesn't re-encode every transaction before orjson
+        return ORJSONResponse(content={
             "status": "success",
             "count": len(transactions),
             "transactions": transactions
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1611,13 +1809,14 @@ async def get_transactions(days: int = 30):
 async def get_invoices():
     """Get all HubSpot invoices"""
     try:
-        invoices = await hubspot_client.get_invoices()
+        invoices = await get_invoices_cached()
         
-        return {
+        # Returned as a response so FastAPI doesn't re-encode every invoice before orjson
+        return ORJSONResponse(content={
             "status": "success",
             "count": len(invoices),
             "invoices": invoices
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1673,8 +1872,8 @@ async def test_notification(request: NotificationTestRequest):
 @app.get("/admin/twilio-config")
 async def get_twilio_config():
     """Debug endpoint to check Twilio WhatsApp configuration"""
-    twilio_from = os.getenv("TWILIO_WHATSAPP_FROM", "")
-    twilio_to = os.getenv("TWILIO_WHATSAPP_TO", "")
+    twilio_from = settings.twilio_whatsapp_from
+    twilio_to = settings.twilio_whatsapp_to
 
     # Mask numbers for security but show format
     def mask_number(num):
@@ -1686,8 +1885,8 @@ async def get_twilio_config():
 
     return {
         "status": "success",
-        "twilio_sid_set": bool(os.getenv("TWILIO_ACCOUNT_SID")),
-        "twilio_token_set": bool(os.getenv("TWILIO_AUTH_TOKEN")),
+        "twilio_sid_set": bool(settings.twilio_account_sid),
+        "twilio_token_set": bool(settings.twilio_auth_token),
         "twilio_whatsapp_from": mask_number(twilio_from),
         "twilio_whatsapp_to": mask_number(twilio_to),
         "from_format_ok": twilio_from.startswith("whatsapp:+") if twilio_from else False,
@@ -1700,17 +1899,26 @@ async def get_twilio_config():
 # ============================================================================
 
 @app.post("/klaus/analyze", response_model=dict)
-async def klaus_analyze_invoices(request: KlausAnalysisRequest):
+async def klaus_analyze_invoices(request: KlausAnalysisRequest, background: bool = False, fresh: bool = False):
     """
     Analyze overdue invoices with Klaus
     Returns autonomous actions and pending approvals
+    Pass ?background=true to get a job id back immediately instead,
+    and ?fresh=true to refetch invoices instead of using the shared cache
     """
+    if fresh:
+        invalidate_invoice_cache()
+    if background:
+        return start_background_job(_analyze_invoices())
+    # The analysis is large and already JSON-ready, so skip FastAPI's re-encoding pass
+    return ORJSONResponse(content=await _analyze_invoices())
+
+
+async def _analyze_invoices() -> Dict:
+    """Run (or reuse) the Klaus analysis of the cached unpaid invoices"""
     try:
-        # Get all unpaid invoices
-        invoices = await hubspot_client.get_invoices()
-        
-        # Analyze with Klaus
-        analysis = klaus_engine.analyze_overdue_invoices(invoices)
+        # Analyze all unpaid invoices with Klaus
+        analysis = await get_overdue_analysis_cached()
         
         return {
             "status": "success",
@@ -1721,24 +1929,71 @@ async def klaus_analyze_invoices(request: KlausAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# A single email send stops being waited on after this long. It sits above the providers'
+# own timeouts (SMTP's 20s socket timeout per step, plus the IMAP save to Sent that follows
+# a delivered SMTP send), so a slow but working send isn't reported as timed out
+EMAIL_SEND_TIMEOUT_SECONDS = 90
+# A provider whose send just failed is skipped (if another is configured) for this long
+EMAIL_PROVIDER_COOLDOWN_SECONDS = 30
+# provider name -> time.monotonic() of its last failed send
+_email_provider_failed_at: Dict[str, float] = {}
+
+async def send_email_with_fallback(**kwargs) -> Dict:
+    """
+    Send through Gmail, falling back to SMTP when Gmail reports a failure
+
+    Providers that failed within EMAIL_PROVIDER_COOLDOWN_SECONDS are tried only
+    if no other provider is available. A send that times out has an unknown
+    outcome (it may still complete in its worker thread, or already have been
+    delivered), so it returns status "unknown" without trying the next provider
+    or cooling this one down: retrying would risk delivering the email twice.
+    """
+    providers = [(name, client) for name, client in (("gmail", klaus_gmail), ("smtp", klaus_smtp)) if client]
+    if not providers:
+        raise HTTPException(status_code=503, detail="No email service configured (neither Gmail nor SMTP)")
+
+    now = time.monotonic()
+    healthy = [(name, client) for name, client in providers
+               if now - _email_provider_failed_at.get(name, float("-inf")) >= EMAIL_PROVIDER_COOLDOWN_SECONDS]
+
+    result = None
+    for name, client in healthy or providers:
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(client.send_email, **kwargs),
+                                            timeout=EMAIL_SEND_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            log.warning("email send via %s timed out after %ss, outcome unknown", name, EMAIL_SEND_TIMEOUT_SECONDS)
+            return {
+                "status": "unknown",
+                "provider": name,
+                "error": f"Email send via {name} timed out after {EMAIL_SEND_TIMEOUT_SECONDS}s; it may still be delivered, so don't resend"
+            }
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+
+        if result.get('status') == 'success':
+            _email_provider_failed_at.pop(name, None)
+            log.info("email sent via %s", name)
+            return result
+
+        _email_provider_failed_at[name] = time.monotonic()
+        log.warning("email send via %s failed: %s", name, result.get('error'))
+    return result
+
 @app.post("/klaus/email/send", response_model=dict)
 async def klaus_send_email(request: KlausEmailRequest):
     """
     Send an email via Klaus
     This is for approved or autonomous emails
     Uses Gmail API if available, falls back to SMTP
+
+    A send that timed out comes back with status "unknown". It is logged like a
+    sent email, so the invoice isn't reminded again while it may have been delivered.
     """
     try:
-        # Try Gmail first, fall back to SMTP
-        email_client = klaus_gmail or klaus_smtp
+        log.info("sending email to %s, subject: %.50s", request.to_email, request.subject)
 
-        print(f"[EMAIL] Using client: {type(email_client).__name__ if email_client else 'None'}")
-        print(f"[EMAIL] Sending to: {request.to_email}, Subject: {request.subject[:50]}...")
-
-        if not email_client:
-            raise HTTPException(status_code=503, detail="No email service configured (neither Gmail nor SMTP)")
-
-        result = email_client.send_email(
+        result = await send_email_with_fallback(
             to_email=request.to_email,
             to_name=request.to_name,
             subject=request.subject,
@@ -1747,9 +2002,9 @@ async def klaus_send_email(request: KlausEmailRequest):
             invoice_map=request.invoice_map
         )
 
-        print(f"[EMAIL] Result: {result}")
+        log.debug("email result: %s", result)
 
-        if result['status'] == 'success':
+        if result['status'] in ('success', 'unknown'):
             # Log communication
             klaus_engine.log_communication(
                 invoice_id=request.invoice_id,
@@ -1758,36 +2013,33 @@ async def klaus_send_email(request: KlausEmailRequest):
                 message_type='collection',
                 approved_by='manual'
             )
+            invalidate_invoice_cache()
 
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"[EMAIL] Error: {e}")
+        log.error("email send failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/klaus/emails/pending", response_model=dict)
 async def klaus_get_pending_emails():
     """Get emails pending approval - automatically analyzes current invoices"""
     try:
-        # Get all unpaid invoices from HubSpot
-        invoices = await hubspot_client.get_invoices()
-        
-        # Filter for unpaid only (balance_due > 0)
-        unpaid_invoices = [inv for inv in invoices if float(inv.get('balance_due', 0)) > 0]
-        
-        # Analyze with Klaus to get pending approvals
-        analysis = klaus_engine.analyze_overdue_invoices(unpaid_invoices)
+        # Analyze unpaid invoices (balance_due > 0) with Klaus to get pending approvals
+        analysis = await get_overdue_analysis_cached()
         
         # Return pending approvals
         pending = analysis.get('pending_approvals', [])
         
-        return {
+        return ORJSONResponse(content={
             "status": "success",
             "count": len(pending),
             "pending_emails": pending,
-            "total_analyzed": len(unpaid_invoices),
+            "total_analyzed": analysis['total_analyzed'],
             "total_companies": analysis.get('total_companies', 0)
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1795,12 +2047,13 @@ async def klaus_get_pending_emails():
 async def klaus_debug_invoice_fields():
     """DEBUG: Show raw HubSpot invoice fields to find contact info"""
     try:
-        invoices = await hubspot_client.get_invoices()
+        # Page through HubSpot directly (not the server-side unpaid search or its
+        # cache), so this shows what the invoices look like without that filter
+        invoices = await hubspot_client.get_invoices(legacy=True)
         if not invoices:
             return {"status": "error", "message": "No invoices found"}
         
-        # Get first invoice with balance_due > 0
-        sample_invoice = next((inv for inv in invoices if float(inv.get('balance_due', 0)) > 0), invoices[0])
+        sample_invoice = invoices[0]
         
         return {
             "status": "success",
@@ -1852,8 +2105,7 @@ async def klaus_mark_invoice_approved(request: KlausInvoiceApprovalRequest):
 
         # If company name not provided, try to look it up
         if not request.company_name:
-            invoices = await hubspot_client.get_invoices()
-            invoice = next((inv for inv in invoices if inv['id'] == request.invoice_id), None)
+            invoice = await hubspot_client.get_invoice_by_id(request.invoice_id)
             if invoice:
                 company_name = invoice.get('company_name', 'Unknown')
 
@@ -1861,6 +2113,7 @@ async def klaus_mark_invoice_approved(request: KlausInvoiceApprovalRequest):
             invoice_id=request.invoice_id,
             company_name=company_name
         )
+        invalidate_invoice_cache()
 
         return {
             "status": "success",
@@ -1891,13 +2144,27 @@ async def klaus_get_invoice_status(invoice_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/klaus/emails/inbox", response_model=dict)
-async def klaus_get_inbox():
-    """Get unread emails from Klaus inbox"""
+async def klaus_get_inbox(stream: bool = False):
+    """
+    Get unread emails from Klaus inbox
+    Pass ?stream=true to get newline-delimited JSON (one email per line) sent
+    as each window of emails is fetched, instead of one response at the end
+    """
     try:
         if not klaus_gmail:
             raise HTTPException(status_code=503, detail="Klaus Gmail not configured")
 
-        emails = klaus_gmail.get_recent_emails(
+        if stream:
+            def email_lines():
+                # Starlette iterates sync generators in worker threads, off the event loop
+                for window in klaus_gmail.iter_recent_emails(query="in:inbox is:unread", max_results=50):
+                    for email in window:
+                        yield orjson.dumps(email) + b"\n"
+
+            return StreamingResponse(email_lines(), media_type="application/x-ndjson")
+
+        emails = await gmail_call(
+            klaus_gmail.get_recent_emails,
             query="in:inbox is:unread",
             max_results=50
         )
@@ -1908,17 +2175,74 @@ async def klaus_get_inbox():
             "emails": emails
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def process_incoming_email(email: dict, invoices: list) -> dict:
+# Max emails processed at once by /klaus/emails/process
+EMAIL_PROCESSING_CONCURRENCY = 5
+
+# Overlapping /klaus/emails/process calls and scheduled runs share one run; a run
+# that finished within this window is returned as-is instead of polling Gmail again.
+# The email poll and its delayed replies hold the same lock, so no path replies to
+# an email another one is still handling
+EMAIL_PROCESS_REUSE_SECONDS = 10
+_email_process_lock = asyncio.Lock()
+_email_process_last = {"result": None, "finished": 0.0}
+
+_TRAILING_DIGITS = re.compile(r'(\d+)$')
+
+# Reply scenarios in priority order, matched in a single pass over the email body
+_SCENARIO_PHRASES = {
+    'claims_paid': ['already paid', 'sent payment', 'paid this'],
+    'needs_more_time': ['need more time', 'cash flow', 'next month', 'delay'],
+    'dispute': ['dispute', 'incorrect', 'wrong', 'error'],
+}
+_SCENARIO_RE = re.compile(
+    '|'.join(
+        f"(?P<{scenario}>{'|'.join(re.escape(phrase) for phrase in phrases)})"
+        for scenario, phrases in _SCENARIO_PHRASES.items()
+    ),
+    re.IGNORECASE
+)
+
+def detect_email_scenario(email_body: str) -> Optional[str]:
+    """Return the highest-priority scenario mentioned in the email, or None"""
+    found = {match.lastgroup for match in _SCENARIO_RE.finditer(email_body)}
+    return next((scenario for scenario in _SCENARIO_PHRASES if scenario in found), None)
+
+def build_invoice_index(invoices: list) -> dict:
+    """
+    Index invoices by the numeric part of their invoice number
+
+    Keys are the trailing digits ("INV-00123" -> "00123") and the same digits
+    without leading zeros ("123"), so a number quoted in an email is a dict lookup.
+    The first invoice wins when two share a key, like the linear scan did.
+    """
+    invoice_index = {}
+    for inv in invoices:
+        inv_num = str(inv.get('number', '') or inv.get('invoice_number', ''))
+        match = _TRAILING_DIGITS.search(inv_num)
+        if match:
+            digits = match.group(1)
+            invoice_index.setdefault(digits, inv)
+            invoice_index.setdefault(digits.lstrip('0'), inv)
+    return invoice_index
+
+
+async def process_incoming_email(email: dict, invoices: list, invoice_index: Optional[dict] = None) -> dict:
     """
     Process an incoming email and determine autonomous response.
     Returns response details or None if requires manual review.
+
+    Pass invoice_index (from build_invoice_index) when processing a batch of
+    emails against the same invoices so it's only built once.
     """
     email_body = email.get('body', '')
     from_email = email.get('from', '')
+    reply_address = parseaddr(from_email)[1]
     subject = email.get('subject', '')
     thread_id = email.get('thread_id', '')
     message_id = email.get('id', '')
@@ -1929,11 +2253,17 @@ async def process_incoming_email(email: dict, invoices: list) -> dict:
     # Find matching invoice
     matching_invoice = None
     if invoice_number:
-        for inv in invoices:
-            inv_num = str(inv.get('number', '') or inv.get('invoice_number', ''))
-            if invoice_number in inv_num or inv_num.endswith(invoice_number):
-                matching_invoice = inv
-                break
+        if invoice_index is None:
+            invoice_index = build_invoice_index(invoices)
+        matching_invoice = invoice_index.get(invoice_number) or invoice_index.get(invoice_number.lstrip('0'))
+
+        # Fall back to a substring scan for numbers embedded mid-string
+        if not matching_invoice:
+            for inv in invoices:
+                inv_num = str(inv.get('number', '') or inv.get('invoice_number', ''))
+                if invoice_number in inv_num:
+                    matching_invoice = inv
+                    break
 
     context = {
         'invoice_number': invoice_number or 'Unknown',
@@ -1960,21 +2290,22 @@ async def process_incoming_email(email: dict, invoices: list) -> dict:
     if is_payment_confirmation:
         response_data['detected_type'] = 'payment_confirmation'
         if matching_invoice and klaus_email_responder:
-            response_text = klaus_email_responder.craft_response(
-                email_body, context, scenario='payment_confirmation'
+            response_text = await asyncio.to_thread(
+                klaus_email_responder.craft_response, email_body, context, scenario='payment_confirmation'
             )
             # Send reply
-            result = klaus_gmail.reply_to_email(
+            result = await gmail_call(
+                klaus_gmail.reply_to_email,
                 thread_id=thread_id,
                 message_id=message_id,
-                to_email=from_email.split('<')[-1].replace('>', '').strip(),
+                to_email=reply_address,
                 subject=subject,
                 body=response_text
             )
             if result['status'] == 'success':
                 response_data['response_sent'] = True
                 response_data['action_taken'] = 'Sent payment confirmation acknowledgement'
-                klaus_gmail.mark_as_read(message_id)
+                await gmail_call(klaus_gmail.mark_as_read, message_id)
         else:
             response_data['requires_manual_review'] = True
 
@@ -1987,50 +2318,50 @@ async def process_incoming_email(email: dict, invoices: list) -> dict:
     # Handle other emails - use AI to craft response
     elif klaus_email_responder:
         # Check for common scenarios
-        email_lower = email_body.lower()
+        scenario = detect_email_scenario(email_body)
 
-        if any(phrase in email_lower for phrase in ['already paid', 'sent payment', 'paid this']):
+        if scenario == 'claims_paid':
             response_data['detected_type'] = 'claims_already_paid'
-            response_text = klaus_email_responder.craft_response(
-                email_body, context, scenario='claims_paid'
+            response_text = await asyncio.to_thread(
+                klaus_email_responder.craft_response, email_body, context, scenario='claims_paid'
             )
-        elif any(phrase in email_lower for phrase in ['need more time', 'cash flow', 'next month', 'delay']):
+        elif scenario == 'needs_more_time':
             response_data['detected_type'] = 'needs_more_time'
-            response_text = klaus_email_responder.craft_response(
-                email_body, context, scenario='needs_more_time'
+            response_text = await asyncio.to_thread(
+                klaus_email_responder.craft_response, email_body, context, scenario='needs_more_time'
             )
-        elif any(phrase in email_lower for phrase in ['dispute', 'incorrect', 'wrong', 'error']):
+        elif scenario == 'dispute':
             response_data['detected_type'] = 'dispute'
             response_data['requires_manual_review'] = True
             response_data['action_taken'] = 'Dispute detected - requires Daniel review'
             return response_data
         else:
             response_data['detected_type'] = 'general_inquiry'
-            response_text = klaus_email_responder.craft_response(
-                email_body, context, scenario='general'
+            response_text = await asyncio.to_thread(
+                klaus_email_responder.craft_response, email_body, context, scenario='general'
             )
 
         # Send response for non-dispute cases
         if not response_data.get('requires_manual_review'):
-            to_address = from_email.split('<')[-1].replace('>', '').strip()
-            result = klaus_gmail.reply_to_email(
+            result = await gmail_call(
+                klaus_gmail.reply_to_email,
                 thread_id=thread_id,
                 message_id=message_id,
-                to_email=to_address,
+                to_email=reply_address,
                 subject=subject,
                 body=response_text
             )
             if result['status'] == 'success':
                 response_data['response_sent'] = True
                 response_data['action_taken'] = f'Sent autonomous response ({response_data["detected_type"]})'
-                klaus_gmail.mark_as_read(message_id)
-                klaus_gmail.add_label(message_id, 'Klaus-Responded')
+                await gmail_call(klaus_gmail.mark_as_read, message_id)
+                await gmail_call(klaus_gmail.add_label, message_id, 'Klaus-Responded')
 
     return response_data
 
 
 @app.post("/klaus/emails/process", response_model=dict)
-async def klaus_process_incoming_emails():
+async def klaus_process_incoming_emails(background: bool = False):
     """
     Process incoming emails autonomously.
     Klaus will analyze and respond to emails based on their content.
@@ -2039,16 +2370,39 @@ async def klaus_process_incoming_emails():
     - "Already paid" claims: Ask for payment details to verify
     - Needs more time: Ask for expected payment date
     - Disputes: Flag for Daniel's review
+    Pass ?background=true to get a job id back immediately instead
     """
-    try:
-        if not klaus_gmail:
-            raise HTTPException(status_code=503, detail="Klaus Gmail not configured")
+    if not klaus_gmail:
+        raise HTTPException(status_code=503, detail="Klaus Gmail not configured")
 
-        # Get unread emails
-        emails = klaus_gmail.get_recent_emails(
-            query="in:inbox is:unread",
+    if background:
+        return start_background_job(_process_emails_single_flight())
+    return await _process_emails_single_flight()
+
+
+async def _process_emails_single_flight(invoice_max_age: float = INVOICE_CACHE_TTL_SECONDS) -> Dict:
+    """Run _process_unread_emails, sharing the result with overlapping callers"""
+    async with _email_process_lock:
+        last = _email_process_last
+        if last["result"] is not None and time.monotonic() - last["finished"] < EMAIL_PROCESS_REUSE_SECONDS:
+            return last["result"]
+
+        result = await _process_unread_emails(invoice_max_age)
+        last["result"] = result
+        last["finished"] = time.monotonic()
+        return result
+
+
+async def _process_unread_emails(invoice_max_age: float = INVOICE_CACHE_TTL_SECONDS) -> Dict:
+    """Fetch unread emails and run each through process_incoming_email"""
+    try:
+        # Get unread emails, leaving those the poll already queued to their delayed reply
+        emails = await gmail_call(
+            klaus_gmail.get_recent_emails,
+            query="in:inbox is:unread -label:Klaus-Responded",
             max_results=20
         )
+        emails = [email for email in emails if email.get('id') not in pending_email_responses]
 
         if not emails:
             return {
@@ -2058,12 +2412,31 @@ async def klaus_process_incoming_emails():
             }
 
         # Get invoices for context
-        invoices = await hubspot_client.get_invoices()
+        invoices = await get_invoices_cached(max_age=invoice_max_age)
+
+        invoice_index = build_invoice_index(invoices)
+        semaphore = asyncio.Semaphore(EMAIL_PROCESSING_CONCURRENCY)
+
+        async def process_with_limit(email):
+            async with semaphore:
+                return await process_incoming_email(email, invoices, invoice_index)
+
+        outcomes = await asyncio.gather(*[process_with_limit(email) for email in emails], return_exceptions=True)
 
         results = []
-        for email in emails:
-            result = await process_incoming_email(email, invoices)
-            results.append(result)
+        for email, outcome in zip(emails, outcomes):
+            if isinstance(outcome, Exception):
+                log.error("Failed to process email %s: %s", email.get('id'), outcome)
+                outcome = {
+                    'email_id': email.get('id'),
+                    'thread_id': email.get('thread_id'),
+                    'from': email.get('from'),
+                    'subject': email.get('subject'),
+                    'error': str(outcome),
+                    'response_sent': False,
+                    'requires_manual_review': True
+                }
+            results.append(outcome)
 
         responded = sum(1 for r in results if r.get('response_sent'))
         needs_review = sum(1 for r in results if r.get('requires_manual_review'))
@@ -2077,8 +2450,7 @@ async def klaus_process_incoming_emails():
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("email processing failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/klaus/voice/setup-inbound", response_model=dict)
@@ -2091,7 +2463,7 @@ async def klaus_setup_inbound_calls():
         if not klaus_voice:
             raise HTTPException(status_code=503, detail="Klaus Voice not configured")
 
-        if not os.getenv("VAPI_PHONE_NUMBER_ID"):
+        if not settings.vapi_phone_number_id:
             raise HTTPException(status_code=400, detail="VAPI_PHONE_NUMBER_ID not set in environment")
 
         # Create or update assistant for inbound calls
@@ -2107,7 +2479,7 @@ async def klaus_setup_inbound_calls():
                 "status": "success",
                 "message": "Klaus is now configured to answer inbound calls",
                 "assistant_id": assistant_id,
-                "phone_number_id": os.getenv("VAPI_PHONE_NUMBER_ID")
+                "phone_number_id": settings.vapi_phone_number_id
             }
         else:
             raise HTTPException(status_code=500, detail=result.get('error', 'Unknown error'))
@@ -2124,9 +2496,9 @@ async def klaus_voice_status():
     return {
         "status": "success",
         "voice_configured": klaus_voice is not None,
-        "vapi_api_key_set": bool(os.getenv("VAPI_API_KEY")),
-        "vapi_phone_number_id_set": bool(os.getenv("VAPI_PHONE_NUMBER_ID")),
-        "vapi_assistant_id_set": bool(os.getenv("VAPI_ASSISTANT_ID")),
+        "vapi_api_key_set": bool(settings.vapi_api_key),
+        "vapi_phone_number_id_set": bool(settings.vapi_phone_number_id),
+        "vapi_assistant_id_set": bool(settings.vapi_assistant_id),
         "call_history_count": len(klaus_voice.call_history) if klaus_voice else 0
     }
 
@@ -2139,22 +2511,20 @@ async def klaus_schedule_call(request: KlausCallRequest):
             raise HTTPException(status_code=503, detail="Klaus Voice not configured")
 
         # Get invoice details
-        invoices = await hubspot_client.get_invoices()
-        invoice = next((inv for inv in invoices if inv['id'] == request.invoice_id), None)
+        invoice = await hubspot_client.get_invoice_by_id(request.invoice_id)
         
-        if not invoice:
+        # Only unpaid invoices are eligible for collections calls
+        if not invoice or invoice['balance_due'] <= 0 or invoice['payment_date'] is not None:
             raise HTTPException(status_code=404, detail="Invoice not found")
         
         # Calculate days overdue
         due_date = invoice.get('due_date')
-        if due_date:
-            due_dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-            days_overdue = (datetime.now() - due_dt.replace(tzinfo=None)).days
-        else:
-            days_overdue = 0
+        due_dt = parse_hubspot_date(due_date) if due_date else None
+        days_overdue = (datetime.now() - due_dt).days if due_dt else 0
         
         # Make call
-        result = klaus_voice.make_outbound_call(
+        result = await asyncio.to_thread(
+            klaus_voice.make_outbound_call,
             to_phone=request.to_phone,
             to_name=request.to_name,
             invoice_id=request.invoice_id,
@@ -2172,9 +2542,12 @@ async def klaus_schedule_call(request: KlausCallRequest):
                 message_type='collection',
                 approved_by='manual'
             )
+            invalidate_invoice_cache()
         
         return result
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2206,28 +2579,26 @@ async def klaus_send_document(request: KlausDocumentRequest):
             raise HTTPException(status_code=503, detail="Klaus services not fully configured")
         
         # Get document
-        document = klaus_drive.get_document(doc_type=request.doc_type)
+        document = await asyncio.to_thread(klaus_drive.get_document, doc_type=request.doc_type)
         
         if not document:
             raise HTTPException(status_code=404, detail=f"Document type '{request.doc_type}' not found")
         
-        # Download document temporarily
-        temp_path = f"/tmp/{document['name']}"
-        klaus_drive.download_document(document['id'], temp_path)
+        # Download document into memory
+        document_data = await asyncio.to_thread(klaus_drive.download_document_bytes, document['id'])
+        if document_data is None:
+            raise HTTPException(status_code=502, detail=f"Could not download document '{document['name']}' from Drive")
         
         # Send email with attachment
-        result = klaus_gmail.send_email(
+        result = await gmail_call(
+            klaus_gmail.send_email,
             to_email=request.recipient_email,
             to_name=request.recipient_name,
             subject=f"Requested Document - {document['name']}",
             body=f"Hi {request.recipient_name},\n\nAs requested, I'm attaching our {request.doc_type.upper()}.\n\nLet me know if you need anything else!\n\nBest regards,\nKlaus\nLeverage Live Local",
-            attachments=[temp_path]
+            attachments_bytes=[(document['name'], document_data)]
         )
         
-        # Clean up
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        
         if result['status'] == 'success' and request.invoice_id:
             klaus_engine.log_communication(
                 invoice_id=request.invoice_id,
@@ -2236,9 +2607,12 @@ async def klaus_send_document(request: KlausDocumentRequest):
                 message_type='document',
                 approved_by='manual'
             )
+            invalidate_invoice_cache()
         
         return result
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2255,7 +2629,9 @@ async def klaus_update_config(request: KlausConfigUpdate):
     """Update Klaus configuration"""
     try:
         klaus_engine.config.update(request.config)
-        klaus_engine.save_config()
+        klaus_engine.schedule_save_config()
+        # Thresholds feed the analysis, so don't serve a cached one
+        _analysis_cache["epoch"] = None
         
         return {
             "status": "success",
@@ -2267,34 +2643,42 @@ async def klaus_update_config(request: KlausConfigUpdate):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/klaus/history", response_model=dict)
-async def klaus_get_history():
-    """Get Klaus communication history"""
+async def klaus_get_history(limit: int = 100, offset: int = 0, since: Optional[datetime] = None):
+    """
+    Get Klaus communication history, most recent page first
+
+    Returns up to `limit` entries in chronological order, skipping the `offset`
+    most recent ones. `count` is the total number of entries (sent at or after
+    `since`, if given).
+    """
+    history = klaus_engine.communication_history
+    # History is in sent_at order, so the entries since a time are a suffix of it
+    first = bisect_left(history, since.isoformat(), key=lambda c: c['sent_at'] or '') if since else 0
+    end = max(len(history) - max(offset, 0), first)
+    start = max(end - max(limit, 0), first)
     return {
         "status": "success",
-        "count": len(klaus_engine.communication_history),
-        "history": klaus_engine.communication_history
+        "count": len(history) - first,
+        "limit": limit,
+        "offset": offset,
+        "history": history[start:end]
     }
 
 @app.get("/klaus/stats", response_model=dict)
 async def klaus_get_stats():
     """Get Klaus performance statistics"""
     try:
-        # Get unpaid invoices
-        invoices = await hubspot_client.get_invoices()
-        
-        # Analyze
-        analysis = klaus_engine.analyze_overdue_invoices(invoices)
-        
-        # Calculate stats
-        total_overdue = len([inv for inv in invoices if inv.get('balance_due', 0) > 0])
-        total_overdue_amount = sum(inv.get('balance_due', 0) for inv in invoices)
+        # Analyze unpaid invoices (the summary includes the overdue totals)
+        analysis = await get_overdue_analysis_cached()
+        summary = analysis['summary']
         
         stats = {
-            "total_overdue_invoices": total_overdue,
-            "total_overdue_amount": total_overdue_amount,
-            "autonomous_actions_ready": analysis['summary']['ready_to_send'],
-            "pending_approval": analysis['summary']['needs_approval'],
-            "no_action_needed": analysis['summary']['no_action_needed'],
+            "total_overdue_invoices": summary['total_overdue_count'],
+            "total_overdue_amount": summary['total_overdue_amount'],
+            "autonomous_actions_ready": summary['contacts_to_email'],
+            "pending_approval": summary['contacts_need_approval'],
+            "no_action_needed": summary['invoices_no_action'],
+            "overdue_buckets": summary['overdue_buckets'],
             "communications_sent": len(klaus_engine.communication_history),
             "last_run": datetime.now().isoformat()
         }
@@ -2307,6 +2691,20 @@ async def klaus_get_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/klaus/jobs/{job_id}", response_model=dict)
+async def klaus_get_job(job_id: str):
+    """Get the status (and result, once finished) of a background job"""
+    job = _jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    return {
+        "job_id": job_id,
+        "status": job['status'],
+        "result": job['result'],
+        "error": job['error']
+    }
+
 # ============================================================================
 # WEBHOOKS
 # ============================================================================
@@ -2316,17 +2714,18 @@ async def vapi_webhook(request: Request):
     """Handle Vapi.ai call webhooks"""
     try:
         data = await request.json()
-        print(f"[VAPI WEBHOOK] Received: {data.get('message', {}).get('type', 'unknown')}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("vapi webhook received: %s", data.get('message', {}).get('type', 'unknown'))
 
         if klaus_voice:
             result = klaus_voice.handle_webhook(data)
-            return JSONResponse(content=result)
+            return ORJSONResponse(content=result)
         else:
-            return JSONResponse(content={"status": "service_unavailable"})
+            return ORJSONResponse(content={"status": "service_unavailable"})
 
     except Exception as e:
-        print(f"[VAPI WEBHOOK] Error: {str(e)}")
-        return JSONResponse(content={"status": "error", "error": str(e)}, status_code=500)
+        log.error("vapi webhook failed: %s", e)
+        return ORJSONResponse(content={"status": "error", "error": str(e)}, status_code=500)
 
 # ============================================================================
 # DATABASE / MIGRATION ENDPOINTS
@@ -2362,46 +2761,55 @@ async def get_storage_info():
         "status": "success",
         "using_database": db.USE_DATABASE,
         "storage_type": "PostgreSQL" if db.USE_DATABASE else "Local JSON files",
-        "database_url_set": bool(os.getenv("DATABASE_URL")),
+        "database_url_set": bool(settings.database_url),
         "memory_associations_count": len(matching_engine.memory.get('associations', {})),
         "klaus_history_count": len(klaus_engine.communication_history)
     }
 
 
 @app.get("/admin/invoice-properties", response_model=dict)
-async def get_invoice_properties():
-    """Debug endpoint - get all properties from a sample invoice"""
-    try:
-        import requests
-        api_key = os.getenv("HUBSPOT_API_KEY")
-
-        # First, get all available invoice properties
-        props_url = "https://api.hubapi.com/crm/v3/properties/invoices"
-        headers = {"Authorization": f"Bearer {api_key}"}
-
-        props_response = requests.get(props_url, headers=headers)
-        props_data = props_response.json()
+async def get_invoice_properties(all: bool = False):
+    """
+    Debug endpoint - get properties from a sample invoice
 
-        # Get all property names
-        all_prop_names = [p["name"] for p in props_data.get("results", [])]
+    By default returns the fields Klaus uses (one HubSpot call). Pass ?all=true
+    to list every invoice property definition and fetch the sample with all of them.
+    """
+    try:
+        headers = {"Authorization": f"Bearer {settings.hubspot_api_key}"}
+
+        all_prop_names = None
+        if all:
+            # Get all available invoice properties
+            props_url = "https://api.hubapi.com/crm/v3/properties/invoices"
+            props_response = await app.state.http.get(props_url, headers=headers)
+            props_data = props_response.json()
+            all_prop_names = [p["name"] for p in props_data.get("results", [])]
+            prop_names = all_prop_names
+        else:
+            prop_names = ["hs_invoice_number", "hs_number", "hs_title", "hs_amount_billed", "hs_balance_due",
+                          "hs_payment_status", "hs_due_date", "hs_createdate", "hs_payment_date", "hs_invoice_link"]
 
-        # Now get an invoice with ALL properties
+        # Get a sample invoice with the selected properties and its associations
         url = "https://api.hubapi.com/crm/v3/objects/invoices"
-        params = {"limit": 1, "properties": ",".join(all_prop_names)}
+        params = {"limit": 1, "properties": ",".join(prop_names), "associations": "companies,contacts"}
 
-        response = requests.get(url, headers=headers, params=params)
+        response = await app.state.http.get(url, headers=headers, params=params)
         data = response.json()
 
         if data.get("results"):
             invoice = data["results"][0]
             # Filter out None values for readability
             props = {k: v for k, v in invoice.get("properties", {}).items() if v is not None}
-            return {
+            result = {
                 "status": "success",
                 "invoice_id": invoice.get("id"),
                 "properties": props,
-                "all_available_properties": all_prop_names
+                "associations": invoice.get("associations", {})
             }
+            if all_prop_names is not None:
+                result["all_available_properties"] = all_prop_names
+            return result
         return {"status": "no_invoices", "data": data}
     except Exception as e:
         import traceback
@@ -2411,7 +2819,7 @@ async def get_invoice_properties():
 @app.get("/admin/email-config", response_model=dict)
 async def get_email_config():
     """Get information about email configuration (no passwords)"""
-    smtp_user = os.getenv("SMTP_USER", "not set")
+    smtp_user = settings.smtp_user or "not set"
     # Mask the email for security but show domain
     if smtp_user and "@" in smtp_user:
         parts = smtp_user.split("@")
@@ -2421,16 +2829,16 @@ async def get_email_config():
 
     return {
         "status": "success",
-        "smtp_host": os.getenv("SMTP_HOST", "smtp.gmail.com (default)"),
-        "smtp_port": os.getenv("SMTP_PORT", "587 (default)"),
+        "smtp_host": settings.smtp_host or "smtp.gmail.com (default)",
+        "smtp_port": settings.smtp_port or "587 (default)",
         "smtp_user": masked_user,
-        "smtp_password_set": bool(os.getenv("SMTP_PASSWORD")),
-        "klaus_from_email": os.getenv("KLAUS_FROM_EMAIL", "klaus@leveragelivelocal.com (default)"),
+        "smtp_password_set": bool(settings.smtp_password),
+        "klaus_from_email": settings.klaus_from_email or "klaus@leveragelivelocal.com (default)",
         "klaus_smtp_active": klaus_smtp is not None,
         "klaus_gmail_active": klaus_gmail is not None,
-        "gmail_refresh_token_set": bool(os.getenv("GMAIL_REFRESH_TOKEN")),
-        "gmail_client_id_set": bool(os.getenv("GMAIL_CLIENT_ID")),
-        "gmail_client_secret_set": bool(os.getenv("GMAIL_CLIENT_SECRET"))
+        "gmail_refresh_token_set": bool(settings.gmail_refresh_token),
+        "gmail_client_id_set": bool(settings.gmail_client_id),
+        "gmail_client_secret_set": bool(settings.gmail_client_secret)
     }
 
 
@@ -2478,7 +2886,7 @@ async def trigger_email_poll(background_tasks: BackgroundTasks):
     if not klaus_gmail or not klaus_email_responder:
         raise HTTPException(status_code=503, detail="Klaus Gmail not configured")
 
-    background_tasks.add_task(run_email_poll)
+    background_tasks.add_task(poll_emails_for_response)
 
     return {
         "status": "started",
@@ -2490,83 +2898,125 @@ async def trigger_email_poll(background_tasks: BackgroundTasks):
 # STARTUP
 # ============================================================================
 
-@app.on_event("startup")
+async def setup_vapi_inbound(inbound_assistant_id: str):
+    """Attach the existing Vapi assistant (configured in the Vapi dashboard) to the phone number"""
+    try:
+        result = await asyncio.to_thread(klaus_voice.setup_inbound_handling, inbound_assistant_id)
+        if result.get('status') == 'success':
+            log.info("[OK] Klaus Voice inbound calls configured")
+        else:
+            log.warning("[WARN] Klaus Voice inbound setup: %s", result.get('error', 'unknown error'))
+    except Exception as e:
+        log.warning("[WARN] Klaus Voice inbound setup failed: %s", e)
+
+
 async def startup_event():
     """Application startup tasks"""
+    global scheduler
 
-    # Initialize database if on Railway
-    if db.USE_DATABASE:
-        db.init_database()
-        print("[OK] PostgreSQL database initialized")
-    else:
-        print("Using local JSON file storage (no DATABASE_URL)")
+    # Bounded worker pool for blocking client calls offloaded with asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="klaus-io")
+    )
+
+    # Shared async HTTP client (keep-alive + HTTP/2) for direct REST calls from handlers
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
+
+    def init_storage():
+        # Initialize database if on Railway (tables must exist before reading the schedule)
+        if db.USE_DATABASE:
+            db.init_database()
+            log.info("[OK] PostgreSQL database initialized")
+            warmed = db.warm_connection_pool(settings.db_pool_warm)
+            log.info("[OK] Database pool warmed (%d connections)", warmed)
+        else:
+            log.info("Using local JSON file storage (no DATABASE_URL)")
+        return load_schedule_config()
+
+    # Database setup and credential decoding are independent, so run them side by side
+    config, _ = await asyncio.gather(
+        asyncio.to_thread(init_storage),
+        asyncio.to_thread(setup_klaus_credentials)
+    )
+
+    # Clients read config from the database and the decoded credential files
+    await init_clients()
+    register_voice_routes()
 
-    # Setup Klaus credentials from environment
-    setup_klaus_credentials()
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    scheduler = AsyncIOScheduler()
+    scheduler.start()
 
     # Load scheduled jobs
-    config = load_schedule_config()
     if config['frequency'] != 'none':
         try:
-            hour, minute = map(int, config['time'].split(':'))
-
-            if config['frequency'] == 'daily':
-                trigger = CronTrigger(hour=hour, minute=minute)
-            elif config['frequency'] == 'weekly':
-                trigger = CronTrigger(day_of_week='mon', hour=hour, minute=minute)
-            elif config['frequency'] == 'monthly':
-                trigger = CronTrigger(day=1, hour=hour, minute=minute)
+            trigger = build_schedule_trigger(config['frequency'], config['time'])
 
             # Use combined job that runs: Reconciliation + Klaus Collections + Email Processing
-            scheduler.add_job(scheduled_full_run, trigger, id='full_run')
+            scheduler.add_job(scheduled_full_run, trigger, id='full_run', max_instances=1, coalesce=True)
 
-            print(f"[OK] Loaded schedule: {config['frequency']} at {config['time']}")
-            print(f"  Jobs: Reconciliation + Klaus Collections + Email Processing")
+            log.info("[OK] Loaded schedule: %s at %s (Reconciliation + Klaus Collections + Email Processing)",
+                     config['frequency'], config['time'])
         except Exception as e:
-            print(f"[ERR] Failed to load schedule: {e}")
+            log.error("[ERR] Failed to load schedule: %s", e)
 
     # Setup Vapi inbound call handling if configured
     # NOTE: We no longer create/update the assistant on startup to preserve Vapi dashboard settings
     # Just attach the existing assistant ID to the phone number
-    if klaus_voice and os.getenv("VAPI_PHONE_NUMBER_ID") and os.getenv("VAPI_ASSISTANT_ID"):
-        try:
-            # Use existing assistant ID from environment (configured in Vapi dashboard)
-            inbound_assistant_id = os.getenv("VAPI_ASSISTANT_ID")
-            if inbound_assistant_id:
-                result = klaus_voice.setup_inbound_handling(inbound_assistant_id)
-                if result.get('status') == 'success':
-                    print("[OK] Klaus Voice inbound calls configured")
-                else:
-                    print(f"[WARN] Klaus Voice inbound setup: {result.get('error', 'unknown error')}")
-        except Exception as e:
-            print(f"[WARN] Klaus Voice inbound setup failed: {e}")
+    # Runs in the background so a slow Vapi API doesn't delay serving requests
+    if klaus_voice and settings.vapi_phone_number_id and settings.vapi_assistant_id:
+        app.state.vapi_setup = asyncio.create_task(setup_vapi_inbound(settings.vapi_assistant_id))
 
     # Setup email polling (check every 5 minutes, respond with 0-12 min random delay)
     if klaus_gmail and klaus_email_responder:
         try:
             scheduler.add_job(
-                run_email_poll,
+                poll_emails_for_response,
                 trigger=IntervalTrigger(minutes=5),
                 id='email_poll',
                 replace_existing=True
             )
-            print("[OK] Klaus Email Polling: every 5 minutes (+ 0-12 min response delay)")
+            log.info("[OK] Klaus Email Polling: every 5 minutes (+ 0-12 min response delay)")
         except Exception as e:
-            print(f"[WARN] Klaus Email Polling setup failed: {e}")
-
-    print("\n" + "="*60)
-    print("Reconciliation Agent + Klaus Collections")
-    print("="*60)
-    print(f"Reconciliation: [OK] Active")
-    print(f"Klaus Gmail: {'[OK] Active' if klaus_gmail else '[--] Disabled'}")
-    print(f"Klaus SMTP: {'[OK] Active' if klaus_smtp else '[--] Disabled'}")
-    print(f"Klaus Drive: {'[OK] Active' if klaus_drive else '[--] Disabled'}")
-    print(f"Klaus Voice: {'[OK] Active' if klaus_voice else '[--] Disabled'}")
-    print(f"Email Service: {'[OK] Active' if (klaus_gmail or klaus_smtp) else '[--] Disabled'}")
-    print(f"Email Responder: {'[OK] Active' if klaus_email_responder else '[--] Disabled'}")
-    print(f"Email Polling: {'[OK] Every 5 min' if (klaus_gmail and klaus_email_responder) else '[--] Disabled'}")
-    print("="*60 + "\n")
+            log.warning("[WARN] Klaus Email Polling setup failed: %s", e)
+
+    # Banner is emitted as one log record rather than a dozen separate writes
+    log.info("\n".join([
+        "",
+        "="*60,
+        "Reconciliation Agent + Klaus Collections",
+        "="*60,
+        "Reconciliation: [OK] Active",
+        f"Klaus Gmail: {'[OK] Active' if klaus_gmail else '[--] Disabled'}",
+        f"Klaus SMTP: {'[OK] Active' if klaus_smtp else '[--] Disabled'}",
+        f"Klaus Drive: {'[OK] Active' if klaus_drive else '[--] Disabled'}",
+        f"Klaus Voice: {'[OK] Active' if klaus_voice else '[--] Disabled'}",
+        f"Email Service: {'[OK] Active' if (klaus_gmail or klaus_smtp) else '[--] Disabled'}",
+        f"Email Responder: {'[OK] Active' if klaus_email_responder else '[--] Disabled'}",
+        f"Email Polling: {'[OK] Every 5 min' if (klaus_gmail and klaus_email_responder) else '[--] Disabled'}",
+        "="*60,
+    ]))
+
+
+async def shutdown_event():
+    """Application shutdown tasks"""
+    if scheduler:
+        scheduler.shutdown(wait=False)
+    if klaus_engine:
+        await klaus_engine.flush_config()
+        await asyncio.to_thread(klaus_engine.flush_communications)
+    if matching_engine:
+        await asyncio.to_thread(matching_engine.flush_memory)
+    await app.state.http.aclose()
 
 if __name__ == "__main__":
+    # Single process on purpose: the scheduler, background jobs and email queue live in memory
+    # (see "Scaling" in DEPLOYMENT_GUIDE.md)
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
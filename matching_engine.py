@@ -5,16 +5,55 @@ Learns from approvals and understands payment processors
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 import anthropic
 import re
 import json
 import os
+import threading
+from collections import defaultdict
+from functools import lru_cache
 
 # Import database module for Railway-compatible storage
 import database as db
 
 
+_NAME_SUFFIX_RES = [re.compile(rf'\b{suffix}\b') for suffix in ['llc', 'inc', 'corp', 'ltd', 'co', 'l.l.c.', 'l.p.', 'lp']]
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# Where bank descriptions carry the payer's name (ACH originator, wire by-order-of, ...)
+_COMPANY_NAME_RES = [
+    re.compile(r'ORIG CO NAME:([^O]+?)(?:ORIG|$)'),
+    re.compile(r'B/O:\s*([^R]+?)(?:REF:|$)'),
+    re.compile(r'FROM:\s*([^R]+?)(?:REF:|$)'),
+]
+_ORIG_ID_RE = re.compile(r'\s+ORIG ID:.*')
+_LONG_NUMBER_RE = re.compile(r'\s+\d{9,}')
+
+
+@lru_cache(maxsize=8192)
+def _clean_name(name: str) -> str:
+    """Lowercase a name and strip business suffixes/punctuation (memoized: the same
+    descriptions and company names are cleaned for every transaction/invoice pair)"""
+    name = name.lower()
+    for suffix_re in _NAME_SUFFIX_RES:
+        name = suffix_re.sub('', name)
+    name = _NON_WORD_RE.sub(' ', name)
+    return ' '.join(name.split())
+
+
+@lru_cache(maxsize=8192)
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse a Plaid date or HubSpot ISO timestamp into a naive datetime, or None
+    (memoized: the same transaction and invoice dates are compared for every pair).
+    Dropping the timezone lets Plaid's plain dates be compared with HubSpot's UTC
+    timestamps instead of raising TypeError."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except (AttributeError, ValueError):
+        return None
+
+
 class ReconciliationEngine:
     """
     Intelligent matching engine that learns from your approvals
@@ -30,20 +69,78 @@ class ReconciliationEngine:
         'amex': {'keywords': ['american express'], 'fee_percent': 0.0, 'fee_fixed': 0.0}
     }
 
+    # Memory saves are coalesced for this long so bulk approvals write once
+    MEMORY_SAVE_DELAY_SECONDS = 1.0
+
     def __init__(self, anthropic_api_key: str, memory_file: str = "memory.json"):
         self.anthropic_api_key = anthropic_api_key
         self.client = anthropic.Anthropic(api_key=anthropic_api_key) if anthropic_api_key else None
         self.memory_file = memory_file
         # Use database module for persistent storage (works on Railway)
         self.memory = self._load_memory()
+        self._index_accounted()
+        self._index_denied()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        # Held across a whole flush so a timer flush and a slow earlier save (or the
+        # shutdown flush) write one at a time, oldest snapshot first
+        self._flush_lock = threading.Lock()
 
     def _load_memory(self) -> Dict:
         """Load memory from database (Railway) or JSON file (local dev)"""
         return db.load_memory()
 
+    def _index_accounted(self):
+        """
+        Index accounted transactions by description (and Plaid transaction ID)
+        
+        The list in memory['accounted_transactions'] stays the persisted form;
+        lookups and removals go through these dicts instead of scanning it.
+        """
+        self._accounted = {}
+        self._accounted_ids = {}
+        for accounted in self.memory.get('accounted_transactions', []):
+            self._accounted[accounted.get('transaction_description')] = accounted
+            if accounted.get('transaction_id'):
+                self._accounted_ids[accounted['transaction_id']] = accounted.get('transaction_description')
+    
+    def _index_denied(self):
+        """
+        Index denied matches as a set of (transaction_description, invoice_id) pairs
+        
+        is_match_denied runs for every transaction/invoice pair during matching,
+        so it checks this set instead of scanning memory['denied_matches'].
+        """
+        self._denied = {
+            (denial.get('transaction_description'), denial.get('invoice_id'))
+            for denial in self.memory.get('denied_matches', [])
+        }
+    
     def _save_memory(self):
-        """Save memory to database (Railway) or JSON file (local dev)"""
-        db.save_memory(self.memory)
+        """
+        Save memory to database (Railway) or JSON file (local dev)
+        
+        The write is deferred by MEMORY_SAVE_DELAY_SECONDS so several changes in
+        quick succession (e.g. /approve-bulk) are persisted together.
+        """
+        with self._save_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.MEMORY_SAVE_DELAY_SECONDS, self.flush_memory)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush_memory(self):
+        """Persist memory now if a save is pending (also called on shutdown)"""
+        with self._flush_lock:
+            with self._save_lock:
+                if self._save_timer is None:
+                    return
+                self._save_timer.cancel()
+                self._save_timer = None
+                # Snapshot the top-level containers so request handlers can keep mutating memory
+                snapshot = {key: value.copy() if isinstance(value, (dict, list)) else value
+                            for key, value in self.memory.items()}
+            db.save_memory(snapshot)
     
     def learn_association(self, transaction_name: str, company_name: str):
         trans_clean = self._clean_company_name(transaction_name)
@@ -67,13 +164,12 @@ class ReconciliationEngine:
             self.memory['denied_matches'] = []
         
         # Check if already denied
-        for existing in self.memory['denied_matches']:
-            if (existing['transaction_description'] == transaction_description and 
-                existing['invoice_id'] == invoice_id):
-                print(f"Match already denied: {transaction_description[:50]}... -> {invoice_id}")
-                return
+        if (transaction_description, invoice_id) in self._denied:
+            print(f"Match already denied: {transaction_description[:50]}... -> {invoice_id}")
+            return
         
         self.memory['denied_matches'].append(denial)
+        self._denied.add((transaction_description, invoice_id))
         self._save_memory()
         print(f"Denied: {transaction_description[:50]}... -> Invoice {invoice_id}")
     
@@ -82,15 +178,7 @@ class ReconciliationEngine:
         Check if this EXACT transaction-invoice pair has been denied.
         Only blocks the specific transaction description matched to the specific invoice.
         """
-        if 'denied_matches' not in self.memory:
-            return False
-
-        for denial in self.memory['denied_matches']:
-            if (denial['transaction_description'] == transaction_description and
-                denial['invoice_id'] == invoice_id):
-                return True
-
-        return False
+        return (transaction_description, invoice_id) in self._denied
     
     def mark_transaction_accounted(self, transaction_description: str, transaction_id: Optional[str], 
                                    amount: float, date: str, company_name: str, invoice_id: Optional[str] = None):
@@ -102,9 +190,8 @@ class ReconciliationEngine:
             self.memory['accounted_transactions'] = []
         
         # Check if already accounted
-        for existing in self.memory['accounted_transactions']:
-            if existing.get('transaction_description') == transaction_description:
-                return
+        if transaction_description in self._accounted:
+            return
         
         accounted = {
             'transaction_id': transaction_id,
@@ -117,47 +204,82 @@ class ReconciliationEngine:
         }
         
         self.memory['accounted_transactions'].append(accounted)
+        self._accounted[transaction_description] = accounted
+        if transaction_id:
+            self._accounted_ids[transaction_id] = transaction_description
         self._save_memory()
         print(f"Marked as accounted: {transaction_description[:50]}... (${amount})")
     
     def is_transaction_accounted(self, transaction_description: str) -> bool:
         """Check if transaction is already accounted for"""
-        if 'accounted_transactions' not in self.memory:
+        return transaction_description in self._accounted
+    
+    def remove_accounted_transaction(self, key: str) -> bool:
+        """
+        Remove an accounted transaction by Plaid transaction ID or description
+        Returns False if nothing matched
+        """
+        description = self._accounted_ids.pop(key, None)
+        removed = self._accounted.pop(description, None) if description is not None else None
+        if key in self._accounted:
+            removed = self._accounted.pop(key)
+            if removed.get('transaction_id'):
+                self._accounted_ids.pop(removed['transaction_id'], None)
+        if removed is None:
             return False
         
-        for accounted in self.memory['accounted_transactions']:
-            if accounted['transaction_description'] == transaction_description:
-                return True
-        return False
+        self.memory['accounted_transactions'] = list(self._accounted.values())
+        self._save_memory()
+        return True
     
-    def validate_company_payments(self, company_name: str, paid_invoices: List[Dict], 
-                                  all_transactions: List[Dict]) -> Dict:
+    def group_invoices_by_company(self, paid_invoices: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Bucket paid invoices by company name in a single pass
+        Lets callers validate many companies without rescanning the full invoice list
+        """
+        by_company = defaultdict(list)
+        for inv in paid_invoices:
+            by_company[inv.get('company_name')].append(inv)
+        return by_company
+
+    def clean_transaction_descriptions(self, transactions: List[Dict]) -> List[str]:
+        """Clean every transaction description once so per-company validation can reuse them"""
+        return [self._clean_company_name(txn.get('description', '')) for txn in transactions]
+
+    def validate_company_payments(self, company_name: str, company_paid_invoices: List[Dict],
+                                  all_transactions: List[Dict],
+                                  cleaned_descriptions: Optional[List[str]] = None) -> Dict:
         """
         Validate that payments match paid invoices for a company
         Returns status and details about payment history
+
+        Args:
+            company_name: Company to validate
+            company_paid_invoices: Paid invoices already filtered to this company
+                                   (see group_invoices_by_company)
+            all_transactions: List of all transactions
+            cleaned_descriptions: Optional precomputed clean_transaction_descriptions(all_transactions)
         """
-        # Get paid invoices for this company
-        company_paid_invoices = [inv for inv in paid_invoices if inv.get('company_name') == company_name]
-        
+        if cleaned_descriptions is None:
+            cleaned_descriptions = self.clean_transaction_descriptions(all_transactions)
+
         # Calculate total of paid invoices
         paid_invoices_total = sum(inv.get('amount', 0) for inv in company_paid_invoices)
         
         # Find transactions that match this company (using fuzzy matching)
         company_clean = self._clean_company_name(company_name)
-        matching_transactions = []
         
-        for txn in all_transactions:
-            txn_desc_clean = self._clean_company_name(txn.get('description', ''))
-            
-            # Check if company name appears in transaction
-            similarity = fuzz.partial_ratio(company_clean, txn_desc_clean)
-            if similarity >= 80:  # High confidence match
-                matching_transactions.append(txn)
-        
-        # Calculate total of matching transactions (excluding already accounted ones)
-        unaccounted_transactions = [
-            txn for txn in matching_transactions 
-            if not self.is_transaction_accounted(txn.get('description', ''))
+        # Recurring payees repeat the same description, so score each distinct one only
+        # once - in a single call - keeping high confidence matches (>= 80)
+        matched_descriptions = {
+            description for description, _, _ in process.extract(
+                company_clean, list(dict.fromkeys(cleaned_descriptions)),
+                scorer=fuzz.partial_ratio, score_cutoff=80, limit=None
+            )
+        }
+        matching_transactions = [
+            txn for txn, txn_desc_clean in zip(all_transactions, cleaned_descriptions)
+            if txn_desc_clean in matched_descriptions
         ]
         
         payments_total = sum(abs(txn.get('amount', 0)) for txn in matching_transactions)
@@ -240,7 +362,8 @@ class ReconciliationEngine:
         Returns:
             Dictionary with suggestions for accounting, not auto-applied
         """
-        validation = self.validate_company_payments(company_name, paid_invoices, transactions)
+        company_paid_invoices = [inv for inv in paid_invoices if inv.get('company_name') == company_name]
+        validation = self.validate_company_payments(company_name, company_paid_invoices, transactions)
         
         if validation['status'] == 'balanced':
             # History matches up - return suggestions for user approval
@@ -291,19 +414,26 @@ class ReconciliationEngine:
         """
         suggestions = []
         
+        # Parse each transaction's date and company once, not once per invoice
+        parsed_transactions = []
+        for txn in transactions:
+            txn_date = _parse_date(txn.get('date'))
+            if txn_date is None:
+                continue
+            txn_company = self._extract_company_from_transaction(txn.get('description') or '')
+            parsed_transactions.append((txn, txn_date, txn_company, self._clean_company_name(txn_company)))
+        
         for invoice in paid_invoices:
             if not invoice.get('payment_date') or not invoice.get('company_name'):
                 continue
             
-            try:
-                payment_date = datetime.fromisoformat(invoice['payment_date'].replace('Z', '+00:00'))
-            except:
+            payment_date = _parse_date(invoice['payment_date'])
+            if payment_date is None:
                 continue
             
             matching_transactions = []
-            for txn in transactions:
+            for txn, txn_date, txn_company, trans_clean in parsed_transactions:
                 try:
-                    txn_date = datetime.fromisoformat(txn['date'].replace('Z', '+00:00'))
                     days_diff = abs((txn_date - payment_date).days)
                     
                     if days_diff <= 30:
@@ -313,29 +443,27 @@ class ReconciliationEngine:
                         if amount_diff_percent < 20:
                             matching_transactions.append({
                                 'transaction': txn,
+                                'txn_company': txn_company,
+                                'trans_clean': trans_clean,
                                 'days_diff': days_diff,
                                 'amount_diff_percent': amount_diff_percent
                             })
                 except:
                     continue
             
+            company_name = invoice['company_name']
+            comp_clean = self._clean_company_name(company_name)
+            
             for match in matching_transactions:
                 txn_desc = match['transaction']['description']
-                company_name = invoice['company_name']
-                
-                txn_company = self._extract_company_from_transaction(txn_desc)
-                
-                similarity = fuzz.partial_ratio(
-                    self._clean_company_name(txn_company),
-                    self._clean_company_name(company_name)
-                )
-                
-                trans_clean = self._clean_company_name(txn_company)
-                comp_clean = self._clean_company_name(company_name)
+                txn_company = match['txn_company']
+                trans_clean = match['trans_clean']
                 
                 if trans_clean in self.memory['associations']:
                     continue
                 
+                similarity = fuzz.partial_ratio(trans_clean, comp_clean)
+                
                 if similarity > 30:
                     confidence = (
                         similarity * 0.5 +
@@ -368,18 +496,12 @@ class ReconciliationEngine:
         """
         Extract company name from transaction description
         """
-        patterns = [
-            r'ORIG CO NAME:([^O]+?)(?:ORIG|$)',
-            r'B/O:\s*([^R]+?)(?:REF:|$)',
-            r'FROM:\s*([^R]+?)(?:REF:|$)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, description)
+        for pattern in _COMPANY_NAME_RES:
+            match = pattern.search(description)
             if match:
                 company = match.group(1).strip()
-                company = re.sub(r'\s+ORIG ID:.*', '', company)
-                company = re.sub(r'\s+\d{9,}', '', company)
+                company = _ORIG_ID_RE.sub('', company)
+                company = _LONG_NUMBER_RE.sub('', company)
                 return company
         
         return description[:50]
@@ -411,6 +533,8 @@ class ReconciliationEngine:
         
         # Filter to only unpaid invoices
         unpaid_invoices = [inv for inv in invoices if inv.get('status', '').upper() in ['UNPAID', 'OPEN', 'OUTSTANDING', '']]
+        # Invoice-side name features don't depend on the transaction, so derive them once
+        invoice_features = {inv['id']: self._invoice_features(inv) for inv in unpaid_invoices}
         
         for transaction in transactions:
             if transaction.get('amount', 0) <= 0:
@@ -423,27 +547,55 @@ class ReconciliationEngine:
                 continue
             
             available_invoices = [inv for inv in unpaid_invoices if inv['id'] not in matched_invoices]
-            best_match = self._find_best_match(transaction, available_invoices)
+            best_match = self._find_best_match(transaction, available_invoices, min_confidence=confidence_threshold,
+                                               invoice_features=invoice_features)
             if best_match and best_match['confidence'] >= confidence_threshold:
                 matches.append(best_match)
                 matched_invoices.add(best_match['invoice_id'])
         return matches
     
-    def _find_best_match(self, transaction: Dict, invoices: List[Dict]) -> Optional[Dict]:
+    def _find_best_match(self, transaction: Dict, invoices: List[Dict], min_confidence: float = 0.0,
+                         invoice_features: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+        """
+        Score a transaction against invoices and return the best candidate
+        
+        invoice_features maps invoice id -> _invoice_features(invoice); callers matching
+        many transactions against the same invoices pass it in so it's built only once.
+        
+        Fuzzy name scoring is the expensive part, so the cheap scores are computed
+        first and an invoice is skipped when even a perfect name match couldn't
+        make it a candidate (> 50) or reach min_confidence. A skipped invoice could
+        never be the returned match, so results are unchanged.
+        """
         candidates = []
         processor = self.detect_processor(transaction)
         transaction_desc = transaction.get('description', '')
+        trans_features = self._transaction_features(transaction)
+        if invoice_features is None:
+            invoice_features = {}
         
         for invoice in invoices:
             # Skip if this match was previously denied
             if self.is_match_denied(transaction_desc, invoice['id']):
                 continue
             
-            memory_match = self._check_memory(transaction, invoice)
+            inv_features = invoice_features.get(invoice['id'])
+            if inv_features is None:
+                inv_features = invoice_features[invoice['id']] = self._invoice_features(invoice)
+            
+            memory_match = self._check_memory(transaction, invoice, trans_features, inv_features)
             amount_match = self._match_amount_smart(transaction, invoice, processor)
-            name_match = self._match_names_smart(transaction, invoice)
             date_match = self._match_dates(transaction, invoice)
-            invoice_num_match = self._match_invoice_number(transaction, invoice)
+            invoice_num_match = self._match_invoice_number(transaction, invoice, trans_features, inv_features)
+            
+            # Confidence only grows with the name score, and without a close amount the
+            # strong-name shortcut can't apply, so name_match=100 gives an upper bound
+            if amount_match < 90:
+                best_possible = self._calculate_confidence_smart(memory_match, amount_match, 100, date_match, invoice_num_match, processor)
+                if best_possible <= 50 or best_possible < min_confidence:
+                    continue
+            
+            name_match = self._match_names_smart(transaction, invoice, trans_features, inv_features)
             confidence = self._calculate_confidence_smart(memory_match, amount_match, name_match, date_match, invoice_num_match, processor)
             if confidence > 50:
                 candidates.append({
@@ -479,9 +631,39 @@ class ReconciliationEngine:
             'match_reasons': best['reasons']
         }
     
-    def _check_memory(self, transaction: Dict, invoice: Dict) -> float:
-        trans_desc = self._clean_company_name(transaction.get('description', ''))
-        company_name = self._clean_company_name(invoice.get('company_name', ''))
+    def _transaction_features(self, transaction: Dict) -> Dict:
+        """Name-matching features of a transaction, computed once per transaction"""
+        desc_clean = self._clean_company_name(transaction.get('description', ''))
+
+        # Processor names say nothing about who paid
+        name_desc = desc_clean
+        for processor in self.PROCESSORS.keys():
+            name_desc = name_desc.replace(processor, '')
+        name_desc = ' '.join(name_desc.split())
+
+        return {
+            'desc_clean': desc_clean,
+            'name_desc': name_desc,
+            'words': frozenset(name_desc.split()),
+            'desc_upper': (transaction.get('description') or '').upper(),
+        }
+
+    def _invoice_features(self, invoice: Dict) -> Dict:
+        """Name-matching features of an invoice, computed once per invoice"""
+        company_clean = self._clean_company_name(invoice.get('company_name', ''))
+        return {
+            'company_clean': company_clean,
+            'company_core': self._extract_company_core(company_clean),
+            'meaningful_words': frozenset(self._get_meaningful_words(company_clean)),
+            'number_upper': str(invoice.get('number') or '').upper(),
+        }
+
+    def _check_memory(self, transaction: Dict, invoice: Dict,
+                      trans_features: Optional[Dict] = None, inv_features: Optional[Dict] = None) -> float:
+        trans_features = trans_features or self._transaction_features(transaction)
+        inv_features = inv_features or self._invoice_features(invoice)
+        trans_desc = trans_features['desc_clean']
+        company_name = inv_features['company_clean']
         for learned_trans, learned_company in self.memory['associations'].items():
             if learned_trans in trans_desc and learned_company in company_name:
                 return 100
@@ -520,19 +702,19 @@ class ReconciliationEngine:
         # >10% difference - not a match
         return 0
     
-    def _match_names_smart(self, transaction: Dict, invoice: Dict) -> float:
-        trans_desc = self._clean_company_name(transaction.get('description', ''))
-        company_name = self._clean_company_name(invoice.get('company_name', ''))
-        if not trans_desc or not company_name:
+    def _match_names_smart(self, transaction: Dict, invoice: Dict,
+                           trans_features: Optional[Dict] = None, inv_features: Optional[Dict] = None) -> float:
+        trans_features = trans_features or self._transaction_features(transaction)
+        inv_features = inv_features or self._invoice_features(invoice)
+        company_name = inv_features['company_clean']
+        if not trans_features['desc_clean'] or not company_name:
             return 0
 
-        # Remove processor names from transaction description
-        for processor in self.PROCESSORS.keys():
-            trans_desc = trans_desc.replace(processor, '')
-        trans_desc = ' '.join(trans_desc.split())
+        # Transaction description with processor names removed
+        trans_desc = trans_features['name_desc']
 
-        # Extract core company name (remove common suffixes)
-        company_core = self._extract_company_core(company_name)
+        # Core company name (common suffixes removed)
+        company_core = inv_features['company_core']
 
         # === TIER 1: Exact substring match (highest confidence) ===
         # If the core company name appears exactly in transaction
@@ -548,8 +730,8 @@ class ReconciliationEngine:
             return 92
 
         # === TIER 3: Word-by-word matching ===
-        trans_words = set(trans_desc.split())
-        company_words_meaningful = self._get_meaningful_words(company_name)
+        trans_words = trans_features['words']
+        company_words_meaningful = inv_features['meaningful_words']
 
         if company_words_meaningful:
             # Check for exact word matches
@@ -627,52 +809,49 @@ class ReconciliationEngine:
         words = set(company_name.split())
         return words - ignore_words
 
-    def _fuzzy_substring_match(self, needle: str, haystack: str) -> float:
-        """Check if needle appears as a fuzzy substring anywhere in haystack"""
+    def _fuzzy_substring_match(self, needle: str, haystack: str, score_cutoff: float = 80) -> float:
+        """Check if needle appears as a fuzzy substring anywhere in haystack
+        (scores below score_cutoff are reported as 0)"""
         if len(needle) < 3:
             return 0
 
-        needle_len = len(needle)
-        best_score = 0
-
-        # Slide a window across haystack and check similarity
+        # Slide a window across haystack (up to 4-word combinations), keeping reasonably sized ones
         words = haystack.split()
-        for i in range(len(words)):
-            for j in range(i + 1, min(i + 5, len(words) + 1)):  # Check up to 4-word combinations
-                window = ' '.join(words[i:j])
-                if len(window) >= len(needle) * 0.7:  # Window should be reasonably sized
-                    score = fuzz.ratio(needle, window)
-                    best_score = max(best_score, score)
+        min_len = len(needle) * 0.7
+        windows = [
+            window
+            for i in range(len(words))
+            for window in (' '.join(words[i:j]) for j in range(i + 1, min(i + 5, len(words) + 1)))
+            if len(window) >= min_len
+        ]
+        if not windows:
+            return 0
 
-        return best_score
+        # Score every window in one call; the cutoff lets RapidFuzz abandon hopeless windows early
+        best = process.extractOne(needle, windows, scorer=fuzz.ratio, score_cutoff=score_cutoff)
+        return best[1] if best else 0
 
     def _count_fuzzy_word_matches(self, company_words: set, trans_words: set, threshold: int = 80) -> int:
         """Count company words that fuzzy-match transaction words (handles misspellings)"""
+        candidates = [tw for tw in trans_words if len(tw) >= 3]
+        if not candidates:
+            return 0
+
         fuzzy_count = 0
         for cw in company_words:
             if cw in trans_words:
                 continue  # Already counted as exact match
             if len(cw) < 3:
                 continue  # Skip very short words
-            for tw in trans_words:
-                if len(tw) < 3:
-                    continue
-                # Check fuzzy similarity
-                if fuzz.ratio(cw, tw) >= threshold:
-                    fuzzy_count += 1
-                    break
+            # Check fuzzy similarity against every transaction word at once
+            if process.extractOne(cw, candidates, scorer=fuzz.ratio, score_cutoff=threshold):
+                fuzzy_count += 1
         return fuzzy_count
     
     def _clean_company_name(self, name: str) -> str:
         if not name:
             return ""
-        name = name.lower()
-        suffixes = ['llc', 'inc', 'corp', 'ltd', 'co', 'l.l.c.', 'l.p.', 'lp']
-        for suffix in suffixes:
-            name = re.sub(rf'\b{suffix}\b', '', name)
-        name = re.sub(r'[^\w\s]', ' ', name)
-        name = ' '.join(name.split())
-        return name.strip()
+        return _clean_name(name)
     
     def _match_dates(self, transaction: Dict, invoice: Dict) -> float:
         try:
@@ -680,8 +859,10 @@ class ReconciliationEngine:
             inv_created_str = invoice.get('created_date', '')
             if not trans_date_str or not inv_created_str:
                 return 20
-            trans_date = datetime.fromisoformat(trans_date_str.replace('Z', '+00:00'))
-            inv_created = datetime.fromisoformat(inv_created_str.replace('Z', '+00:00'))
+            trans_date = _parse_date(trans_date_str)
+            inv_created = _parse_date(inv_created_str)
+            if trans_date is None or inv_created is None:
+                return 20
             days_diff = (trans_date - inv_created).days
             if days_diff < 0:
                 return 0
@@ -697,9 +878,10 @@ class ReconciliationEngine:
         except:
             return 20
     
-    def _match_invoice_number(self, transaction: Dict, invoice: Dict) -> float:
-        trans_desc = (transaction.get('description') or '').upper()
-        invoice_num = str(invoice.get('number') or '').upper()
+    def _match_invoice_number(self, transaction: Dict, invoice: Dict,
+                              trans_features: Optional[Dict] = None, inv_features: Optional[Dict] = None) -> float:
+        trans_desc = trans_features['desc_upper'] if trans_features else (transaction.get('description') or '').upper()
+        invoice_num = inv_features['number_upper'] if inv_features else str(invoice.get('number') or '').upper()
         if invoice_num and invoice_num in trans_desc:
             return 100
         return 0